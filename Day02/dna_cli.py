@@ -0,0 +1,84 @@
+"""Command-line DNA checker/translator for shell pipelines (no GUI, no display needed).
+
+Examples:
+    cat sequences.txt | python dna_cli.py > results.tsv
+    python dna_cli.py genes.fasta more_genes.fasta --batch-size 5000
+    zcat reads.fasta.gz | python dna_cli.py --format fasta --no-header | sort -k5,5nr
+
+Input is one sequence per line or FASTA (detected from the first
+character, or set with --format). Sequences are processed in batches and the
+output (tab-separated: id, length, valid, protein, disorder_percent) is
+flushed after every batch, so downstream tools see results as they come.
+For lines input the id is the line number.
+"""
+import argparse
+import os
+import sys
+from itertools import chain
+from fasta_pipeline import OUTPUT_COLUMNS, DEFAULT_BATCH_SIZE, read_fasta, batched_records, analyse_batch, format_row
+
+FORMATS = ["auto", "lines", "fasta"]
+
+def read_lines(handle):
+    """Yield (line number, sequence) for every non-empty line, uppercased."""
+    for line_number, line in enumerate(handle, start=1):
+        sequence = line.strip()
+        if sequence:
+            yield str(line_number), sequence.upper()
+
+def read_records(handle, fmt: str = "auto"):
+    """Records of an open text file in the given format ('auto' looks at the first non-blank line)."""
+    if fmt == "auto":
+        peeked = []
+        for line in handle:
+            peeked.append(line)
+            if line.strip():
+                break
+        fmt = "fasta" if peeked and peeked[-1].lstrip().startswith(">") else "lines"
+        # Put the lines we looked at back in front of the rest of the input
+        handle = chain(peeked, handle)
+    return read_fasta(handle) if fmt == "fasta" else read_lines(handle)
+
+def process(handle, out, fmt: str = "auto", batch_size: int = DEFAULT_BATCH_SIZE, table_id: int = 1) -> int:
+    """Write one TSV row per record of `handle` to `out`, flushing after each batch. Returns the record count."""
+    count = 0
+    for batch in batched_records(read_records(handle, fmt), batch_size):
+        out.writelines(format_row(row) for row in analyse_batch(batch, table_id))
+        out.flush()
+        count += len(batch)
+    return count
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Check, translate and predict disorder for DNA sequences (tab-separated output)")
+    parser.add_argument("inputs", nargs="*", default=["-"], help="Input files ('-' or nothing for stdin)")
+    parser.add_argument("--format", choices=FORMATS, default="auto", help="Input format (default: auto)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"Sequences per batch; output is flushed after each batch (default: {DEFAULT_BATCH_SIZE})")
+    parser.add_argument("--table", type=int, default=1, help="NCBI genetic code table (default: 1, standard)")
+    parser.add_argument("--no-header", action="store_true", help="Do not write the column names")
+    args = parser.parse_args(argv)
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+
+    out = sys.stdout
+    try:
+        if not args.no_header:
+            out.write("\t".join(OUTPUT_COLUMNS) + "\n")
+        for path in args.inputs:
+            if path == "-":
+                process(sys.stdin, out, args.format, args.batch_size, args.table)
+            else:
+                with open(path) as handle:
+                    process(handle, out, args.format, args.batch_size, args.table)
+        out.flush()
+    except BrokenPipeError:
+        # The reader of our output (e.g. `head`) has exited: stop quietly
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
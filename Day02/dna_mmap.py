@@ -0,0 +1,129 @@
+"""Translate very large sequence files (raw or FASTA) without loading them into memory.
+
+Example:
+    python dna_mmap.py chr1.fasta --output chr1_protein.fasta
+
+The file is memory-mapped and each record is translated in windows of a
+fixed size. In a single bytes.translate call per window, newlines and other
+whitespace are dropped and the bases are encoded. The 0-2 bases left over at
+the end of a window are carried to the next one, so codons may span window
+and line boundaries. Translated windows are written straight to the output
+and the mapped pages already processed are released again. Memory use
+therefore stays around a few window sizes, whatever the file size.
+
+Unlike translate_DNA, lowercase bases (soft-masked regions) are translated
+too, as in the GUI and the FASTA pipeline, which uppercase the input.
+"""
+import argparse
+import mmap
+import os
+import sys
+import numpy as np
+from done_in_class_dna_utils import codon_indices, codon_table, INVALID_BASE
+
+DEFAULT_WINDOW = 8 * 1024 * 1024
+WHITESPACE = b" \t\r\n\v\f"
+
+_FILE_ENCODE_TABLE = bytes(
+    {ord(base): code for code, bases in enumerate(["Aa", "Cc", "Gg", "Tt"]) for base in bases}.get(byte, INVALID_BASE)
+    for byte in range(256)
+)
+
+def _release(mm, start: int, end: int):
+    """Tell the OS the mapped pages in [start, end) are no longer needed (if supported)."""
+    if not hasattr(mmap, "MADV_DONTNEED"):
+        return
+    start -= start % mmap.PAGESIZE
+    if end > start:
+        mm.madvise(mmap.MADV_DONTNEED, start, end - start)
+
+def translate_mapped_record(mm, start: int, out, window: int = DEFAULT_WINDOW, table_id: int = 1) -> tuple:
+    """Translate the record sequence starting at byte `start` window by window into `out` (a binary file).
+
+    The sequence ends at the next header line or at the end of the file; the
+    header is looked for inside each window, so the file is read only once.
+    Returns (end, bases, residues), where end is the offset of the next
+    header. A trailing partial codon is ignored, as in translate_DNA.
+    """
+    table = codon_table(table_id)
+    size = len(mm)
+    carry = np.empty(0, dtype=np.uint8)
+    bases = residues = 0
+    position = start
+    while position < size:
+        window_end = min(position + window, size)
+        # A header starts right after a newline; the newline may be the last byte before `position`
+        next_header = mm.find(b"\n>", max(position - 1, 0), window_end + 1)
+        if next_header != -1:
+            window_end = next_header + 1
+        codes = np.frombuffer(mm[position:window_end].translate(_FILE_ENCODE_TABLE, WHITESPACE), dtype=np.uint8)
+        bases += len(codes)
+        if len(carry):
+            codes = np.concatenate((carry, codes))
+        complete = len(codes) // 3 * 3
+        out.write(table[codon_indices(codes[:complete])].tobytes())
+        residues += complete // 3
+        carry = codes[complete:].copy()
+        _release(mm, position, window_end)
+        position = window_end
+        if next_header != -1:
+            break
+    return position, bases, residues
+
+def translate_file(input_path: str, output, window: int = DEFAULT_WINDOW, table_id: int = 1) -> list:
+    """Translate every record of a raw or FASTA sequence file into `output` (path or binary file).
+
+    FASTA records are written as '>id' followed by the protein on one line;
+    a file without headers gives just the protein. Returns a list of
+    (record_id, bases, residues) per record.
+    """
+    out = open(output, "wb") if isinstance(output, (str, os.PathLike)) else output
+    summary = []
+    try:
+        with open(input_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return summary
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mmap, "MADV_SEQUENTIAL"):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                size = len(mm)
+                position = 0
+                if mm[:1] != b">":
+                    # Sequence before the first header (or a file without headers)
+                    position, bases, residues = translate_mapped_record(mm, 0, out, window, table_id)
+                    if bases:
+                        out.write(b"\n")
+                        summary.append((None, bases, residues))
+                while position < size:
+                    line_end = mm.find(b"\n", position)
+                    line_end = size if line_end == -1 else line_end
+                    header = mm[position + 1:line_end].decode("utf-8", errors="replace").split(maxsplit=1)
+                    record_id = header[0] if header else ""
+                    out.write(b">" + record_id.encode("utf-8") + b"\n")
+                    position, bases, residues = translate_mapped_record(mm, line_end + 1, out, window, table_id)
+                    out.write(b"\n")
+                    summary.append((record_id, bases, residues))
+    finally:
+        if out is not output:
+            out.close()
+        else:
+            out.flush()
+    return summary
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Translate a large raw or FASTA sequence file using a memory map")
+    parser.add_argument("input", help="Sequence file (raw bases or FASTA)")
+    parser.add_argument("--output", "-o", default="-", help="Output file (default: stdout)")
+    parser.add_argument("--window", type=int, default=DEFAULT_WINDOW, help="Bytes translated at a time (default: 8 MiB)")
+    parser.add_argument("--table", type=int, default=1, help="NCBI genetic code table (default: 1, standard)")
+    args = parser.parse_args(argv)
+    if args.window < 1:
+        parser.error("--window must be positive")
+
+    output = sys.stdout.buffer if args.output == "-" else args.output
+    for record_id, bases, residues in translate_file(args.input, output, args.window, args.table):
+        print(f"{record_id or '(no header)'}: {bases} bases -> {residues} residues", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
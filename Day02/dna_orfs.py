@@ -0,0 +1,139 @@
+"""Six-frame translation and open reading frame (ORF) search.
+
+Example:
+    python dna_orfs.py genome.fasta --min-length 100
+
+The sequence is encoded once (see done_in_class_dna_utils.encode_DNA) and
+its reverse complement is derived from the encoded array. The codon index
+of every position is computed once per strand; the three frames of a
+strand are then just every third element of that array, starting at 0, 1
+or 2, so no strings are sliced or copied per frame.
+"""
+import argparse
+import sys
+from typing import NamedTuple
+import numpy as np
+from done_in_class_dna_utils import encode_DNA, codon_table, INVALID_BASE, UNKNOWN_CODON
+
+OUTPUT_COLUMNS = ["id", "strand", "frame", "start", "end", "length", "protein"]
+
+# Complement of each code: A(0) <-> T(3), C(1) <-> G(2), unknown stays unknown
+_COMPLEMENT = np.array([3, 2, 1, 0, INVALID_BASE], dtype=np.uint8)
+
+class ORF(NamedTuple):
+    """An open reading frame. start/end are 0-based, end-exclusive positions on the forward strand,
+    including the stop codon if there is one. length is the number of amino acids (without the stop)."""
+    strand: str
+    frame: int
+    start: int
+    end: int
+    length: int
+    protein: str
+
+def reverse_complement_codes(codes: np.ndarray) -> np.ndarray:
+    """Reverse complement of an encoded sequence."""
+    return _COMPLEMENT[codes[::-1]]
+
+def position_codon_indices(codes: np.ndarray) -> np.ndarray:
+    """Codon index of the codon starting at every position (64 if it contains an unknown base)."""
+    if len(codes) < 3:
+        return np.empty(0, dtype=np.uint8)
+    first, second, third = codes[:-2], codes[1:-1], codes[2:]
+    indices = first * 16 + second * 4 + third
+    indices[(first | second | third) > 3] = UNKNOWN_CODON
+    return indices
+
+def _strand_indices(codes: np.ndarray) -> dict:
+    """Per-position codon indices of the forward strand and of the reverse complement."""
+    return {"+": position_codon_indices(codes), "-": position_codon_indices(reverse_complement_codes(codes))}
+
+def six_frame_translation(sequence, table_id: int = 1) -> dict:
+    """Translate all six reading frames. Keys are '+1', '+2', '+3' (forward) and '-1', '-2', '-3'
+    (reverse complement); frame 1 starts at the first base of the strand."""
+    table = codon_table(table_id)
+    strands = _strand_indices(encode_DNA(sequence))
+    return {
+        f"{strand}{offset + 1}": table[strands[strand][offset::3]].tobytes().decode("ascii")
+        for strand in "+-" for offset in range(3)
+    }
+
+def _codon_index(codon: str) -> int:
+    indices = position_codon_indices(encode_DNA(codon.upper()))
+    if len(codon) != 3 or indices[0] == UNKNOWN_CODON:
+        raise ValueError(f"Invalid start codon '{codon}'.")
+    return int(indices[0])
+
+def _frame_orfs(codons: np.ndarray, amino_acids: np.ndarray, start_indices: np.ndarray,
+                min_length: int, include_partial: bool):
+    """(first codon, stop codon or None) of the longest ORF ending at each stop of one frame.
+
+    For every start codon the next stop is found with searchsorted; of all
+    starts sharing a stop only the first one is kept.
+    """
+    stops = np.flatnonzero(amino_acids == ord("*"))
+    starts = np.flatnonzero(np.isin(codons, start_indices))
+    if len(starts) == 0:
+        return
+    next_stop = np.searchsorted(stops, starts)
+    _, first = np.unique(next_stop, return_index=True)
+    for start, stop_number in zip(starts[first].tolist(), next_stop[first].tolist()):
+        if stop_number < len(stops):
+            stop = stops[stop_number]
+            if stop - start >= min_length:
+                yield start, int(stop)
+        elif include_partial and len(codons) - start >= min_length:
+            yield start, None
+
+def find_orfs(sequence, min_length: int = 100, table_id: int = 1, start_codons=("ATG",),
+              include_partial: bool = False) -> list:
+    """Find ORFs (start codon to stop codon) in all six frames.
+
+    `min_length` is the minimum number of amino acids, not counting the
+    stop. For each stop codon only the longest ORF (from the first start
+    after the previous stop) is reported. With include_partial=True, ORFs
+    that run off the end of the sequence without a stop are reported too.
+    Only uppercase A/C/G/T are recognised; codons with anything else are
+    never starts or stops. Returns ORF tuples sorted by start position.
+    """
+    table = codon_table(table_id)
+    start_indices = np.array([_codon_index(codon) for codon in start_codons])
+    codes = encode_DNA(sequence)
+    n_bases = len(codes)
+    strands = _strand_indices(codes)
+
+    orfs = []
+    for strand in "+-":
+        for offset in range(3):
+            codons = strands[strand][offset::3]
+            amino_acids = table[codons]
+            for first, stop in _frame_orfs(codons, amino_acids, start_indices, min_length, include_partial):
+                last = stop if stop is not None else len(codons)
+                begin, finish = offset + 3 * first, offset + 3 * (last + (stop is not None))
+                if strand == "-":
+                    begin, finish = n_bases - finish, n_bases - begin
+                protein = amino_acids[first:last].tobytes().decode("ascii")
+                orfs.append(ORF(strand, offset + 1, begin, finish, last - first, protein))
+    orfs.sort(key=lambda orf: (orf.start, orf.end, orf.strand))
+    return orfs
+
+def main(argv=None) -> int:
+    from fasta_pipeline import read_fasta
+
+    parser = argparse.ArgumentParser(description="Find open reading frames in all six frames of each FASTA record")
+    parser.add_argument("input", help="FASTA file ('-' for stdin)")
+    parser.add_argument("--min-length", type=int, default=100, help="Minimum ORF length in amino acids (default: 100)")
+    parser.add_argument("--table", type=int, default=1, help="NCBI genetic code table (default: 1, standard)")
+    parser.add_argument("--start-codon", action="append", help="Start codon (repeatable, default: ATG)")
+    parser.add_argument("--partial", action="store_true", help="Also report ORFs without a stop codon")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == "-" else args.input
+    out = sys.stdout
+    out.write("\t".join(OUTPUT_COLUMNS) + "\n")
+    for record_id, sequence in read_fasta(source):
+        for orf in find_orfs(sequence, args.min_length, args.table, args.start_codon or ("ATG",), args.partial):
+            out.write(f"{record_id}\t{orf.strand}\t{orf.frame}\t{orf.start}\t{orf.end}\t{orf.length}\t{orf.protein}\n")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
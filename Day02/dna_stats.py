@@ -0,0 +1,126 @@
+"""Sequence statistics: GC content, codon usage and k-mer counts.
+
+Everything works on the encoded sequence of done_in_class_dna_utils
+(A=0, C=1, G=2, T=3, anything else 4), with NumPy instead of Python loops.
+As in translate_DNA, only uppercase A/C/G/T are bases; uppercase the
+sequence first for soft-masked (lowercase) input. Positions with other
+characters are left out of the statistics.
+"""
+from itertools import product
+from typing import NamedTuple
+import numpy as np
+from done_in_class_dna_utils import encode_DNA, codon_indices, codon_table, INVALID_BASE, UNKNOWN_CODON
+
+# k-mers are packed 2 bits per base into a uint64
+MAX_K = 31
+# Up to this many possible k-mers (k <= 11) are counted with bincount, larger k by sorting
+BINCOUNT_LIMIT = 1 << 22
+
+# ---------------- GC content ----------------
+def gc_content(sequence) -> float:
+    """Percentage of G and C among the valid bases (NaN if there are none)."""
+    counts = np.bincount(encode_DNA(sequence), minlength=INVALID_BASE + 1)
+    valid = counts[:INVALID_BASE].sum()
+    return float((counts[1] + counts[2]) / valid * 100) if valid else float("nan")
+
+class GCWindows(NamedTuple):
+    starts: np.ndarray      # 0-based start of each window
+    gc_percent: np.ndarray  # GC % of the valid bases in the window (NaN if none)
+
+def gc_windows(sequence, window: int, step: int = None) -> GCWindows:
+    """GC content of windows of `window` bases, every `step` bases (default: non-overlapping).
+
+    Uses cumulative sums, so the cost does not depend on the window size.
+    Only complete windows are reported.
+    """
+    step = step or window
+    if window < 1 or step < 1:
+        raise ValueError("Window and step must be at least 1.")
+    codes = encode_DNA(sequence)
+    gc = np.concatenate(([0], np.cumsum((codes == 1) | (codes == 2))))
+    valid = np.concatenate(([0], np.cumsum(codes < INVALID_BASE)))
+    starts = np.arange(0, len(codes) - window + 1, step)
+    gc_count = gc[starts + window] - gc[starts]
+    valid_count = valid[starts + window] - valid[starts]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        percent = np.where(valid_count > 0, gc_count / valid_count * 100, np.nan)
+    return GCWindows(starts, percent)
+
+# ---------------- Codon usage ----------------
+class CodonUsage(NamedTuple):
+    codon: str
+    amino_acid: str
+    count: int
+    per_thousand: float     # per 1000 counted codons
+    fraction: float         # share among the codons of the same amino acid (NaN if none)
+
+def codon_usage(sequence, frame: int = 0, table_id: int = 1) -> list:
+    """Codon usage of one reading frame (0, 1 or 2), one entry per codon in TCAG order.
+
+    Codons with an unknown base are not counted.
+    """
+    counts = np.bincount(codon_indices(encode_DNA(sequence)[frame:]), minlength=UNKNOWN_CODON + 1)[:UNKNOWN_CODON]
+    table = codon_table(table_id)
+    total = counts.sum()
+    per_amino_acid = {}
+    for index, count in enumerate(counts):
+        per_amino_acid[table[index]] = per_amino_acid.get(table[index], 0) + count
+
+    base_code = {"A": 0, "C": 1, "G": 2, "T": 3}
+    usage = []
+    for first, second, third in product("TCAG", repeat=3):
+        index = 16 * base_code[first] + 4 * base_code[second] + base_code[third]
+        count = int(counts[index])
+        amino_acid_total = per_amino_acid[table[index]]
+        usage.append(CodonUsage(
+            first + second + third, chr(table[index]), count,
+            count / total * 1000 if total else float("nan"),
+            count / amino_acid_total if amino_acid_total else float("nan"),
+        ))
+    return usage
+
+# ---------------- k-mers ----------------
+def decode_kmer(code: int, k: int) -> str:
+    """The k-mer string of a packed k-mer code."""
+    return "".join("ACGT"[(int(code) >> (2 * (k - 1 - i))) & 3] for i in range(k))
+
+class KmerCounts(NamedTuple):
+    k: int
+    codes: np.ndarray       # packed k-mer codes (2 bits per base, first base highest), sorted
+    counts: np.ndarray      # occurrences of each k-mer
+
+    def as_dict(self) -> dict:
+        return {decode_kmer(code, self.k): int(count) for code, count in zip(self.codes, self.counts)}
+
+    def most_common(self, n: int = 10) -> list:
+        """The n most frequent k-mers as (k-mer, count), most frequent first (ties by k-mer)."""
+        order = np.argsort(-self.counts, kind="stable")[:n]
+        return [(decode_kmer(self.codes[i], self.k), int(self.counts[i])) for i in order]
+
+def kmer_codes(sequence, k: int) -> np.ndarray:
+    """Packed code of every k-mer that contains only valid bases, in sequence order."""
+    if not 1 <= k <= MAX_K:
+        raise ValueError(f"k must be between 1 and {MAX_K}, got {k}.")
+    codes = encode_DNA(sequence)
+    n = len(codes) - k + 1
+    if n <= 0:
+        return np.empty(0, dtype=np.uint64)
+
+    # Rolling encoding: shift in one base per step, for all positions at once
+    kmers = np.zeros(n, dtype=np.uint64)
+    for offset in range(k):
+        kmers <<= np.uint64(2)
+        kmers |= codes[offset:offset + n]
+    # Drop k-mers with an invalid base (their code would mix in the value 4)
+    invalid = np.concatenate(([0], np.cumsum(codes == INVALID_BASE)))
+    return kmers[invalid[k:] == invalid[:n]]
+
+def kmer_counts(sequence, k: int) -> KmerCounts:
+    """Count all k-mers (k up to 31) of the sequence, leaving out those with an invalid base."""
+    kmers = kmer_codes(sequence, k)
+    if 4 ** k <= BINCOUNT_LIMIT:
+        counts = np.bincount(kmers.astype(np.int64), minlength=4 ** k)
+        present = np.flatnonzero(counts)
+        return KmerCounts(k, present.astype(np.uint64), counts[present])
+    codes, counts = np.unique(kmers, return_counts=True)
+    return KmerCounts(k, codes, counts)
@@ -0,0 +1,15 @@
+"""Helpers shared by the Day02 test files (random sequences and FASTA files)."""
+import numpy as np
+
+def random_sequence(n_bases: int, alphabet: str = "ACGT", seed: int = 0) -> str:
+    """A reproducible random sequence drawn from `alphabet` (repeat letters to make them more likely)."""
+    rng = np.random.default_rng(seed)
+    return "".join(rng.choice(list(alphabet), n_bases))
+
+def write_fasta(path, records, line_width: int = 60, newline: str = "\n"):
+    """Write (id, sequence) records as FASTA, wrapping sequences at `line_width` bases."""
+    with open(path, "w", newline="") as f:
+        for record_id, sequence in records:
+            f.write(f">{record_id} some description{newline}")
+            for i in range(0, len(sequence), line_width):
+                f.write(sequence[i:i + line_width] + newline)
@@ -1,21 +1,52 @@
+import queue
+import threading
 import tkinter as tk
 from tkinter import messagebox
-from done_in_class_dna_utils import check_DNA_sequence, translate_DNA, predict_disorder
-
-
-def validate_sequence(event=None):
-    sequence = entry.get("1.0", tk.END).strip().upper()
-    length = len(sequence)
-    length_label.config(text=f"Length: {length} ({'✓' if length % 3 == 0 else '✗'})")
-
-    invalid = [n for n in sequence if n not in {'A', 'T', 'C', 'G'}]
-    if invalid:
-        result_label.config(text=f"❌ Invalid characters: {', '.join(set(invalid))}", fg="red")
+from done_in_class_dna_utils import validate_DNA_sequence, predict_disorder, IncrementalTranslator
+
+# Wait this long after the last keystroke before updating the results
+DEBOUNCE_MS = 250
+# Longer sequences are validated and translated on a worker thread
+BACKGROUND_LENGTH = 50_000
+# Only this many residues are shown in the protein label
+PROTEIN_DISPLAY_LIMIT = 3000
+
+translator = IncrementalTranslator()
+translator_lock = threading.Lock()
+results = queue.Queue()
+pending_update = None
+generation = 0
+
+
+def analyse(sequence: str) -> tuple:
+    """Validate the sequence and, if it is valid, translate it and predict disorder.
+
+    Reuses the previous translation for the unchanged part of the sequence.
+    May run on a worker thread, so it must not touch any widget.
+    """
+    validation = validate_DNA_sequence(sequence, max_positions=5)
+    if not validation.is_valid:
+        return validation, None, None
+    with translator_lock:
+        protein = translator.update(sequence)
+    return validation, protein, predict_disorder(protein)
+
+def show_analysis(validation, protein, disorder):
+    length_label.config(text=f"Length: {validation.length} ({'✓' if validation.in_frame else '✗'})")
+
+    if not validation.valid_characters:
+        positions = ', '.join(str(p + 1) for p in validation.invalid_positions)
+        more = ', ...' if validation.invalid_count > len(validation.invalid_positions) else ''
+        result_label.config(
+            text=f"❌ Invalid characters: {', '.join(validation.invalid_characters)} "
+                 f"({validation.invalid_count} in total, at position {positions}{more})",
+            fg="red"
+        )
         protein_label.config(text="")
         disorder_label.config(text="")
         return
 
-    if not check_DNA_sequence(sequence):
+    if not validation.in_frame:
         result_label.config(
             text="❌ Invalid sequence. Use only A, T, G, C and length must be a multiple of 3.",
             fg="red"
@@ -25,12 +56,52 @@ def validate_sequence(event=None):
         return
 
     result_label.config(text="✅ Valid DNA sequence.", fg="green")
-    protein = translate_DNA(sequence)
-    disorder = predict_disorder(protein)
+    if len(protein) > PROTEIN_DISPLAY_LIMIT:
+        protein = f"{protein[:PROTEIN_DISPLAY_LIMIT]}... ({len(protein)} residues)"
     protein_label.config(text=f"Protein: {protein}")
     disorder_label.config(text=f"Disorder Prediction: {disorder}")
 
+def schedule_validation(event=None):
+    """Restart the debounce timer; the results are updated once typing pauses."""
+    global pending_update
+    if pending_update is not None:
+        root.after_cancel(pending_update)
+    pending_update = root.after(DEBOUNCE_MS, validate_sequence)
+
+def validate_sequence(event=None):
+    global pending_update, generation
+    if pending_update is not None:
+        root.after_cancel(pending_update)
+        pending_update = None
+    # Results of older requests still running on a worker thread are ignored
+    generation += 1
+
+    sequence = entry.get("1.0", tk.END).strip().upper()
+    if len(sequence) < BACKGROUND_LENGTH:
+        show_analysis(*analyse(sequence))
+        return
+
+    result_label.config(text="⏳ Checking sequence...", fg="gray")
+    request = generation
+    threading.Thread(target=lambda: results.put((request, analyse(sequence))), daemon=True).start()
+
+def poll_results():
+    """Show results from worker threads; runs on the Tk thread every 50 ms."""
+    try:
+        while True:
+            request, analysis = results.get_nowait()
+            if request == generation:
+                show_analysis(*analysis)
+    except queue.Empty:
+        pass
+    root.after(50, poll_results)
+
 def clear_input():
+    global pending_update, generation
+    generation += 1
+    if pending_update is not None:
+        root.after_cancel(pending_update)
+        pending_update = None
     entry.delete("1.0", tk.END)
     result_label.config(text="")
     protein_label.config(text="")
@@ -51,7 +122,7 @@ def start_gui():
     entry = tk.Text(root, height=4, width=70)
     entry.grid(row=1, column=0, columnspan=2, padx=10)
     entry.bind("<Return>", validate_sequence)
-    entry.bind("<KeyRelease>", validate_sequence)
+    entry.bind("<KeyRelease>", schedule_validation)
 
     result_label = tk.Label(root, text="", font=("Arial", 10))
     result_label.grid(row=3, column=0, columnspan=2, pady=5)
@@ -68,6 +139,7 @@ def start_gui():
     clear_button = tk.Button(root, text="Clear", command=clear_input)
     clear_button.grid(row=7, column=0, columnspan=2, pady=5)
 
+    root.after(50, poll_results)
     root.mainloop()
 
 if __name__ == "__main__":
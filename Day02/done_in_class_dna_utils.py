@@ -1,3 +1,8 @@
+from functools import lru_cache
+from itertools import product
+from typing import NamedTuple
+import numpy as np
+
 genetic_code = {
     'ATA':'I', 'ATC':'I', 'ATT':'I', 'ATG':'M',
     'ACA':'T', 'ACC':'T', 'ACG':'T', 'ACT':'T',
@@ -19,28 +24,243 @@ genetic_code = {
 
 disorder_prone_residues = {'P', 'E', 'S', 'Q', 'K', 'R', 'G'}
 
+# NCBI genetic code tables: amino acids for the 64 codons in the order
+# TTT, TTC, TTA, TTG, TCT, ... (first, second, third base each in T, C, A, G order).
+# See https://www.ncbi.nlm.nih.gov/Taxonomy/Utils/wprintgc.cgi
+NCBI_GENETIC_CODES = {
+    1: 'FFLLSSSSYY**CC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG',   # Standard
+    2: 'FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNKKSS**VVVVAAAADDEEGGGG',   # Vertebrate mitochondrial
+    3: 'FFLLSSSSYY**CCWWTTTTPPPPHHQQRRRRIIMMTTTTNNKKSSRRVVVVAAAADDEEGGGG',   # Yeast mitochondrial
+    4: 'FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG',   # Mold/protozoan mito., Mycoplasma
+    5: 'FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNKKSSSSVVVVAAAADDEEGGGG',   # Invertebrate mitochondrial
+    6: 'FFLLSSSSYYQQCC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG',   # Ciliate nuclear
+    9: 'FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNNKSSSSVVVVAAAADDEEGGGG',   # Echinoderm/flatworm mito.
+    10: 'FFLLSSSSYY**CCCWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG',  # Euplotid nuclear
+    11: 'FFLLSSSSYY**CC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG',  # Bacterial, archaeal, plastid
+    12: 'FFLLSSSSYY**CC*WLLLSPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG',  # Alternative yeast nuclear
+    13: 'FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNKKSSGGVVVVAAAADDEEGGGG',  # Ascidian mitochondrial
+    14: 'FFLLSSSSYYY*CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNNKSSSSVVVVAAAADDEEGGGG',  # Alternative flatworm mito.
+    16: 'FFLLSSSSYY*LCC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG',  # Chlorophycean mitochondrial
+    21: 'FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNNKSSSSVVVVAAAADDEEGGGG',  # Trematode mitochondrial
+    22: 'FFLLSS*SYY*LCC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG',  # Scenedesmus obliquus mito.
+    23: 'FF*LSSSSYY**CC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG',  # Thraustochytrium mito.
+    24: 'FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSSKVVVVAAAADDEEGGGG',  # Rhabdopleuridae mito.
+    25: 'FFLLSSSSYY**CCGWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG',  # Candidate division SR1
+    26: 'FFLLSSSSYY**CC*WLLLAPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG',  # Pachysolen tannophilus nuclear
+    29: 'FFLLSSSSYYYYCC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG',  # Mesodinium nuclear
+    30: 'FFLLSSSSYYEECC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG',  # Peritrich nuclear
+    31: 'FFLLSSSSYYEECCWWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG',  # Blastocrithidia nuclear
+    33: 'FFLLSSSSYYY*CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSSKVVVVAAAADDEEGGGG',  # Cephalodiscidae mito.
+}
+
+# Nucleotides are encoded as A=0, C=1, G=2, T=3; anything else (including
+# lowercase letters, as in the dict lookup) is 4. A codon is then
+# 16*first + 4*second + third, and 64 means "contains an unknown base".
+INVALID_BASE = 4
+UNKNOWN_CODON = 64
+_ENCODE_TABLE = bytes(
+    {ord('A'): 0, ord('C'): 1, ord('G'): 2, ord('T'): 3}.get(byte, INVALID_BASE) for byte in range(256)
+)
+
+
+def encode_DNA(sequence) -> np.ndarray:
+    """Encode a DNA sequence (str or bytes) as a uint8 array: A=0, C=1, G=2, T=3, anything else 4."""
+    if isinstance(sequence, str):
+        # One byte per character, so positions stay the same for non-ASCII input
+        sequence = sequence.encode('ascii', errors='replace')
+    return np.frombuffer(bytes(sequence).translate(_ENCODE_TABLE), dtype=np.uint8)
+
+
+@lru_cache(maxsize=None)
+def codon_table(table_id: int = 1) -> np.ndarray:
+    """Lookup table (65 bytes) from codon index to amino acid letter for an NCBI genetic code.
+
+    Entry 64 is 'X', used for codons with an unknown base. Built once per table and cached.
+    """
+    if table_id not in NCBI_GENETIC_CODES:
+        raise ValueError(f"Unknown genetic code table {table_id}. Available: {sorted(NCBI_GENETIC_CODES)}")
+    table = np.full(UNKNOWN_CODON + 1, ord('X'), dtype=np.uint8)
+    base_code = {'A': 0, 'C': 1, 'G': 2, 'T': 3}
+    for amino_acid, (first, second, third) in zip(NCBI_GENETIC_CODES[table_id], product('TCAG', repeat=3)):
+        table[16 * base_code[first] + 4 * base_code[second] + base_code[third]] = ord(amino_acid)
+    table.flags.writeable = False
+    return table
+
+
+def codon_indices(codes: np.ndarray) -> np.ndarray:
+    """Codon index (0-63, or 64 for an unknown base) of every complete codon in an encoded sequence."""
+    codons = codes[:len(codes) // 3 * 3].reshape(-1, 3)
+    first, second, third = codons[:, 0], codons[:, 1], codons[:, 2]
+    indices = first * 16 + second * 4 + third
+    # Valid codes use two bits, so OR-ing the three bases is > 3 only if one of them is 4
+    indices[(first | second | third) > 3] = UNKNOWN_CODON
+    return indices
+
+
+class DNAValidation(NamedTuple):
+    """Result of validate_DNA_sequence."""
+    length: int
+    valid_characters: bool          # only uppercase A, C, G, T
+    in_frame: bool                  # length is a multiple of 3
+    invalid_count: int
+    invalid_characters: dict        # character -> count, in order of first appearance
+    invalid_positions: list         # 0-based offsets of the first invalid characters
+
+    @property
+    def is_valid(self) -> bool:
+        return self.valid_characters and self.in_frame
+
+
+def validate_DNA_sequence(sequence, max_positions: int = 10) -> DNAValidation:
+    """Check a DNA sequence (str or bytes) and report where the invalid characters are.
+
+    Valid sequences are recognised with a single bytes.translate call. Only
+    if something is wrong are the positions of the invalid characters
+    located and counted, with NumPy (no Python loop over the positions);
+    at most `max_positions` positions are returned.
+    """
+    data = sequence.encode('ascii', errors='replace') if isinstance(sequence, str) else bytes(sequence)
+    length = len(data)
+    if not data.translate(None, b'ACGT'):
+        return DNAValidation(length, True, length % 3 == 0, 0, {}, [])
+
+    positions = np.flatnonzero(encode_DNA(data) == INVALID_BASE)
+    # Character codes of the invalid positions; non-ASCII text was replaced by '?' in `data`,
+    # so it is read as code points instead to report the real characters
+    if isinstance(sequence, str) and not sequence.isascii():
+        characters = np.frombuffer(sequence.encode('utf-32-le'), dtype=np.uint32)
+    else:
+        characters = np.frombuffer(data, dtype=np.uint8)
+    codes, first_seen, counts = np.unique(characters[positions], return_index=True, return_counts=True)
+    order = np.argsort(first_seen)
+    invalid_characters = {chr(code): count for code, count in zip(codes[order].tolist(), counts[order].tolist())}
+    return DNAValidation(
+        length, False, length % 3 == 0, len(positions), invalid_characters,
+        positions[:max_positions].tolist(),
+    )
+
 
 def check_DNA_sequence(sequence: str) -> bool:
     """Check that sequence contains only valid nucleotides and length is multiple of 3."""
-    valid_nucleotides = {'A', 'T', 'C', 'G'}
-    if not all(n in valid_nucleotides for n in sequence):
-        return False
-    return len(sequence) % 3 == 0
-
-def translate_DNA(sequence: str) -> str:
-    """Translate a DNA sequence into a protein sequence."""
-    protein = ''
-    for i in range(0, len(sequence) - 2, 3):
-        codon = sequence[i:i+3]
-        protein += genetic_code.get(codon, 'X')  # X for unknown codons
-    return protein
+    return validate_DNA_sequence(sequence, max_positions=0).is_valid
+
+def translate_DNA(sequence: str, table_id: int = 1) -> str:
+    """Translate a DNA sequence into a protein sequence.
+
+    Works on the whole sequence at once: the bases are encoded to a byte
+    array and every codon is looked up in a 65-entry table. Unknown codons
+    give 'X' and a trailing partial codon is ignored. `table_id` picks an
+    NCBI genetic code (1 = standard).
+    """
+    return codon_table(table_id)[codon_indices(encode_DNA(sequence))].tobytes().decode('ascii')
+
+def disorder_percentage(protein: str) -> float:
+    """Percentage of disorder-prone residues in a protein (NaN for an empty protein)."""
+    if not protein:
+        return float('nan')
+    count = sum(protein.count(aa) for aa in disorder_prone_residues)
+    return (count / len(protein)) * 100
+
+def _common_prefix_length(a: str, b: str, block: int = 4096) -> int:
+    """Length of the common prefix of a and b, comparing whole blocks at C speed first."""
+    limit = min(len(a), len(b))
+    i = 0
+    while i + block <= limit and a[i:i + block] == b[i:i + block]:
+        i += block
+    while i < limit and a[i] == b[i]:
+        i += 1
+    return i
+
+def _common_suffix_length(a: str, b: str, limit: int, block: int = 4096) -> int:
+    """Length of the common suffix of a and b, at most `limit`."""
+    la, lb = len(a), len(b)
+    i = 0
+    while i + block <= limit and a[la - i - block:la - i] == b[lb - i - block:lb - i]:
+        i += block
+    while i < limit and a[la - i - 1] == b[lb - i - 1]:
+        i += 1
+    return i
+
+
+class IncrementalTranslator:
+    """Translate a sequence that changes a little at a time, such as text being typed.
+
+    update() compares the new sequence with the previous one and only
+    translates the codons touched by the edit. Codons before the edit are
+    always reused. Codons after it are reused when the edit did not shift the
+    reading frame (the length changed by a multiple of 3). The result is
+    always the same as translate_DNA(sequence, table_id).
+    """
+
+    def __init__(self, table_id: int = 1):
+        self.table_id = table_id
+        self.sequence = ''
+        self.protein = ''
+        self.last_translated = 0    # bases translated by the last update
+
+    def update(self, sequence: str) -> str:
+        old, old_protein = self.sequence, self.protein
+        prefix = _common_prefix_length(old, sequence)
+        suffix = _common_suffix_length(old, sequence, min(len(old), len(sequence)) - prefix)
+
+        first_codon = prefix // 3
+        shift = len(sequence) - len(old)
+        if shift % 3 == 0:
+            # First codon lying entirely in the unchanged tail; it and the
+            # codons after it are the old codons, moved by shift // 3
+            suffix_codon = -(-(len(sequence) - suffix) // 3)
+            middle = sequence[3 * first_codon:3 * suffix_codon]
+            tail = old_protein[suffix_codon - shift // 3:]
+        else:
+            middle, tail = sequence[3 * first_codon:], ''
+
+        self.protein = old_protein[:first_codon] + translate_DNA(middle, self.table_id) + tail
+        self.sequence = sequence
+        self.last_translated = len(middle)
+        return self.protein
+
+
+class DisorderProfile(NamedTuple):
+    """Result of disorder_profile."""
+    profile: np.ndarray     # % disorder-prone residues in the window around each residue
+    segments: list          # (start, end) of disordered regions, 0-based and end-exclusive
+
+
+_DISORDER_PRONE_BYTES = np.zeros(256, dtype=bool)
+_DISORDER_PRONE_BYTES[[ord(aa) for aa in disorder_prone_residues]] = True
+
+
+def disorder_profile(protein: str, window: int = 21, threshold: float = 30, min_length: int = 1) -> DisorderProfile:
+    """Per-residue disorder profile and the disordered segments of a protein.
+
+    profile[i] is the percentage of disorder-prone residues in a window of
+    `window` residues centred on residue i (shortened at the ends of the
+    protein). Window counts come from a cumulative sum, so the whole profile
+    takes O(n) whatever the window size. Residues with a profile above
+    `threshold` (same rule as predict_disorder) form segments; segments
+    shorter than `min_length` are dropped.
+    """
+    if window < 1:
+        raise ValueError(f"Window must be at least 1, got {window}.")
+    n = len(protein)
+    mask = _DISORDER_PRONE_BYTES[np.frombuffer(protein.encode('ascii', errors='replace'), dtype=np.uint8)]
+    counts = np.concatenate(([0], np.cumsum(mask)))
+
+    starts = np.arange(n) - window // 2
+    lo = np.clip(starts, 0, n)
+    hi = np.clip(starts + window, 0, n)
+    profile = (counts[hi] - counts[lo]) / (hi - lo) * 100
+
+    # Segment edges are where the above-threshold flag switches on or off
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], profile > threshold, [0])).astype(np.int8)))
+    segments = [(int(start), int(end)) for start, end in zip(edges[::2], edges[1::2]) if end - start >= min_length]
+    return DisorderProfile(profile, segments)
 
 def predict_disorder(protein: str) -> str:
     """Predict whether a protein is likely disordered based on disorder-prone residues."""
     if not protein:
         return "N/A"
-    count = sum(1 for aa in protein if aa in disorder_prone_residues)
-    percent = (count / len(protein)) * 100
+    percent = disorder_percentage(protein)
     if percent > 30:
         return f"Likely disordered ({percent:.1f}% disorder-prone residues)"
     else:
@@ -0,0 +1,152 @@
+"""Translate every record of a (multi-)FASTA file and predict its disorder.
+
+Example:
+    python fasta_pipeline.py genes.fasta --output genes.tsv --workers 4
+
+The file is read one record at a time and the records are sent in batches
+to a pool of worker processes. Only a few batches are in flight at once, so
+memory stays bounded however large the file is. The output is a TSV with
+one row per record, in the same order as the input.
+"""
+import argparse
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from done_in_class_dna_utils import validate_DNA_sequence, translate_DNA, disorder_percentage
+
+OUTPUT_COLUMNS = ["id", "length", "valid", "protein", "disorder_percent"]
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_BATCH_BASES = 10_000_000
+
+def read_fasta(source):
+    """Yield (id, sequence) for each record of a FASTA file (path or open text file).
+
+    The id is the first word of the header line. Sequence lines are joined
+    and uppercased, as in the GUI. Lines before the first header are ignored.
+    """
+    handle = open(source) if isinstance(source, str) else source
+    try:
+        record_id, parts = None, []
+        for line in handle:
+            line = line.strip()
+            if line.startswith(">"):
+                if record_id is not None:
+                    yield record_id, "".join(parts).upper()
+                header = line[1:].split(maxsplit=1)
+                record_id, parts = (header[0] if header else ""), []
+            elif line and record_id is not None:
+                parts.append(line)
+        if record_id is not None:
+            yield record_id, "".join(parts).upper()
+    finally:
+        if handle is not source:
+            handle.close()
+
+def batched_records(records, batch_size: int = DEFAULT_BATCH_SIZE, batch_bases: int = DEFAULT_BATCH_BASES):
+    """Group records into lists of at most `batch_size` records or about `batch_bases` bases."""
+    batch, bases = [], 0
+    for record in records:
+        batch.append(record)
+        bases += len(record[1])
+        if len(batch) >= batch_size or bases >= batch_bases:
+            yield batch
+            batch, bases = [], 0
+    if batch:
+        yield batch
+
+def analyse_record(record_id: str, sequence: str, table_id: int = 1) -> tuple:
+    """One output row: id, length, validity, protein and disorder percentage.
+
+    Invalid sequences (same rule as check_DNA_sequence) get an empty protein
+    and disorder percentage, as in the GUI.
+    """
+    if not validate_DNA_sequence(sequence, max_positions=0).is_valid:
+        return record_id, len(sequence), False, "", float("nan")
+    protein = translate_DNA(sequence, table_id)
+    return record_id, len(sequence), True, protein, disorder_percentage(protein)
+
+def analyse_batch(batch: list, table_id: int = 1) -> list:
+    """Analyse a list of (id, sequence) records. Runs in the worker processes.
+
+    Gives the same rows as analyse_record, but all valid sequences of the
+    batch are translated with one translate_DNA call: they are all a
+    multiple of 3 long, so joining them keeps every codon in frame.
+    """
+    valid = [validate_DNA_sequence(sequence, max_positions=0).is_valid for _, sequence in batch]
+    proteins = translate_DNA("".join(sequence for (_, sequence), ok in zip(batch, valid) if ok), table_id)
+
+    rows, start = [], 0
+    for (record_id, sequence), ok in zip(batch, valid):
+        if not ok:
+            rows.append((record_id, len(sequence), False, "", float("nan")))
+            continue
+        protein = proteins[start:start + len(sequence) // 3]
+        start += len(sequence) // 3
+        rows.append((record_id, len(sequence), True, protein, disorder_percentage(protein)))
+    return rows
+
+def format_row(row: tuple) -> str:
+    record_id, length, valid, protein, percent = row
+    percent_text = "" if percent != percent else f"{percent:.2f}"
+    return f"{record_id}\t{length}\t{valid}\t{protein}\t{percent_text}\n"
+
+def run_pipeline(source, output, workers: int = None, batch_size: int = DEFAULT_BATCH_SIZE,
+                 batch_bases: int = DEFAULT_BATCH_BASES, max_pending: int = None, table_id: int = 1) -> int:
+    """Analyse every record of `source` and write the TSV to `output` (path, '-' or an open file).
+
+    With workers=1 everything runs in this process. Otherwise at most
+    `max_pending` batches (default: twice the number of workers) are
+    submitted at a time; results are written in input order as the oldest
+    batch finishes. Returns the number of records written.
+    """
+    out = sys.stdout if output == "-" else (open(output, "w", newline="") if isinstance(output, str) else output)
+    written = 0
+
+    def write_rows(rows):
+        nonlocal written
+        out.writelines(format_row(row) for row in rows)
+        written += len(rows)
+
+    try:
+        out.write("\t".join(OUTPUT_COLUMNS) + "\n")
+        batches = batched_records(read_fasta(source), batch_size, batch_bases)
+
+        if workers == 1:
+            for batch in batches:
+                write_rows(analyse_batch(batch, table_id))
+            return written
+
+        workers = workers or os.cpu_count() or 1
+        max_pending = max_pending or 2 * workers
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            for batch in batches:
+                if len(pending) >= max_pending:
+                    write_rows(pending.popleft().result())
+                pending.append(executor.submit(analyse_batch, batch, table_id))
+            while pending:
+                write_rows(pending.popleft().result())
+        return written
+    finally:
+        if out is not sys.stdout and out is not output:
+            out.close()
+        else:
+            out.flush()
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Translate a multi-FASTA file and predict disorder for each record")
+    parser.add_argument("input", help="FASTA file ('-' for stdin)")
+    parser.add_argument("--output", "-o", default="-", help="Output TSV file (default: stdout)")
+    parser.add_argument("--workers", type=int, help="Number of worker processes (default: one per CPU, 1 = no pool)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Records per batch")
+    parser.add_argument("--table", type=int, default=1, help="NCBI genetic code table (default: 1, standard)")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == "-" else args.input
+    count = run_pipeline(source, args.output, workers=args.workers, batch_size=args.batch_size, table_id=args.table)
+    print(f"{count} records written.", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+import io
+import os
+import subprocess
+import sys
+from done_in_class_dna_utils import translate_DNA
+from fasta_pipeline import OUTPUT_COLUMNS, analyse_batch, format_row
+from dna_cli import read_records, process, main
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+class CountingFlushes(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.flushes = 0
+
+    def flush(self):
+        self.flushes += 1
+        super().flush()
+
+def test_read_records_detects_format():
+    """Input starting with '>' is read as FASTA, anything else as one sequence per line (id = line number)."""
+
+    assert list(read_records(io.StringIO("\n>a x\nATG\nccc\n>b\nTT\n"))) == [("a", "ATGCCC"), ("b", "TT")]
+    assert list(read_records(io.StringIO("\natgaaa\n\nTTT\n"))) == [("2", "ATGAAA"), ("4", "TTT")]
+    assert list(read_records(io.StringIO(""))) == []
+    assert list(read_records(io.StringIO(">a\nATG\n"), fmt="lines")) == [("1", ">A"), ("2", "ATG")]
+
+def test_process_matches_pipeline_rows_and_flushes_per_batch():
+    """Each record gives the same TSV row as the FASTA pipeline, and output is flushed once per batch."""
+
+    sequences = ["ATGAAATTT", "ATGNNN", "", "atgccctaa", "GGGCCCAAATTT"]
+    out = CountingFlushes()
+    count = process(io.StringIO("\n".join(sequences) + "\n"), out, batch_size=2)
+
+    expected = analyse_batch([(str(i + 1), s.upper()) for i, s in enumerate(sequences) if s])
+    assert count == 4
+    assert out.getvalue() == "".join(format_row(row) for row in expected)
+    assert out.flushes == 2
+    assert out.getvalue().splitlines()[2].split("\t")[3] == translate_DNA("ATGCCCTAA")
+
+def test_main_reads_files_and_writes_header(tmp_path, capsys):
+    """Several input files are processed in order under one header line."""
+
+    (tmp_path / "a.txt").write_text("ATGAAA\n")
+    (tmp_path / "b.fasta").write_text(">x\nATG\nTGA\n")
+    assert main([str(tmp_path / "a.txt"), str(tmp_path / "b.fasta"), "--table", "2"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == "\t".join(OUTPUT_COLUMNS)
+    assert [line.split("\t")[:4] for line in lines[1:]] == [["1", "6", "True", "MK"], ["x", "6", "True", "MW"]]
+
+def test_main_reports_missing_file(tmp_path, capsys):
+    """A missing input file is reported on stderr with a non-zero exit code."""
+
+    assert main([str(tmp_path / "missing.txt")]) == 1
+    assert "Error" in capsys.readouterr().err
+
+def test_command_line_pipe_without_tkinter():
+    """The script works as a filter on stdin/stdout and never imports tkinter."""
+
+    code = ("import sys; sys.argv = ['dna_cli.py', '--no-header']; "
+            "import dna_cli; status = dna_cli.main(); "
+            "assert 'tkinter' not in sys.modules, 'tkinter imported'; sys.exit(status)")
+    result = subprocess.run([sys.executable, "-c", code], input="ATGAAATTT\nATGCCC\n",
+                            capture_output=True, text=True, cwd=HERE)
+    assert result.returncode == 0, result.stderr
+    assert [line.split("\t")[:4] for line in result.stdout.splitlines()] == [
+        ["1", "9", "True", "MKF"], ["2", "6", "True", "MP"]]
@@ -0,0 +1,44 @@
+import io
+import pytest
+from done_in_class_dna_utils import translate_DNA
+from dna_mmap import translate_file
+from dna_test_helpers import random_sequence, write_fasta
+
+# Soft-masked (lowercase) bases are translated too
+MMAP_ALPHABET = "ACGTACGTACGTacgtN"
+
+@pytest.mark.parametrize("window", [1, 2, 7, 64, 1 << 20])
+@pytest.mark.parametrize("newline", ["\n", "\r\n"])
+def test_fasta_matches_translate_DNA(tmp_path, window, newline):
+    """Every record translates like translate_DNA on the joined, uppercased sequence, for any window size."""
+
+    records = [("a", random_sequence(1000, MMAP_ALPHABET, seed=1)), ("empty", ""), ("b", random_sequence(301, MMAP_ALPHABET, seed=2)), ("c", "AT")]
+    path = tmp_path / "in.fasta"
+    write_fasta(path, records, line_width=61, newline=newline)
+    out = io.BytesIO()
+
+    summary = translate_file(str(path), out, window=window)
+
+    expected = "".join(f">{record_id}\n{translate_DNA(sequence.upper())}\n" for record_id, sequence in records)
+    assert out.getvalue().decode("ascii") == expected
+    assert summary == [(record_id, len(sequence), len(sequence) // 3) for record_id, sequence in records]
+
+def test_raw_file_without_header(tmp_path):
+    """A plain sequence file (with line breaks) gives the protein without a header."""
+
+    sequence = random_sequence(500, MMAP_ALPHABET, seed=3)
+    path = tmp_path / "raw.txt"
+    path.write_text("\n".join(sequence[i:i + 70] for i in range(0, len(sequence), 70)) + "\n")
+    output = tmp_path / "protein.txt"
+
+    assert translate_file(str(path), str(output), window=16) == [(None, 500, 166)]
+    assert output.read_text() == translate_DNA(sequence.upper()) + "\n"
+
+def test_empty_file(tmp_path):
+    """An empty file gives an empty output instead of an mmap error."""
+
+    path = tmp_path / "empty.fasta"
+    path.write_bytes(b"")
+    out = io.BytesIO()
+    assert translate_file(str(path), out) == []
+    assert out.getvalue() == b""
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+from done_in_class_dna_utils import encode_DNA, translate_DNA
+from dna_orfs import find_orfs, six_frame_translation, reverse_complement_codes, ORF
+from dna_test_helpers import random_sequence
+
+ORF_ALPHABET = "ACGTACGTACGTACGTN"
+COMPLEMENT = str.maketrans("ACGT", "TGCA")
+
+def reverse_complement(sequence: str) -> str:
+    return sequence.translate(COMPLEMENT)[::-1]
+
+def find_orfs_reference(sequence: str, min_length: int) -> list:
+    """Straightforward string scan: in each frame, the first ATG after a stop opens an ORF that the next stop closes."""
+    n = len(sequence)
+    orfs = []
+    for strand, strand_sequence in (("+", sequence), ("-", reverse_complement(sequence))):
+        for offset in range(3):
+            protein = translate_DNA(strand_sequence[offset:])
+            open_at = None
+            for k, amino_acid in enumerate(protein):
+                codon = strand_sequence[offset + 3 * k: offset + 3 * k + 3]
+                if open_at is None and codon == "ATG":
+                    open_at = k
+                if amino_acid == "*" and open_at is not None:
+                    if k - open_at >= min_length:
+                        begin, end = offset + 3 * open_at, offset + 3 * k + 3
+                        if strand == "-":
+                            begin, end = n - end, n - begin
+                        orfs.append(ORF(strand, offset + 1, begin, end, k - open_at, protein[open_at:k]))
+                    open_at = None
+    return sorted(orfs, key=lambda orf: (orf.start, orf.end, orf.strand))
+
+def test_reverse_complement_codes():
+    """Complementing the codes matches complementing the string, and unknown bases stay unknown."""
+
+    sequence = "AACGTNGT"
+    np.testing.assert_array_equal(reverse_complement_codes(encode_DNA(sequence)), encode_DNA(reverse_complement(sequence)))
+
+def test_six_frames_match_string_translation():
+    """Each frame equals translating the (reverse complemented) string from offset 0, 1 or 2."""
+
+    sequence = random_sequence(1001, ORF_ALPHABET)
+    frames = six_frame_translation(sequence)
+    for offset in range(3):
+        assert frames[f"+{offset + 1}"] == translate_DNA(sequence[offset:])
+        assert frames[f"-{offset + 1}"] == translate_DNA(reverse_complement(sequence)[offset:])
+    assert six_frame_translation("AT") == {frame: "" for frame in ["+1", "+2", "+3", "-1", "-2", "-3"]}
+
+def test_simple_orfs_on_both_strands():
+    """A forward ORF and a reverse-strand ORF get forward-strand coordinates including the stop codon."""
+
+    forward = "CC" + "ATGAAACCCTAA" + "GG"
+    orfs = find_orfs(forward, min_length=3)
+    assert ORF("+", 3, 2, 14, 3, "MKP") in orfs
+
+    reverse = reverse_complement(forward)
+    orfs = find_orfs(reverse, min_length=3)
+    hit = [orf for orf in orfs if orf.strand == "-"]
+    assert hit == [ORF("-", 3, 2, 14, 3, "MKP")]
+    assert reverse_complement(reverse[hit[0].start:hit[0].end]) == "ATGAAACCCTAA"
+
+def test_partial_orfs_are_optional():
+    """An ORF without a stop codon is only reported with include_partial."""
+
+    sequence = "ATGAAACCC"
+    assert [orf for orf in find_orfs(sequence, min_length=1) if orf.strand == "+"] == []
+    assert ORF("+", 1, 0, 9, 3, "MKP") in find_orfs(sequence, min_length=1, include_partial=True)
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("min_length", [0, 5, 30])
+def test_matches_reference_scan(seed, min_length):
+    """ORFs agree with a plain string scan on random sequences."""
+
+    sequence = random_sequence(3000, ORF_ALPHABET, seed=seed)
+    assert find_orfs(sequence, min_length=min_length) == find_orfs_reference(sequence, min_length)
+
+def test_invalid_start_codon():
+    """Start codons must be three valid bases."""
+
+    with pytest.raises(ValueError, match="Invalid start codon"):
+        find_orfs("ATGTAA", start_codons=("AT",))
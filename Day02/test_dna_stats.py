@@ -0,0 +1,67 @@
+from collections import Counter
+import numpy as np
+import pytest
+from done_in_class_dna_utils import genetic_code
+from dna_stats import gc_content, gc_windows, codon_usage, kmer_counts, decode_kmer
+from dna_test_helpers import random_sequence
+
+STATS_ALPHABET = "ACGTACGTACGTN"
+
+def gc_reference(sequence: str) -> float:
+    valid = [n for n in sequence if n in "ACGT"]
+    return sum(n in "GC" for n in valid) / len(valid) * 100 if valid else float("nan")
+
+def test_gc_content():
+    """GC % counts only valid bases."""
+
+    sequence = random_sequence(5000, STATS_ALPHABET)
+    assert gc_content(sequence) == pytest.approx(gc_reference(sequence))
+    assert gc_content("GGCCAT") == pytest.approx(200 / 3)
+    assert np.isnan(gc_content("NNN"))
+
+@pytest.mark.parametrize("window, step", [(1, None), (10, None), (100, 7), (250, 250)])
+def test_gc_windows_match_reference(window, step):
+    """Every complete window agrees with computing it directly."""
+
+    sequence = random_sequence(2000, STATS_ALPHABET, seed=1)
+    result = gc_windows(sequence, window, step)
+    starts = list(range(0, len(sequence) - window + 1, step or window))
+    assert result.starts.tolist() == starts
+    expected = [gc_reference(sequence[s:s + window]) for s in starts]
+    np.testing.assert_allclose(result.gc_percent, expected)
+
+def test_codon_usage_matches_counter():
+    """Codon counts per frame match a Counter over the codon strings; fractions add up per amino acid."""
+
+    sequence = random_sequence(3001, STATS_ALPHABET, seed=2)
+    for frame in range(3):
+        codons = [sequence[i:i + 3] for i in range(frame, len(sequence) - 2, 3)]
+        expected = Counter(c for c in codons if c in genetic_code)
+        usage = codon_usage(sequence, frame=frame)
+        assert len(usage) == 64
+        assert {u.codon: u.count for u in usage} == {codon: expected.get(codon, 0) for codon in genetic_code}
+        assert all(u.amino_acid == genetic_code[u.codon] for u in usage)
+        assert sum(u.per_thousand for u in usage) == pytest.approx(1000)
+        for amino_acid in set(genetic_code.values()):
+            assert sum(u.fraction for u in usage if u.amino_acid == amino_acid) == pytest.approx(1)
+
+@pytest.mark.parametrize("k", [1, 3, 8, 11, 12, 20])
+def test_kmer_counts_match_counter(k):
+    """Both counting paths (bincount for small k, sorting for large k) match a Counter of substrings."""
+
+    sequence = random_sequence(3000, STATS_ALPHABET, seed=k)
+    expected = Counter(sequence[i:i + k] for i in range(len(sequence) - k + 1))
+    expected = {kmer: count for kmer, count in expected.items() if set(kmer) <= set("ACGT")}
+    result = kmer_counts(sequence, k)
+    assert result.as_dict() == expected
+    assert np.all(np.diff(result.codes.astype(np.int64)) > 0)
+
+def test_kmer_helpers():
+    """Most common k-mers and decoding; too short sequences and bad k."""
+
+    result = kmer_counts("AAAAACGT", 2)
+    assert result.most_common(2) == [("AA", 4), ("AC", 1)]
+    assert decode_kmer(0b00011011, 4) == "ACGT"
+    assert kmer_counts("ACG", 5).as_dict() == {}
+    with pytest.raises(ValueError):
+        kmer_counts("ACGT", 0)
@@ -0,0 +1,200 @@
+from collections import Counter
+import numpy as np
+import pytest
+from done_in_class_dna_utils import (
+    genetic_code, NCBI_GENETIC_CODES, codon_table, encode_DNA, translate_DNA,
+    check_DNA_sequence, validate_DNA_sequence, disorder_profile, disorder_prone_residues,
+    IncrementalTranslator,
+)
+from dna_test_helpers import random_sequence
+
+def translate_DNA_reference(sequence: str) -> str:
+    """The original codon-by-codon translation, kept here to compare against."""
+    protein = ''
+    for i in range(0, len(sequence) - 2, 3):
+        codon = sequence[i:i+3]
+        protein += genetic_code.get(codon, 'X')
+    return protein
+
+def test_standard_table_matches_genetic_code():
+    """Table 1 gives the same amino acid as the genetic_code dict for all 64 codons."""
+
+    for codon, amino_acid in genetic_code.items():
+        assert translate_DNA(codon) == amino_acid
+    assert len(genetic_code) == 64
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("n_bases", [0, 1, 2, 3, 4, 5, 299, 3000, 3001])
+def test_matches_reference_on_random_sequences(n_bases, seed):
+    """Random sequences of any length (including partial trailing codons) translate exactly as before."""
+
+    sequence = random_sequence(n_bases, seed=seed)
+    assert translate_DNA(sequence) == translate_DNA_reference(sequence)
+
+@pytest.mark.parametrize("sequence", [
+    "ATGNNNTAA",        # N in a codon
+    "atgAAAccc",        # lowercase is not in the dict, so it gives X
+    "ATG AAA",          # whitespace shifts the frame like any other character
+    "ATGéAAAC",         # non-ASCII characters count as one position each
+    "ATG\nTTT",
+])
+def test_matches_reference_on_invalid_input(sequence):
+    """Anything outside uppercase ACGT behaves exactly like the dict lookup did."""
+
+    assert translate_DNA(sequence) == translate_DNA_reference(sequence)
+
+def test_matches_reference_on_mixed_alphabet():
+    """A long sequence sprinkled with invalid characters matches the reference."""
+
+    sequence = random_sequence(10_000, alphabet="ACGTACGTACGTNacgt-", seed=1)
+    assert translate_DNA(sequence) == translate_DNA_reference(sequence)
+
+def test_alternative_genetic_codes():
+    """Other NCBI tables change only the codons they reassign."""
+
+    assert translate_DNA("TGAATAAGA", table_id=2) == "WM*"    # vertebrate mitochondrial
+    assert translate_DNA("TAATAG", table_id=6) == "QQ"         # ciliate nuclear
+    assert translate_DNA("CTG", table_id=12) == "S"            # alternative yeast nuclear
+    assert translate_DNA("TGA", table_id=11) == "*"            # same as standard
+
+    for table_id, amino_acids in NCBI_GENETIC_CODES.items():
+        assert len(amino_acids) == 64, table_id
+        assert set(amino_acids) <= set("ACDEFGHIKLMNPQRSTVWY*"), table_id
+
+def test_unknown_table_is_rejected():
+    """An unknown table id raises a ValueError listing the available tables."""
+
+    with pytest.raises(ValueError, match="Unknown genetic code table"):
+        translate_DNA("ATG", table_id=7)
+
+def test_codon_table_is_cached_and_read_only():
+    """Each lookup table is built once and cannot be modified by callers."""
+
+    assert codon_table(1) is codon_table(1)
+    with pytest.raises(ValueError):
+        codon_table(1)[0] = ord("Z")
+
+def test_encode_accepts_bytes():
+    """Bytes and str give the same encoding."""
+
+    np.testing.assert_array_equal(encode_DNA(b"ACGTN"), encode_DNA("ACGTN"))
+    np.testing.assert_array_equal(encode_DNA("ACGTN"), [0, 1, 2, 3, 4])
+
+def check_DNA_sequence_reference(sequence: str) -> bool:
+    """The original character-by-character check."""
+    valid_nucleotides = {'A', 'T', 'C', 'G'}
+    if not all(n in valid_nucleotides for n in sequence):
+        return False
+    return len(sequence) % 3 == 0
+
+@pytest.mark.parametrize("sequence", ["", "ATG", "ATGC", "ATGNNN", "atg", "ATG ", "ATGé", "TTTAAACCCGGG"])
+def test_check_matches_reference(sequence):
+    """check_DNA_sequence keeps its old answer, now built on validate_DNA_sequence."""
+
+    assert check_DNA_sequence(sequence) == check_DNA_sequence_reference(sequence)
+
+def test_validate_valid_sequence():
+    """A clean sequence has no invalid characters; the frame check is reported separately."""
+
+    result = validate_DNA_sequence("ATGCA")
+    assert result.valid_characters and not result.in_frame and not result.is_valid
+    assert (result.length, result.invalid_count, result.invalid_characters, result.invalid_positions) == (5, 0, {}, [])
+    assert validate_DNA_sequence("ATGCAT").is_valid
+
+def test_validate_reports_counts_and_positions():
+    """Invalid characters are counted and their first positions returned."""
+
+    result = validate_DNA_sequence("ANGxNNéT", max_positions=3)
+    assert not result.is_valid
+    assert result.invalid_count == 5
+    assert list(result.invalid_characters.items()) == [("N", 3), ("x", 1), ("é", 1)]
+    assert result.invalid_positions == [1, 3, 4]
+
+def test_validate_positions_match_python_scan():
+    """Positions agree with a plain Python scan on a long random sequence, for str and bytes."""
+
+    sequence = random_sequence(5000, alphabet="ACGTACGTACGTN-", seed=2)
+    expected = [i for i, n in enumerate(sequence) if n not in "ACGT"]
+    for value in (sequence, sequence.encode("ascii")):
+        result = validate_DNA_sequence(value, max_positions=len(sequence))
+        assert result.invalid_positions == expected
+        assert result.invalid_count == len(expected)
+        assert list(result.invalid_characters.items()) == list(Counter(sequence[i] for i in expected).items())
+
+def disorder_profile_reference(protein: str, window: int, threshold: float) -> tuple:
+    """Recount every window from scratch (O(n*w))."""
+    profile = []
+    for i in range(len(protein)):
+        lo, hi = max(0, i - window // 2), min(len(protein), i - window // 2 + window)
+        count = sum(1 for aa in protein[lo:hi] if aa in disorder_prone_residues)
+        profile.append(count / (hi - lo) * 100)
+    segments, start = [], None
+    for i, value in enumerate(profile + [0]):
+        if value > threshold and start is None:
+            start = i
+        elif value <= threshold and start is not None:
+            segments.append((start, i))
+            start = None
+    return profile, segments
+
+@pytest.mark.parametrize("window", [1, 2, 7, 21, 500])
+def test_disorder_profile_matches_reference(window):
+    """The cumulative-sum profile and its segments match recounting each window."""
+
+    protein = random_sequence(1000, alphabet="ACDEFGHIKLMNPQRSTVWY", seed=3)
+    result = disorder_profile(protein, window=window, threshold=40)
+    profile, segments = disorder_profile_reference(protein, window, 40)
+    np.testing.assert_allclose(result.profile, profile)
+    assert result.segments == segments
+
+def test_disorder_profile_segments():
+    """A disorder-prone stretch in an ordered protein is found; short segments can be dropped."""
+
+    protein = "MAAAAAAAAA" + "PESQKRGPES" + "AAAAAAAAAW" + "P"
+    result = disorder_profile(protein, window=5, threshold=50)
+    assert result.segments == [(10, 20)]
+    assert len(result.profile) == len(protein)
+    # The lone P at the end is 1 in 3 residues of its shortened window
+    assert disorder_profile(protein, window=5, threshold=30).segments == [(9, 21), (30, 31)]
+    assert disorder_profile(protein, window=5, threshold=30, min_length=2).segments == [(9, 21)]
+    assert disorder_profile("", window=5).segments == []
+    with pytest.raises(ValueError):
+        disorder_profile(protein, window=0)
+
+def test_incremental_translator_matches_full_translation():
+    """After any sequence of random edits the protein equals a fresh translation."""
+
+    rng = np.random.default_rng(4)
+    translator = IncrementalTranslator()
+    sequence = ""
+    for _ in range(3000):
+        position = int(rng.integers(0, len(sequence) + 1))
+        kind = rng.integers(0, 3)
+        if kind == 0:
+            sequence = sequence[:position] + random_sequence(int(rng.integers(1, 8)), "ACGTN", seed=int(rng.integers(1 << 30))) + sequence[position:]
+        elif kind == 1:
+            sequence = sequence[:position] + sequence[position + int(rng.integers(1, 7)):]
+        else:
+            sequence = sequence[:position] + random_sequence(3, seed=int(rng.integers(1 << 30))) + sequence[position + 3:]
+        sequence = sequence[:600]
+        assert translator.update(sequence) == translate_DNA(sequence)
+
+def test_incremental_translator_only_translates_the_edit():
+    """Edits that keep the frame retranslate a few codons; frame shifts retranslate only from the edit on."""
+
+    sequence = random_sequence(30_000, seed=5)
+    translator = IncrementalTranslator()
+    translator.update(sequence)
+    assert translator.last_translated == 30_000
+
+    edited = sequence[:15_000] + "GGG" + sequence[15_000:]    # inserted codon
+    assert translator.update(edited) == translate_DNA(edited)
+    assert translator.last_translated <= 6
+
+    edited = edited[:-1] + "C"                                 # last base typed over
+    assert translator.update(edited) == translate_DNA(edited)
+    assert translator.last_translated == 3
+
+    shifted = edited[:20_000] + "A" + edited[20_000:]          # frame shift
+    assert translator.update(shifted) == translate_DNA(shifted)
+    assert translator.last_translated <= len(shifted) - 19_998
@@ -0,0 +1,66 @@
+import io
+import numpy as np
+import pytest
+from done_in_class_dna_utils import check_DNA_sequence, translate_DNA, predict_disorder, disorder_percentage
+from fasta_pipeline import read_fasta, batched_records, run_pipeline, OUTPUT_COLUMNS
+from dna_test_helpers import write_fasta
+
+def random_records(n_records: int, seed: int = 0) -> list:
+    rng = np.random.default_rng(seed)
+    records = []
+    for i in range(n_records):
+        length = int(rng.integers(0, 400))
+        sequence = "".join(rng.choice(list("ACGTACGTACGTN"), length))
+        records.append((f"seq{i}", sequence))
+    return records
+
+def read_tsv(path) -> list:
+    with open(path) as f:
+        return [line.rstrip("\n").split("\t") for line in f]
+
+def test_read_fasta_joins_lines_and_uppercases():
+    """Multi-line records are joined, ids are the first header word and sequences are uppercased."""
+
+    text = "junk before header\n>a first\nATG\naaa\n\n>b\n>c x y\nTT\n"
+    assert list(read_fasta(io.StringIO(text))) == [("a", "ATGAAA"), ("b", ""), ("c", "TT")]
+
+def test_batched_records_limits_records_and_bases():
+    """A batch closes when it reaches the record limit or the base limit."""
+
+    records = [("a", "A" * 10), ("b", "A" * 10), ("c", "A" * 10), ("d", "A")]
+    assert [len(b) for b in batched_records(records, batch_size=3, batch_bases=1000)] == [3, 1]
+    assert [len(b) for b in batched_records(records, batch_size=100, batch_bases=15)] == [2, 2]
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_pipeline_matches_single_sequence_functions(tmp_path, workers):
+    """Every row agrees with the single-sequence utilities, in input order, with or without a process pool."""
+
+    records = random_records(200)
+    records += [("clean", "ATGAAACCCGGGTTT"), ("frame", "ATGA")]
+    fasta = tmp_path / "in.fasta"
+    write_fasta(fasta, records)
+    output = tmp_path / "out.tsv"
+
+    count = run_pipeline(str(fasta), str(output), workers=workers, batch_size=7, max_pending=2)
+    rows = read_tsv(output)
+
+    assert count == len(records)
+    assert rows[0] == OUTPUT_COLUMNS
+    assert [row[0] for row in rows[1:]] == [record_id for record_id, _ in records]
+    for (record_id, sequence), row in zip(records, rows[1:]):
+        valid = check_DNA_sequence(sequence)
+        assert row[1:3] == [str(len(sequence)), str(valid)]
+        if valid and sequence:
+            protein = translate_DNA(sequence)
+            assert row[3] == protein
+            assert float(row[4]) == pytest.approx(disorder_percentage(protein), abs=0.005)
+        else:
+            assert row[3:] == ["", ""]
+
+def test_disorder_percentage_matches_predict_disorder():
+    """The numeric helper gives the percentage shown by predict_disorder."""
+
+    protein = "MPEESQKRGAAW"
+    assert f"{disorder_percentage(protein):.1f}%" in predict_disorder(protein)
+    assert np.isnan(disorder_percentage(""))
+    assert predict_disorder("") == "N/A"
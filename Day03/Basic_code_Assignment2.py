@@ -1,5 +1,11 @@
 import pandas as pd
 import numpy as np
+from stage_metrics import NULL_METRICS
+
+# The grouped calculation groups on these columns...
+GROUP_KEY_COLUMNS = ("Run ID", "Plate Barcode")
+# ...and reads these from an export (the well is reported, not grouped on)
+GROUP_COLUMNS = [*GROUP_KEY_COLUMNS, "Well"]
 
 def calculate_pool_concentrations_from_qubit_data(conc_file: pd.DataFrame, pool_dict: dict) -> pd.DataFrame:
     samples = conc_file["Sample Name"].astype(str).tolist()
@@ -27,6 +33,137 @@ def calculate_pool_concentrations_from_qubit_data(conc_file: pd.DataFrame, pool_
     return plate
 
 
+def calculate_pool_concentrations_vectorized(conc_file: pd.DataFrame, pool_dict: dict, metrics=NULL_METRICS) -> pd.DataFrame:
+    """Vectorized version of calculate_pool_concentrations_from_qubit_data.
+
+    Every sample is assigned to the smallest pool strictly greater than its
+    concentration (falling back to the largest pool) with one np.searchsorted
+    call, instead of a Python loop per row. Zero and non-numeric
+    concentrations give NaN, exactly like the loop version.
+
+    Unlike the loop version, one output row is kept per input row (duplicate
+    sample names are not merged), and the chosen pool is returned in a
+    separate 'Pool' column.
+
+    `metrics` (see stage_metrics.py) times the coerce/assign/build steps.
+    """
+    pools = np.sort(np.asarray(list(pool_dict.values()), dtype=float))
+    if pools.size == 0:
+        raise ValueError("At least one pool value is required.")
+
+    with metrics.stage("coerce", rows=len(conc_file)):
+        samples = conc_file["Sample Name"].astype(str).to_numpy()
+        concentrations = pd.to_numeric(conc_file["Original Sample Conc."], errors='coerce').to_numpy(dtype=float)
+
+    with metrics.stage("assign", rows=len(concentrations)):
+        # side='right' gives the index of the first pool strictly greater than conc
+        pool_index = np.searchsorted(pools, concentrations, side='right')
+        np.minimum(pool_index, pools.size - 1, out=pool_index)
+        chosen_pool = pools[pool_index]
+
+        excluded = np.isnan(concentrations) | (concentrations == 0)
+        chosen_pool[excluded] = np.nan
+        with np.errstate(divide='ignore', invalid='ignore'):
+            amount = chosen_pool / concentrations
+
+    with metrics.stage("build", rows=len(amount)):
+        plate = pd.DataFrame({'Sample': samples, 'Amount_to_Take': amount, 'Pool': chosen_pool})
+    return plate
+
+
+def _group_key(key, n_columns: int):
+    """A pool_sets key as text, the way calculate_grouped_pool_concentrations compares group values."""
+    values = key if n_columns > 1 else (key,)
+    if not isinstance(values, tuple) or len(values) != n_columns:
+        raise ValueError(f"Group key {key!r} does not match the {n_columns} group columns.")
+    values = tuple("" if value is None or (isinstance(value, float) and np.isnan(value)) else str(value)
+                   for value in values)
+    return values if n_columns > 1 else values[0]
+
+
+def calculate_grouped_pool_concentrations(conc_file: pd.DataFrame, pool_sets: dict,
+                                          group_columns=GROUP_KEY_COLUMNS, metrics=NULL_METRICS) -> pd.DataFrame:
+    """Calculate all runs/plates of a merged export in one vectorized pass.
+
+    `pool_sets` is either one pool dict shared by every group, e.g.
+    {'pool_1': 5, 'pool_2': 30}, or a dict of pool dicts keyed by group:
+    {(run_id, plate): {...}, ...} (or {run_id: {...}} with one group column),
+    but not a mix of both. Group values are compared as text, on both the
+    data and the keys, so {(1, 'a'): ...} matches Run ID "1"; empty values
+    (NaN or None) are matched as "".
+
+    Every input row is kept, in input order, so the same sample name on
+    different plates does not overwrite anything. The result has the group
+    columns, 'Well' (if the input has it), 'Sample', 'Amount_to_Take' and 'Pool'.
+    `metrics` (see stage_metrics.py) times the coerce/assign/build steps.
+    """
+    group_columns = list(group_columns)
+    missing = [column for column in group_columns if column not in conc_file.columns]
+    if missing:
+        raise ValueError(f"Missing group column(s): {', '.join(missing)}")
+
+    per_group = [isinstance(value, dict) for value in pool_sets.values()]
+    if any(per_group) and not all(per_group):
+        raise ValueError("Give either one shared pool dict or one pool dict per group, not a mix of both.")
+    shared = not any(per_group)
+    if shared and not pool_sets:
+        raise ValueError("At least one pool value is required.")
+
+    if len(conc_file):
+        group_values = conc_file[group_columns].fillna("").astype(str)
+        group_codes, group_keys = pd.MultiIndex.from_frame(group_values).factorize()
+        group_keys = [key if len(group_columns) > 1 else key[0] for key in group_keys]
+    else:
+        # A file with a header but no rows (MultiIndex.from_frame cannot factorize nothing)
+        group_codes, group_keys = np.empty(0, dtype=int), []
+
+    if shared:
+        group_pool_dicts = [pool_sets] * len(group_keys)
+    else:
+        group_pool_sets = {}
+        for key, pool_dict in pool_sets.items():
+            text_key = _group_key(key, len(group_columns))
+            if text_key in group_pool_sets:
+                raise ValueError(f"Pool values given twice for group {text_key}.")
+            group_pool_sets[text_key] = pool_dict
+        unknown = [key for key in group_keys if key not in group_pool_sets]
+        if unknown:
+            raise ValueError(f"No pool values given for group(s): {unknown}")
+        group_pool_dicts = [group_pool_sets[key] for key in group_keys]
+
+    # One row of sorted pools per group, padded with +inf (never chosen)
+    n_pools = np.array([len(pool_dict) for pool_dict in group_pool_dicts], dtype=int)
+    if len(n_pools) and n_pools.min() == 0:
+        raise ValueError("At least one pool value is required for every group.")
+    pool_matrix = np.full((len(group_keys), max(n_pools, default=1)), np.inf)
+    for g, pool_dict in enumerate(group_pool_dicts):
+        pool_matrix[g, :n_pools[g]] = np.sort(np.asarray(list(pool_dict.values()), dtype=float))
+
+    with metrics.stage("coerce", rows=len(conc_file)):
+        concentrations = pd.to_numeric(conc_file["Original Sample Conc."], errors='coerce').to_numpy(dtype=float)
+
+    with metrics.stage("assign", rows=len(concentrations)):
+        # Number of pools <= conc is the index of the first pool strictly greater than conc
+        row_pools = pool_matrix[group_codes]
+        pool_index = (row_pools <= concentrations[:, None]).sum(axis=1)
+        np.minimum(pool_index, n_pools[group_codes] - 1, out=pool_index)
+        chosen_pool = row_pools[np.arange(len(pool_index)), pool_index]
+
+        excluded = np.isnan(concentrations) | (concentrations == 0)
+        chosen_pool[excluded] = np.nan
+        with np.errstate(divide='ignore', invalid='ignore'):
+            amount = chosen_pool / concentrations
+
+    with metrics.stage("build", rows=len(amount)):
+        plate = conc_file[group_columns].reset_index(drop=True)
+        if "Well" in conc_file.columns:
+            plate["Well"] = conc_file["Well"].to_numpy()
+        plate["Sample"] = conc_file["Sample Name"].astype(str).to_numpy()
+        plate["Amount_to_Take"] = amount
+        plate["Pool"] = chosen_pool
+    return plate
+
+
 
 
 # qubit_file = pd.read_csv(r'Qubit_data_example.csv')
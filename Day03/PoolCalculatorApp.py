@@ -1,14 +1,138 @@
-import pandas as pd
-import tkinter as tk
-from tkinter import filedialog, messagebox
 import argparse
 import sys
 import os
-import pytest
-from Basic_code_Assignment2 import calculate_pool_concentrations_from_qubit_data
+from stage_metrics import NULL_METRICS
+
+# pandas, tkinter and pytest are imported inside the modes that use them, so
+# that a CLI run does not pay for the GUI or the test framework (and --help
+# does not even load pandas). test_startup.py checks that this stays so.
+
+# ---------------- Shared calculation ----------------
+# Set to False by --no-cache
+USE_CACHE = True
+
+# Rows per chunk when reading with progress reporting (GUI)
+PROGRESS_CHUNKSIZE = 100_000
+
+# Replaced by a StageMetrics object with --metrics-json / --profile
+METRICS = NULL_METRICS
+
+class CalculationCancelled(Exception):
+    """Raised by load_and_calculate when its cancel_event is set."""
+
+def calculate_result(df, pool_dict, grouped=False):
+    """Run the vectorized calculation, or the per-run/plate version when `grouped` is set."""
+    if grouped:
+        from Basic_code_Assignment2 import calculate_grouped_pool_concentrations
+        return calculate_grouped_pool_concentrations(df, pool_dict, metrics=METRICS)
+
+    from Basic_code_Assignment2 import calculate_pool_concentrations_vectorized
+    return calculate_pool_concentrations_vectorized(df, pool_dict, metrics=METRICS)
+
+def timed_chunks(chunks):
+    """Yield the chunks of a chunked reader, timing each read as the "read" stage."""
+    iterator = iter(chunks)
+    while True:
+        with METRICS.stage("read") as stage:
+            chunk = next(iterator, None)
+            stage.rows = len(chunk) if chunk is not None else 0
+        if chunk is None:
+            return
+        yield chunk
+
+def timed_write(writer, result):
+    with METRICS.stage("write", rows=len(result)):
+        writer.write(result)
+
+def empty_result(pool_dict, grouped=False):
+    """The (empty) result of a file that has a header but no rows."""
+    import pandas as pd
+    from Basic_code_Assignment2 import GROUP_COLUMNS
+    from qubit_reader import REQUIRED_COLUMNS
+
+    columns = REQUIRED_COLUMNS + (GROUP_COLUMNS if grouped else [])
+    return calculate_result(pd.DataFrame({column: [] for column in columns}), pool_dict, grouped)
+
+def load_and_calculate(file_path, pool_dict, grouped=False, progress=None, cancel_event=None):
+    """Read a Qubit file and calculate it, reusing the on-disk result cache unless it is turned off.
+
+    If `progress` or `cancel_event` is given, the file is read in chunks:
+    progress(fraction) is called after each chunk, and CalculationCancelled
+    is raised as soon as cancel_event (a threading.Event) is set.
+    """
+    from Basic_code_Assignment2 import GROUP_COLUMNS
+    from qubit_reader import read_qubit_csv
+    extra_columns = GROUP_COLUMNS if grouped else []
+
+    def calculate():
+        with METRICS.stage("read") as stage:
+            df = read_qubit_csv(file_path, extra_columns=extra_columns)
+            stage.rows = len(df)
+        return calculate_result(df, pool_dict, grouped)
+
+    def calculate_in_chunks():
+        import pandas as pd
+
+        total_bytes = os.path.getsize(file_path) or 1
+        results = []
+        with open(file_path, "rb") as f:
+            for chunk in timed_chunks(read_qubit_csv(f, extra_columns=extra_columns, chunksize=PROGRESS_CHUNKSIZE)):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise CalculationCancelled()
+                results.append(calculate_result(chunk, pool_dict, grouped))
+                if progress:
+                    progress(min(f.tell() / total_bytes, 1.0))
+        if not results:
+            return empty_result(pool_dict, grouped)
+        return pd.concat(results, ignore_index=True)
+
+    if progress is not None or cancel_event is not None:
+        calculate = calculate_in_chunks
+
+    if not USE_CACHE:
+        return calculate()
+
+    from result_cache import ResultCache
+    result = ResultCache().cached(file_path, pool_dict, calculate, variant="grouped" if grouped else "")
+    if progress:
+        progress(1.0)
+    return result
+
+def cache_command(args):
+    """Handles --clear-cache and --cache-stats."""
+    from result_cache import ResultCache
+
+    cache = ResultCache()
+    if args.clear_cache:
+        cache.clear()
+        print(f"Cache cleared ({cache.cache_dir}).")
+    if args.cache_stats:
+        for name, value in cache.stats().items():
+            print(f"{name}: {value}")
+
+def archive_filters(args) -> dict:
+    """The --runs/--samples/--since/--until filters that were given (empty if none)."""
+    filters = {"run_ids": args.runs, "samples": args.samples, "date_from": args.since, "date_to": args.until}
+    return {name: value for name, value in filters.items() if value}
+
+def load_archive_and_calculate(args, pool_dict, grouped=False):
+    """Query the archive with the filters in `args` and calculate the matching samples."""
+    from qubit_archive import QubitArchive
+
+    with QubitArchive(args.archive) as archive:
+        with METRICS.stage("query"):
+            df = archive.query(**archive_filters(args))
+    if df.empty:
+        raise ValueError("No archived samples match the given --runs/--samples/--since/--until.")
+    return calculate_result(df, pool_dict, grouped)
 
 # ---------------- GUI ----------------
 def start_gui():
+    import queue
+    import threading
+    import tkinter as tk
+    from tkinter import filedialog, messagebox, ttk
+
     root = tk.Tk()
     root.withdraw() 
 
@@ -32,19 +156,86 @@ def start_gui():
             return
 
         pool_dict = {f"pool_{i+1}": val for i, val in enumerate(pool_values)}
-        
+
+        # The file is read and calculated on a worker thread so the window
+        # stays responsive. The worker only puts messages on a queue; all
+        # Tk calls happen here on the main thread (see poll_worker).
+        cancel_event = threading.Event()
+        messages = queue.Queue()
+        job["cancel_event"] = cancel_event
+
+        def worker():
+            try:
+                result = load_and_calculate(file_path, pool_dict, cancel_event=cancel_event,
+                                            progress=lambda fraction: messages.put(("progress", fraction)))
+                messages.put(("done", result))
+            except CalculationCancelled:
+                messages.put(("cancelled", None))
+            except Exception as e:
+                messages.put(("error", e))
+
+        run_button.config(state="disabled")
+        cancel_button.config(state="normal")
+        progress_bar["value"] = 0
+        status_var.set("Calculating...")
+        threading.Thread(target=worker, daemon=True).start()
+        root.after(100, poll_worker, messages)
+
+    def poll_worker(messages):
+        while True:
+            try:
+                kind, value = messages.get_nowait()
+            except queue.Empty:
+                root.after(100, poll_worker, messages)
+                return
+
+            if kind == "progress":
+                progress_bar["value"] = value * 100
+                status_var.set(f"Calculating... {value:.0%}")
+                continue
+
+            run_button.config(state="normal")
+            cancel_button.config(state="disabled")
+            job["cancel_event"] = None
+            if kind == "done":
+                progress_bar["value"] = 100
+                status_var.set(f"Done: {len(value)} samples.")
+                show_result(value)
+            elif kind == "cancelled":
+                progress_bar["value"] = 0
+                status_var.set("Cancelled.")
+            else:
+                status_var.set("Failed.")
+                messagebox.showerror("Error", f"Calculation failed: {str(value)}")
+            return
+
+    def cancel_calculation():
+        if job["cancel_event"] is not None:
+            job["cancel_event"].set()
+            status_var.set("Cancelling...")
+
+    def show_result(result):
+        from result_table import ResultTable
+
+        # Use a new Toplevel window for results
+        result_window = tk.Toplevel() 
+        result_window.title("Calculation Result")
+        ResultTable(result_window, result).pack(expand=True, fill="both")
+        tk.Button(result_window, text="Save...", command=lambda: save_result(result, result_window)).pack(pady=5)
+
+    def save_result(result, parent):
+        from result_writers import write_result
+
+        path = filedialog.asksaveasfilename(parent=parent, defaultextension=".csv",
+                                            filetypes=[("CSV files", "*.csv"), ("Tab-separated", "*.tsv"),
+                                                       ("JSON Lines", "*.jsonl"), ("Parquet", "*.parquet"),
+                                                       ("Feather", "*.feather")])
+        if not path:
+            return
         try:
-            df = pd.read_csv(file_path)
-            result = calculate_pool_concentrations_from_qubit_data(df, pool_dict)
-            
-            # Use a new Toplevel window for results
-            result_window = tk.Toplevel() 
-            result_window.title("Calculation Result")
-            text = tk.Text(result_window, wrap="none")
-            text.insert("1.0", result.to_string(index=False))
-            text.pack(expand=True, fill="both")
+            write_result(result, path)
         except Exception as e:
-            messagebox.showerror("Error", f"Calculation failed: {str(e)}")
+            messagebox.showerror("Error", f"Could not save the result: {str(e)}", parent=parent)
 
     def browse_file():
         # Open file dialog relative to the hidden root
@@ -69,13 +260,24 @@ def start_gui():
     pool_values_var = tk.StringVar(value="5, 30, 100")
     tk.Entry(input_window, textvariable=pool_values_var, width=40).grid(row=1, column=1, padx=5, pady=5)
 
-    # Run button
-    tk.Button(input_window, text="Run Calculation", command=run_calculation).grid(row=2, column=0, columnspan=3, pady=10)
+    # Run / Cancel buttons
+    job = {"cancel_event": None}
+    run_button = tk.Button(input_window, text="Run Calculation", command=run_calculation)
+    run_button.grid(row=2, column=0, columnspan=2, pady=10)
+    cancel_button = tk.Button(input_window, text="Cancel", command=cancel_calculation, state="disabled")
+    cancel_button.grid(row=2, column=2, pady=10)
+
+    # Progress
+    progress_bar = ttk.Progressbar(input_window, maximum=100, length=300)
+    progress_bar.grid(row=3, column=0, columnspan=3, padx=5, pady=(0, 5))
+    status_var = tk.StringVar(value="")
+    tk.Label(input_window, textvariable=status_var).grid(row=4, column=0, columnspan=3, pady=(0, 10))
 
     root.mainloop() # Start the Tkinter event loop
 
 # ---------------- Interactive ----------------
-def interactive_mode():
+def interactive_mode(output_path=None, fmt=None):
+    """Asks for the file and pools; the result is printed, or saved when --output was given."""
 
     try:
         file_path = input("Enter the path to your CSV file: ").strip()
@@ -89,10 +291,14 @@ def interactive_mode():
         pool_values = [float(v.strip()) for v in pool_values_str.split(",")]
         pool_dict = {f"pool_{i+1}": val for i, val in enumerate(pool_values)}
 
-        df = pd.read_csv(file_path)
-        result = calculate_pool_concentrations_from_qubit_data(df, pool_dict)
-        print("\n--- Calculation Result ---\n")
-        print(result.to_string(index=False))
+        result = load_and_calculate(file_path, pool_dict)
+        if output_path:
+            from result_writers import write_result
+            write_result(result, output_path, fmt)
+            print(f"\nResult saved to '{output_path}'.")
+        else:
+            print("\n--- Calculation Result ---\n")
+            print(result.to_string(index=False))
 
     except FileNotFoundError:
         print(f"\nError: File not found at '{file_path}'.")
@@ -102,35 +308,187 @@ def interactive_mode():
         print(f"\nAn unexpected error occurred: {e}")
 
 # ---------------- CLI ----------------
+def stream_cli_result(file_path, pool_dict, chunksize, writer, grouped=False):
+    """Read the CSV in chunks of `chunksize` rows and write each chunk's result as soon as it is ready.
+
+    Every row is formatted on its own (no column alignment across rows), so
+    writing a result in several chunks gives exactly the same bytes as
+    writing it in one go.
+    """
+    from Basic_code_Assignment2 import GROUP_COLUMNS
+    from qubit_reader import read_qubit_csv
+
+    extra_columns = GROUP_COLUMNS if grouped else []
+    for chunk in timed_chunks(read_qubit_csv(file_path, extra_columns=extra_columns, chunksize=chunksize)):
+        timed_write(writer, calculate_result(chunk, pool_dict, grouped))
+
+    if writer.rows_written == 0:
+        # Empty file: still write the header, like the non-streaming mode does
+        timed_write(writer, empty_result(pool_dict, grouped))
+
 def cli_mode(args):
     try:
-        if not args.file or not args.pools:
+        if not (args.file or archive_filters(args)) or not args.pools:
 
             print("\n--- CLI Mode Usage ---")
             print("CLI mode requires arguments to be provided when the script starts.")
             print("Please run the script again using the following format:")
             print(f"python {os.path.basename(sys.argv[0])} --file **INSERT YOUR FILE PATH** --pools **INSERT POOL SIZES WITH A SPACE**")
             print("Example: python PoolCalculatorApp.py --file data.csv --pools 5 30 100")
+            print("Or calculate archived runs: python PoolCalculatorApp.py --runs RUN_ID [RUN_ID ...] --pools 5 30 100")
             print("\nExiting...")
             sys.exit(1)
 
         # Execution for valid CLI arguments
         pool_dict = {f"pool_{i+1}": val for i, val in enumerate(args.pools)}
-        df = pd.read_csv(args.file)
-        result = calculate_pool_concentrations_from_qubit_data(df, pool_dict)
-        print(result.to_string(index=False))
+
+        from result_writers import ResultWriter
+
+        with ResultWriter(args.output or "-", args.format) as writer:
+            if not args.file:
+                timed_write(writer, load_archive_and_calculate(args, pool_dict, grouped=args.grouped))
+            elif args.chunksize:
+                stream_cli_result(args.file, pool_dict, args.chunksize, writer, grouped=args.grouped)
+            else:
+                timed_write(writer, load_and_calculate(args.file, pool_dict, grouped=args.grouped))
         
+    except BrokenPipeError:
+        # The reader of our output (e.g. `head`) has exited: stop quietly
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
     except FileNotFoundError:
-        print(f"\nError: File not found at '{args.file}'.")
+        print(f"\nError: File not found at '{args.file}'.", file=sys.stderr)
         sys.exit(1)
     except Exception as e:
-        print(f"\nAn unexpected error occurred in CLI mode: {e}")
+        print(f"\nAn unexpected error occurred in CLI mode: {e}", file=sys.stderr)
+        sys.exit(1)
+
+# ---------------- Batch ----------------
+def batch_mode(args):
+    """Runs the calculation on every CSV in a directory (or glob) using several processes."""
+    if not args.input or not args.pools:
+        print("\n--- Batch Mode Usage ---")
+        print(f"python {os.path.basename(sys.argv[0])} --mode batch --input **FOLDER OR GLOB** --pools **POOL SIZES** [--workers N] [--out-dir FOLDER]")
+        print("Example: python PoolCalculatorApp.py --mode batch --input runs/ --pools 5 30 100 --workers 4")
+        sys.exit(1)
+
+    from batch_processing import run_batch
+
+    pool_dict = {f"pool_{i+1}": val for i, val in enumerate(args.pools)}
+    output_dir = args.out_dir
+    if not output_dir:
+        base_dir = args.input if os.path.isdir(args.input) else os.path.dirname(args.input) or "."
+        output_dir = os.path.join(base_dir, "pool_results")
+
+    try:
+        summary = run_batch(args.input, pool_dict, output_dir, workers=args.workers)
+    except FileNotFoundError as e:
+        print(f"\nError: {e}")
+        sys.exit(1)
+
+    print(summary[["File", "Run ID", "Samples", "Excluded", "Status", "Error"]].to_string(index=False))
+    failed = int((summary["Status"] != "ok").sum())
+    print(f"\n{len(summary) - failed} file(s) done, {failed} failed. Results written to '{output_dir}'.")
+    if failed:
+        sys.exit(1)
+
+# ---------------- Archive ----------------
+def import_mode(args):
+    """Imports Qubit exports (a file, folder or glob) into the local archive."""
+    if not args.input:
+        print("\n--- Import Mode Usage ---")
+        print(f"python {os.path.basename(sys.argv[0])} --mode import --input **FILE, FOLDER OR GLOB** [--archive DB FILE]")
+        print("Then calculate archived runs with: --runs RUN_ID [RUN_ID ...] --pools 5 30 100")
+        sys.exit(1)
+
+    from qubit_archive import QubitArchive
+
+    with QubitArchive(args.archive) as archive:
+        try:
+            summary = archive.import_files(args.input)
+        except FileNotFoundError as e:
+            print(f"\nError: {e}")
+            sys.exit(1)
+        print(summary.to_string(index=False))
+        counts = summary["Status"].value_counts()
+        print(f"\n{counts.get('imported', 0)} file(s) imported, {counts.get('skipped', 0)} already archived, "
+              f"{counts.get('failed', 0)} failed. Archive: '{archive.path}'.")
+        print("\nArchived runs:")
+        print(archive.runs().to_string(index=False))
+    if counts.get("failed", 0):
+        sys.exit(1)
+
+# ---------------- Watch folder ----------------
+def watch_mode(args):
+    """Watches a folder and calculates every new Qubit export dropped into it."""
+    if not args.input or not args.pools or not os.path.isdir(args.input):
+        print("\n--- Watch Mode Usage ---")
+        print(f"python {os.path.basename(sys.argv[0])} --mode watch --input **FOLDER** --pools **POOL SIZES** [--interval SECONDS]")
+        sys.exit(1)
+
+    from watch_folder import FolderWatcher
+
+    pool_dict = {f"pool_{i+1}": val for i, val in enumerate(args.pools)}
+    watcher = FolderWatcher(args.input, pool_dict)
+    print(f"Watching '{args.input}' every {args.interval} s. Press Ctrl+C to stop.", flush=True)
+    try:
+        watcher.run(interval=args.interval)
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+
+# ---------------- Service ----------------
+def serve_mode(args):
+    """Runs the calculator as a local HTTP service (see pool_service.py for the endpoints)."""
+    from pool_service import serve
+
+    serve(host=args.host, port=args.port, socket_path=args.socket, workers=args.workers or 4, data_dir=args.data_dir)
+
+# ---------------- Pool sweep ----------------
+def sweep_mode(args):
+    """Scores many candidate pool sets on one plate and prints the best ones."""
+    if not args.file or not (args.pool_sets or args.grid):
+        print("\n--- Sweep Mode Usage ---")
+        print(f"python {os.path.basename(sys.argv[0])} --mode sweep --file **CSV FILE** (--pool-sets **FILE** | --grid **VALUES**) [--grid-size N] [--top N] [--max-amount X] [--min-amount X]")
+        print("Example: python PoolCalculatorApp.py --mode sweep --file data.csv --grid 2 5 10 20 30 50 100 200 --grid-size 3 --max-amount 20")
+        sys.exit(1)
+
+    import time
+    from pool_sweep import pool_grid, read_pool_sets, score_pool_sets, rank_pool_sets
+    from qubit_reader import read_qubit_csv
+    from result_writers import ResultWriter
+
+    try:
+        pool_sets = read_pool_sets(args.pool_sets) if args.pool_sets else []
+        if args.grid:
+            pool_sets += list(pool_grid(args.grid, args.grid_size))
+        with METRICS.stage("read"):
+            df = read_qubit_csv(args.file)
+
+        start = time.perf_counter()
+        scores = score_pool_sets(df, pool_sets, metrics=METRICS)
+        ranked = rank_pool_sets(scores, sort_by=args.sort_by, max_amount=args.max_amount,
+                                min_amount=args.min_amount, top=args.top)
+        print(f"Scored {len(scores)} pool sets in {time.perf_counter() - start:.2f} s; "
+              f"{len(ranked)} shown.", file=sys.stderr)
+
+        with ResultWriter(args.output or "-", args.format) as writer:
+            timed_write(writer, ranked)
+    except BrokenPipeError:
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+    except FileNotFoundError as e:
+        print(f"\nError: File not found: '{e.filename}'.", file=sys.stderr)
+        sys.exit(1)
+    except ValueError as e:
+        print(f"\nError: {e}", file=sys.stderr)
         sys.exit(1)
 
 # ---------------- Pytest Test Mode ----------------
 def test_mode():
 
     """Runs all unit tests defined in test_calculations.py using pytest."""
+    import pytest
+
     print("\n--- Running Pytest Unit Tests ---\n")
     
     # Get the directory of the currently running script
@@ -167,33 +525,117 @@ def choose_mode():
             print("Invalid choice. Please try again.")
 
 # ---------------- Main ----------------
+def positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Pool Concentration Calculator")
-    parser.add_argument("--mode", choices=["interactive", "cli", "gui", "test"], help="Choose input mode")
+    parser.add_argument("--mode", choices=["interactive", "cli", "gui", "test", "batch", "serve", "watch", "sweep", "import"], help="Choose input mode")
     parser.add_argument("--file", help="Path to CSV file (CLI mode only)")
     parser.add_argument("--pools", nargs="+", type=float, help="Pool concentration values (CLI mode only)")
+    parser.add_argument("--chunksize", type=int, help="Stream the CSV in chunks of this many rows (CLI mode only)")
+    parser.add_argument("--output", help="Write the result to this file instead of the screen ('-' for standard output)")
+    parser.add_argument("--format", choices=["tsv", "csv", "jsonl", "parquet", "feather"],
+                        help="Output format (default: from the --output file extension, otherwise tsv)")
+    parser.add_argument("--grouped", action="store_true", help="Keep every row and report Run ID, Plate Barcode and Well (CLI mode only)")
+    parser.add_argument("--input", help="Folder or glob pattern of CSV files (batch mode), or the folder to watch (watch mode)")
+    parser.add_argument("--interval", type=float, default=1.0, help="Seconds between folder checks (watch mode only, default: 1)")
+    parser.add_argument("--workers", type=positive_int, help="Number of workers (batch mode: processes, default: number of CPUs; serve mode: threads, default: 4)")
+    parser.add_argument("--out-dir", help="Folder for the batch results (batch mode only, default: <input folder>/pool_results)")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on (serve mode only, default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on (serve mode only, default: 8765)")
+    parser.add_argument("--socket", help="Listen on this Unix socket instead of a TCP port (serve mode only)")
+    parser.add_argument("--data-dir", help="Folder that 'path' requests may read from (serve mode only; "
+                                           "without it, 'path' is only accepted on localhost or a Unix socket)")
+    parser.add_argument("--pool-sets", help="File with one candidate pool set per line, e.g. '5,30,100' (sweep mode only)")
+    parser.add_argument("--grid", nargs="+", type=float, help="Pool values to combine into candidate sets (sweep mode only)")
+    parser.add_argument("--grid-size", type=int, default=3, help="Number of pools per candidate set from --grid (sweep mode only, default: 3)")
+    parser.add_argument("--top", type=int, default=20, help="Number of best pool sets to show (sweep mode only, default: 20)")
+    parser.add_argument("--sort-by", default="Total_Amount", help="Column to rank the pool sets by, smallest first (sweep mode only, default: Total_Amount)")
+    parser.add_argument("--max-amount", type=float, help="Skip pool sets needing more than this amount of any sample (sweep mode only)")
+    parser.add_argument("--min-amount", type=float, help="Skip pool sets needing less than this amount of any sample (sweep mode only)")
+    parser.add_argument("--archive", help="SQLite archive of imported runs (default: $POOL_CALC_ARCHIVE or ~/.local/share/pool_calculator/qubit_archive.sqlite)")
+    parser.add_argument("--runs", nargs="+", help="Calculate these archived runs instead of a --file")
+    parser.add_argument("--samples", nargs="+", help="Only these archived sample names (with or instead of --runs)")
+    parser.add_argument("--since", help="Only archived measurements on or after this date (YYYY-MM-DD)")
+    parser.add_argument("--until", help="Only archived measurements on or before this date (YYYY-MM-DD)")
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write the result cache")
+    parser.add_argument("--clear-cache", action="store_true", help="Remove all cached results")
+    parser.add_argument("--cache-stats", action="store_true", help="Show cache hits, misses and size")
+    parser.add_argument("--metrics-json", help="Record time, CPU, rows and peak memory per stage and save them to this JSON file")
+    parser.add_argument("--profile", help="Run under cProfile and save the stats to this file (also prints the stage table)")
+    parser.add_argument("--metrics-no-memory", action="store_true",
+                        help="Do not track peak memory in the stage metrics (tracemalloc slows down Python-heavy stages)")
     args = parser.parse_args()
 
+    if args.metrics_json or args.profile:
+        from stage_metrics import StageMetrics
+        METRICS = StageMetrics(track_memory=not args.metrics_no_memory)
+
+    if args.no_cache:
+        USE_CACHE = False
+
+    if args.clear_cache or args.cache_stats:
+        cache_command(args)
+        if not (args.mode or args.file):
+            sys.exit(0)
 
     mode = args.mode 
 
-    if args.file and args.pools:
+    if (args.file or archive_filters(args)) and args.pools:
         mode = "cli"
 
     if not mode:
 
-        if args.file or args.pools:
+        if args.file or args.pools or archive_filters(args):
              print("Error: In CLI mode, both --file and --pools arguments must be provided.")
              sys.exit(1)
              
 
         mode = choose_mode()
 
-    if mode == "interactive":
-        interactive_mode()
-    elif mode == "cli":
-        cli_mode(args) 
-    elif mode == "gui":
-        start_gui()
-    elif mode == "test":
-        test_mode()
\ No newline at end of file
+    def run_mode():
+        if mode == "interactive":
+            interactive_mode(args.output, args.format)
+        elif mode == "cli":
+            cli_mode(args) 
+        elif mode == "gui":
+            start_gui()
+        elif mode == "test":
+            test_mode()
+        elif mode == "batch":
+            batch_mode(args)
+        elif mode == "serve":
+            serve_mode(args)
+        elif mode == "watch":
+            watch_mode(args)
+        elif mode == "sweep":
+            sweep_mode(args)
+        elif mode == "import":
+            import_mode(args)
+
+    if not METRICS.enabled:
+        run_mode()
+    else:
+        import cProfile
+
+        profiler = cProfile.Profile() if args.profile else None
+        try:
+            if profiler:
+                profiler.runcall(run_mode)
+            else:
+                run_mode()
+        finally:
+            # Also runs when a mode ends with sys.exit()
+            print("\n--- Stage metrics ---\n" + METRICS.format_table(), file=sys.stderr)
+            if args.metrics_json:
+                METRICS.write_json(args.metrics_json)
+                print(f"Stage metrics saved to '{args.metrics_json}'.", file=sys.stderr)
+            if profiler:
+                profiler.dump_stats(args.profile)
+                print(f"Profile saved to '{args.profile}' (view it with: python -m pstats {args.profile}).", file=sys.stderr)
+            METRICS.stop()
\ No newline at end of file
@@ -0,0 +1,105 @@
+import glob
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pandas as pd
+from Basic_code_Assignment2 import calculate_pool_concentrations_vectorized
+from qubit_reader import read_qubit_csv
+
+RESULT_SUFFIX = "_pools.csv"
+SUMMARY_FILE_NAME = "batch_summary.csv"
+SUMMARY_COLUMNS = ["File", "Run ID", "Samples", "Excluded", "Total_Amount", "Output", "Status", "Error"]
+
+def find_input_files(source: str) -> list:
+    """Return the sorted list of CSV files for a directory or a glob pattern (e.g. 'runs/*.csv')."""
+    if os.path.isdir(source):
+        pattern = os.path.join(source, "*.csv")
+    else:
+        pattern = source
+    files = [path for path in glob.glob(pattern) if os.path.isfile(path)]
+    # Skip our own outputs in case the results are written next to the inputs
+    files = [path for path in files
+             if not path.endswith(RESULT_SUFFIX) and os.path.basename(path) != SUMMARY_FILE_NAME]
+    return sorted(files)
+
+def result_file_names(files: list) -> dict:
+    """Result file name for each input file: <name>_pools.csv.
+
+    Inputs that share a file name (e.g. from 'runs/*/export.csv') are named
+    after their path below the common folder instead (a/export.csv ->
+    a_export_pools.csv), so no result overwrites another. Raises ValueError
+    if two names still collide.
+    """
+    stems = {path: os.path.splitext(os.path.basename(path))[0] for path in files}
+    repeated = {stem for stem, count in Counter(stems.values()).items() if count > 1}
+    if repeated:
+        root = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in files])
+        for path, stem in stems.items():
+            if stem in repeated:
+                relative = os.path.splitext(os.path.relpath(os.path.abspath(path), root))[0]
+                stems[path] = relative.replace(os.sep, "_")
+
+    names = {path: stem + RESULT_SUFFIX for path, stem in stems.items()}
+    clashes = sorted(name for name, count in Counter(names.values()).items() if count > 1)
+    if clashes:
+        raise ValueError(f"Several input files would write the same result file: {', '.join(clashes)}")
+    return names
+
+def process_file(file_path: str, pool_dict: dict, output_dir: str, output_name: str = None) -> dict:
+    """Calculate one file and write its result. Errors are returned in the summary row instead of raised.
+
+    The result is written to `output_dir`/`output_name` (default: <name>_pools.csv).
+    """
+    summary = {"File": file_path, "Run ID": "", "Samples": 0, "Excluded": 0,
+               "Total_Amount": float("nan"), "Output": "", "Status": "ok", "Error": ""}
+    try:
+        df = read_qubit_csv(file_path, extra_columns=["Run ID"])
+        result = calculate_pool_concentrations_vectorized(df, pool_dict)
+
+        if "Run ID" in df.columns:
+            summary["Run ID"] = ";".join(df["Run ID"].dropna().astype(str).unique())
+
+        output_name = output_name or os.path.splitext(os.path.basename(file_path))[0] + RESULT_SUFFIX
+        output_path = os.path.join(output_dir, output_name)
+        result.to_csv(output_path, index=False)
+
+        summary["Samples"] = len(result)
+        summary["Excluded"] = int(result["Amount_to_Take"].isna().sum())
+        summary["Total_Amount"] = float(result["Amount_to_Take"].sum())
+        summary["Output"] = output_path
+    except Exception as e:
+        summary["Status"] = "failed"
+        summary["Error"] = f"{type(e).__name__}: {e}"
+    return summary
+
+def run_batch(source: str, pool_dict: dict, output_dir: str, workers: int = None) -> pd.DataFrame:
+    """Calculate every file matched by `source` with the same pools, using a pool of `workers` processes.
+
+    Writes one result file per input file (see result_file_names) plus a
+    combined summary (batch_summary.csv) into `output_dir`, and returns the summary.
+    A failing file is reported in the summary and does not stop the batch.
+    """
+    if workers is not None and workers < 1:
+        raise ValueError("The number of workers must be at least 1.")
+    files = find_input_files(source)
+    if not files:
+        raise FileNotFoundError(f"No CSV files found for '{source}'.")
+    names = result_file_names(files)
+    os.makedirs(output_dir, exist_ok=True)
+
+    if workers == 1:
+        summaries = [process_file(path, pool_dict, output_dir, names[path]) for path in files]
+    else:
+        summaries = []
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(process_file, path, pool_dict, output_dir, names[path]): path for path in files}
+            for future in as_completed(futures):
+                try:
+                    summaries.append(future.result())
+                except Exception as e:
+                    # e.g. a worker process that crashed
+                    summaries.append({"File": futures[future], "Status": "failed", "Error": f"{type(e).__name__}: {e}"})
+
+    summary = pd.DataFrame(summaries, columns=SUMMARY_COLUMNS).sort_values("File", ignore_index=True)
+    summary.to_csv(os.path.join(output_dir, SUMMARY_FILE_NAME), index=False)
+    return summary
@@ -0,0 +1,203 @@
+"""Benchmarks for the pool calculator and the DNA utilities (Day02).
+
+Examples:
+    python benchmark.py --quick --output bench.json
+    python benchmark.py --output new.json --baseline bench.json
+
+Each case reports the best time over --repeat runs, the throughput
+(rows or bases per second) and the peak memory measured with tracemalloc
+in a separate run. With --baseline, cases that got slower than the
+baseline by more than --tolerance are listed and the exit code is 1.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from Basic_code_Assignment2 import calculate_pool_concentrations_from_qubit_data, calculate_pool_concentrations_vectorized
+
+DNA_UTILS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Day02")
+
+ROW_SIZES = [10**3, 10**4, 10**5, 10**6, 10**7]
+POOL_COUNTS = [3, 10, 50]
+BASE_SIZES = [10**3, 10**4, 10**5, 10**6, 10**7, 10**8]
+QUICK_ROW_SIZES = [10**3, 10**4]
+QUICK_POOL_COUNTS = [3]
+QUICK_BASE_SIZES = [10**3, 10**4]
+
+# ---------------- Synthetic data ----------------
+def make_qubit_frame(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """A Qubit-like table: log-normal concentrations with ~1% zeros, ~1% missing and ~1% text values."""
+    rng = np.random.default_rng(seed)
+    concentrations = rng.lognormal(mean=2.5, sigma=1.0, size=n_rows).astype(object)
+    special = rng.random(n_rows)
+    concentrations[special < 0.01] = 0.0
+    concentrations[(special >= 0.01) & (special < 0.02)] = np.nan
+    concentrations[(special >= 0.02) & (special < 0.03)] = "Out of range"
+    return pd.DataFrame({
+        "Sample Name": [f"S{i}" for i in range(n_rows)],
+        "Original Sample Conc.": concentrations,
+    })
+
+def make_pools(n_pools: int) -> dict:
+    """Pool targets spread evenly on a log scale between 1 and 200."""
+    return {f"pool_{i+1}": float(v) for i, v in enumerate(np.geomspace(1, 200, n_pools))}
+
+def make_dna(n_bases: int, seed: int = 0) -> str:
+    """A random ACGT sequence of the given length."""
+    rng = np.random.default_rng(seed)
+    return np.frombuffer(b"ACGT", dtype=np.uint8)[rng.integers(0, 4, n_bases)].tobytes().decode("ascii")
+
+def make_protein(n_residues: int, seed: int = 0) -> str:
+    """A random protein sequence over the 20 standard amino acids."""
+    rng = np.random.default_rng(seed)
+    return np.frombuffer(b"ACDEFGHIKLMNPQRSTVWY", dtype=np.uint8)[rng.integers(0, 20, n_residues)].tobytes().decode("ascii")
+
+# ---------------- Measuring ----------------
+def measure(name: str, func, size: int, unit: str, repeat: int, params: dict = None) -> dict:
+    """Time func() (best of `repeat`), then run it once more under tracemalloc for the peak memory."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = {
+        "name": name,
+        "size": size,
+        "params": params or {},
+        "seconds": best,
+        "throughput": size / best if best > 0 else float("inf"),
+        "unit": unit,
+        "peak_memory_bytes": peak,
+    }
+    print(f"{name:<45} {size:>11,} {unit:<5} {best:>10.4f} s {result['throughput']:>14,.0f} {unit}/s {peak / 1e6:>10.1f} MB", flush=True)
+    return result
+
+def benchmark_pool_calculator(row_sizes, pool_counts, repeat, reference_max_rows) -> list:
+    results = []
+    for n_rows in row_sizes:
+        df = make_qubit_frame(n_rows)
+        for n_pools in pool_counts:
+            pool_dict = make_pools(n_pools)
+            params = {"pools": n_pools}
+            results.append(measure("calculate_pool_concentrations_vectorized",
+                                   lambda: calculate_pool_concentrations_vectorized(df, pool_dict),
+                                   n_rows, "rows", repeat, params))
+            if n_rows <= reference_max_rows:
+                results.append(measure("calculate_pool_concentrations_from_qubit_data",
+                                       lambda: calculate_pool_concentrations_from_qubit_data(df, pool_dict),
+                                       n_rows, "rows", repeat, params))
+        del df
+    return results
+
+def benchmark_dna_utils(base_sizes, repeat) -> list:
+    if DNA_UTILS_DIR not in sys.path:
+        sys.path.insert(0, DNA_UTILS_DIR)
+    try:
+        from done_in_class_dna_utils import check_DNA_sequence, validate_DNA_sequence, translate_DNA, predict_disorder, disorder_profile
+        from dna_stats import gc_windows, kmer_counts
+    except ImportError:
+        print(f"Skipping DNA benchmarks: the DNA utilities were not found in {DNA_UTILS_DIR}")
+        return []
+
+    results = []
+    for n_bases in base_sizes:
+        sequence = make_dna(n_bases)
+        results.append(measure("check_DNA_sequence", lambda: check_DNA_sequence(sequence), n_bases, "bases", repeat))
+        results.append(measure("translate_DNA", lambda: translate_DNA(sequence), n_bases, "bases", repeat))
+        # Every 100th base replaced by N, so the invalid positions have to be located
+        noisy = "".join(sequence[i:i + 99] + "N" for i in range(0, n_bases, 100))[:n_bases]
+        results.append(measure("validate_DNA_sequence (1% invalid)", lambda: validate_DNA_sequence(noisy), n_bases, "bases", repeat))
+        results.append(measure("gc_windows (window 1000)", lambda: gc_windows(sequence, 1000), n_bases, "bases", repeat))
+        results.append(measure("kmer_counts (k=12)", lambda: kmer_counts(sequence, 12), n_bases, "bases", repeat))
+        del sequence, noisy
+        # The protein a sequence of n_bases translates to, sized in residues
+        protein = make_protein(n_bases // 3)
+        results.append(measure("predict_disorder", lambda: predict_disorder(protein), len(protein), "residues", repeat))
+        results.append(measure("disorder_profile (window 21)", lambda: disorder_profile(protein), len(protein), "residues", repeat))
+        del protein
+    return results
+
+# ---------------- Baseline comparison ----------------
+def case_key(result: dict) -> tuple:
+    return (result["name"], result["size"], tuple(sorted(result["params"].items())))
+
+def compare_to_baseline(results: list, baseline: list, tolerance: float) -> list:
+    """Return the cases that are slower than the baseline by more than `tolerance` (0.2 = 20%)."""
+    baseline_by_key = {case_key(result): result for result in baseline}
+    regressions = []
+    for result in results:
+        old = baseline_by_key.get(case_key(result))
+        if old is None:
+            continue
+        ratio = result["seconds"] / old["seconds"] if old["seconds"] > 0 else 1.0
+        if ratio > 1 + tolerance:
+            regressions.append({**result, "baseline_seconds": old["seconds"], "slowdown": ratio})
+    return regressions
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the pool calculator and the DNA utilities")
+    parser.add_argument("--quick", action="store_true", help="Only run the small sizes (for a quick check)")
+    parser.add_argument("--rows", nargs="+", type=int, help=f"Row counts (default: {ROW_SIZES})")
+    parser.add_argument("--pools", nargs="+", type=int, help=f"Pool counts (default: {POOL_COUNTS})")
+    parser.add_argument("--bases", nargs="+", type=int, help=f"Sequence lengths (default: {BASE_SIZES})")
+    parser.add_argument("--reference-max-rows", type=int, default=10**5,
+                        help="Largest row count for the slow loop version (default: 100000)")
+    parser.add_argument("--skip", choices=["pool", "dna"], action="append", default=[], help="Skip a group of benchmarks")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case; the best one is kept (default: 3)")
+    parser.add_argument("--output", help="Save the results as JSON")
+    parser.add_argument("--baseline", help="JSON file from an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown against the baseline (default: 0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    row_sizes = args.rows or (QUICK_ROW_SIZES if args.quick else ROW_SIZES)
+    pool_counts = args.pools or (QUICK_POOL_COUNTS if args.quick else POOL_COUNTS)
+    base_sizes = args.bases or (QUICK_BASE_SIZES if args.quick else BASE_SIZES)
+
+    results = []
+    if "pool" not in args.skip:
+        results += benchmark_pool_calculator(row_sizes, pool_counts, args.repeat, args.reference_max_rows)
+    if "dna" not in args.skip:
+        results += benchmark_dna_utils(base_sizes, args.repeat)
+
+    report = {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults saved to '{args.output}'.")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n--- {len(regressions)} REGRESSION(S) AGAINST '{args.baseline}' ---")
+            for r in regressions:
+                print(f"{r['name']} size={r['size']} {r['params']}: {r['baseline_seconds']:.4f} s -> {r['seconds']:.4f} s ({r['slowdown']:.2f}x)")
+            return 1
+        print(f"\nNo regressions against '{args.baseline}'.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
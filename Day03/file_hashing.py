@@ -0,0 +1,14 @@
+"""Content hashing shared by the watch folder, the result cache and the Qubit archive.
+
+Kept apart (standard library only) so that importing the cache or the
+archive does not also import the watcher and the batch engine.
+"""
+import hashlib
+
+def file_hash(file_path: str, block_size: int = 1024 * 1024) -> str:
+    """SHA-256 of the file content, read in blocks."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
@@ -0,0 +1,236 @@
+"""A small local HTTP service that keeps the pool calculator loaded between requests.
+
+Endpoints (JSON in, JSON out):
+    POST /calculate  {"pools": [5, 30, 100], "csv": "<csv text>"}
+                     or {"pools": [...], "path": "export.csv"} (see below)
+                     optional: "grouped": true (keep Run ID / Plate Barcode / Well)
+    GET  /stats      request count, errors and latency percentiles
+    GET  /health     {"status": "ok"}
+
+Listens on 127.0.0.1 (TCP) or on a Unix socket. Each connection handles one
+request. Calculations run in a thread pool, so slow requests do not block
+the event loop.
+
+With a data directory (data_dir / --data-dir), "path" is read relative to
+it and may not point outside it. Without one, "path" requests are only
+accepted when the service listens on localhost or on a Unix socket, so a
+service bound to another address cannot be used to read arbitrary files.
+"""
+import asyncio
+import io
+import ipaddress
+import json
+import os
+import stat
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from Basic_code_Assignment2 import calculate_pool_concentrations_vectorized, calculate_grouped_pool_concentrations, GROUP_COLUMNS
+from qubit_reader import read_qubit_csv
+
+MAX_BODY_BYTES = 256 * 1024 * 1024
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               413: "Payload Too Large", 500: "Internal Server Error"}
+
+class _PayloadTooLarge(Exception):
+    pass
+
+class LatencyStats:
+    """Keeps the latency of the last `window` requests and the total request/error counts."""
+
+    def __init__(self, window: int = 10000):
+        self.latencies = deque(maxlen=window)
+        self.requests = 0
+        self.errors = 0
+
+    def record(self, seconds: float, ok: bool):
+        self.latencies.append(seconds)
+        self.requests += 1
+        if not ok:
+            self.errors += 1
+
+    def summary(self) -> dict:
+        summary = {"requests": self.requests, "errors": self.errors}
+        if self.latencies:
+            ms = np.array(self.latencies) * 1000
+            summary.update({
+                "mean_ms": float(ms.mean()),
+                "p50_ms": float(np.percentile(ms, 50)),
+                "p95_ms": float(np.percentile(ms, 95)),
+                "p99_ms": float(np.percentile(ms, 99)),
+                "max_ms": float(ms.max()),
+            })
+        return summary
+
+def is_local_address(host: str) -> bool:
+    """True for localhost and loopback addresses (127.0.0.1, ::1)."""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+def resolve_data_path(path: str, data_dir: str = None) -> str:
+    """The file a 'path' request may read: relative to and inside `data_dir` when one is set."""
+    if data_dir is None:
+        return path
+    root = os.path.realpath(data_dir)
+    resolved = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath([root, resolved]) != root:
+        raise ValueError(f"'{path}' is outside the service's data directory.")
+    return resolved
+
+def calculate_request(payload: dict, data_dir: str = None, allow_paths: bool = True) -> dict:
+    """Run one /calculate request. Raises ValueError for a bad request.
+
+    'path' payloads are refused unless `allow_paths` is set, and must stay
+    inside `data_dir` when one is given.
+    """
+    if not isinstance(payload, dict):
+        raise ValueError("The request body must be a JSON object.")
+    pools = payload.get("pools")
+    if not pools or not isinstance(pools, list):
+        raise ValueError("'pools' must be a non-empty list of numbers.")
+    try:
+        pool_dict = {f"pool_{i+1}": float(val) for i, val in enumerate(pools)}
+    except (TypeError, ValueError):
+        raise ValueError("'pools' must be a non-empty list of numbers.")
+
+    grouped = bool(payload.get("grouped", False))
+    extra_columns = GROUP_COLUMNS if grouped else []
+    if "csv" in payload:
+        df = read_qubit_csv(io.StringIO(payload["csv"]), extra_columns=extra_columns)
+    elif "path" in payload:
+        if not allow_paths:
+            raise ValueError("This service does not read files by 'path'; send the data as 'csv' text.")
+        df = read_qubit_csv(resolve_data_path(payload["path"], data_dir), extra_columns=extra_columns)
+    else:
+        raise ValueError("Give the Qubit data as 'csv' (text) or 'path' (file on this machine).")
+
+    if grouped:
+        result = calculate_grouped_pool_concentrations(df, pool_dict)
+    else:
+        result = calculate_pool_concentrations_vectorized(df, pool_dict)
+
+    # JSON has no NaN, so missing values become null
+    columns = {column: [None if pd.isna(value) else value for value in result[column].tolist()] for column in result.columns}
+    return {"rows": len(result), "columns": columns}
+
+class PoolService:
+    """Serves calculate_request over HTTP, with a thread pool and latency statistics."""
+
+    def __init__(self, workers: int = 4, data_dir: str = None):
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.data_dir = data_dir
+        # Set by start(): without a data directory, files are only read for local clients
+        self.allow_paths = data_dir is not None
+        self.stats = LatencyStats()
+        self.warm_up()
+
+    def warm_up(self):
+        """Run one tiny calculation so the first real request does not pay for lazy initialisation."""
+        calculate_request({"pools": [5, 30, 100], "csv": "Sample Name,Original Sample Conc.\nS1,1.0\n"})
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        start = time.perf_counter()
+        status, body, timed = 500, {"error": "Internal server error"}, False
+        try:
+            method, path, body_bytes = await self.read_request(reader)
+            timed = path == "/calculate"
+            status, body = await self.route(method, path, body_bytes)
+        except ValueError as e:
+            status, body = 400, {"error": str(e)}
+        except _PayloadTooLarge as e:
+            status, body = 413, {"error": str(e)}
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+            return
+        except Exception as e:
+            status, body = 500, {"error": f"{type(e).__name__}: {e}"}
+        finally:
+            if timed:
+                self.stats.record(time.perf_counter() - start, ok=status == 200)
+
+        data = json.dumps(body).encode("utf-8")
+        head = (f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\nConnection: close\r\n\r\n")
+        try:
+            writer.write(head.encode("ascii") + data)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def read_request(self, reader: asyncio.StreamReader):
+        """Read the request line, headers and body. Returns (method, path, body bytes)."""
+        head = await reader.readuntil(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        parts = lines[0].split()
+        if len(parts) != 3:
+            raise ValueError("Malformed request line.")
+        method, path, _ = parts
+
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+        length = int(headers.get("content-length", 0))
+        if length > MAX_BODY_BYTES:
+            raise _PayloadTooLarge(f"Request body larger than {MAX_BODY_BYTES} bytes.")
+        body = await reader.readexactly(length) if length else b""
+        return method, path.split("?", 1)[0], body
+
+    async def route(self, method: str, path: str, body_bytes: bytes):
+        if path == "/health":
+            return 200, {"status": "ok"}
+        if path == "/stats":
+            return 200, self.stats.summary()
+        if path == "/calculate":
+            if method != "POST":
+                return 405, {"error": "Use POST for /calculate."}
+            try:
+                payload = json.loads(body_bytes or b"{}")
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON: {e}")
+            loop = asyncio.get_running_loop()
+            try:
+                result = await loop.run_in_executor(self.executor, calculate_request, payload, self.data_dir, self.allow_paths)
+            except (KeyError, FileNotFoundError) as e:
+                raise ValueError(str(e))
+            return 200, result
+        return 404, {"error": f"Unknown path '{path}'."}
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765, socket_path: str = None):
+        """Start listening and return the asyncio server (port 0 picks a free port)."""
+        self.allow_paths = self.data_dir is not None or bool(socket_path) or is_local_address(host)
+        if socket_path:
+            if os.path.exists(socket_path) and stat.S_ISSOCK(os.stat(socket_path).st_mode):
+                os.remove(socket_path)  # left over from a previous run
+            return await asyncio.start_unix_server(self.handle_connection, path=socket_path)
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+
+def serve(host: str = "127.0.0.1", port: int = 8765, socket_path: str = None, workers: int = 4, data_dir: str = None):
+    """Run the service until Ctrl+C."""
+    service = PoolService(workers=workers, data_dir=data_dir)
+
+    async def main():
+        server = await service.start(host, port, socket_path)
+        where = socket_path or "http://{}:{}".format(*server.sockets[0].getsockname()[:2])
+        print(f"Pool calculator service listening on {where} ({workers} workers). Press Ctrl+C to stop.", flush=True)
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\nService stopped.")
+    finally:
+        service.close()
@@ -0,0 +1,145 @@
+"""Score many candidate pool sets on one plate (--mode sweep).
+
+Instead of running the full calculation once per candidate, the plate's
+concentrations are sorted once, and every candidate is scored from
+searchsorted boundaries and prefix sums of 1 / concentration. Candidates
+can then be filtered and ranked (rank_pool_sets), e.g. to find the set
+with the smallest total amount whose amounts are all easy to pipette.
+"""
+import itertools
+import re
+import numpy as np
+import pandas as pd
+from stage_metrics import NULL_METRICS
+
+SCORE_COLUMNS = ["Candidate", "Pools", "Samples", "Excluded", "Total_Amount", "Max_Amount", "Min_Amount"]
+
+def pool_grid(values, n_pools: int) -> np.ndarray:
+    """Every set of `n_pools` different pool values taken from `values`, as rows of an array."""
+    values = sorted(set(float(v) for v in values))
+    if n_pools < 1 or n_pools > len(values):
+        raise ValueError(f"Cannot choose {n_pools} pools from {len(values)} different values.")
+    return np.array(list(itertools.combinations(values, n_pools)), dtype=float).reshape(-1, n_pools)
+
+def read_pool_sets(path: str) -> list:
+    """Read candidate pool sets from a text/CSV file: one set per line, e.g. '5, 30, 100'.
+
+    Values may be separated by commas, semicolons or spaces. Empty lines and
+    lines starting with '#' are skipped, and so is a header on the first line.
+    """
+    pool_sets = []
+    with open(path) as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                pool_sets.append([float(v) for v in re.split(r"[,;\s]+", line) if v])
+            except ValueError:
+                if line_number == 1:
+                    continue
+                raise ValueError(f"{path}, line {line_number}: pool values must be numbers, got '{line}'.")
+    return pool_sets
+
+def _score_same_size(sorted_conc: np.ndarray, inverse_sums: np.ndarray, pools: np.ndarray) -> dict:
+    """Scores for pool sets that all have the same number of pools (rows of `pools`, sorted).
+
+    Sample i goes to the smallest pool strictly greater than its
+    concentration, or to the largest pool. With the concentrations sorted,
+    the samples of pool j are a contiguous range [edges[j], edges[j+1])
+    whose ends come from one searchsorted call for all sets at once. The total
+    amount of pool j is pool * sum(1 / conc) over that range, read from the
+    prefix sums of 1 / conc. Its largest/smallest amount belongs to the
+    range's lowest/highest concentration.
+    """
+    n_sets, n_pools = pools.shape
+    n = len(sorted_conc)
+    below = np.searchsorted(sorted_conc, pools, side="left")    # samples with conc < pool
+    edges = np.concatenate([np.zeros((n_sets, 1), dtype=below.dtype), below[:, :-1],
+                            np.full((n_sets, 1), n, dtype=below.dtype)], axis=1)
+    lo, hi = edges[:, :-1], edges[:, 1:]
+    counts = hi - lo
+
+    total = (pools * (inverse_sums[hi] - inverse_sums[lo])).sum(axis=1)
+    if n == 0:
+        largest = smallest = np.full(n_sets, np.nan)
+    else:
+        filled = counts > 0
+        largest = np.where(filled, pools / sorted_conc[np.minimum(lo, n - 1)], -np.inf).max(axis=1)
+        smallest = np.where(filled, pools / sorted_conc[np.maximum(hi - 1, 0)], np.inf).min(axis=1)
+        largest[np.isinf(largest)] = np.nan
+        smallest[np.isinf(smallest)] = np.nan
+    return {"Total_Amount": total, "Max_Amount": largest, "Min_Amount": smallest, "counts": counts}
+
+def score_pool_sets(conc_file: pd.DataFrame, pool_sets, metrics=NULL_METRICS) -> pd.DataFrame:
+    """Score many candidate pool sets on one plate in a few array operations.
+
+    `pool_sets` is a list of pool sets (lists of values or pool dicts) or a
+    2-D array with one set per row. Sets may have different sizes. Samples
+    are assigned as in calculate_pool_concentrations_vectorized, with one
+    difference: negative concentrations, which that function turns into
+    negative amounts, are counted as Excluded here (together with missing and
+    zero ones), so they cannot lower a candidate's total.
+
+    Returns one row per candidate, in input order: 'Candidate' (its
+    position), 'Pools' (e.g. '5/30/100'), 'Samples' (assigned samples),
+    'Excluded' (missing, zero or negative concentrations), 'Total_Amount',
+    'Max_Amount', 'Min_Amount' and 'Count_1', 'Count_2', ... (samples per
+    pool, smallest pool first; empty for sets with fewer pools).
+    """
+    pool_sets = [np.sort(np.asarray(list(p.values()) if isinstance(p, dict) else p, dtype=float))
+                 for p in pool_sets]
+    if any(p.size == 0 for p in pool_sets):
+        raise ValueError("At least one pool value is required in every pool set.")
+
+    with metrics.stage("coerce", rows=len(conc_file)):
+        concentrations = pd.to_numeric(conc_file["Original Sample Conc."], errors="coerce").to_numpy(dtype=float)
+        # Non-positive concentrations would give zero or negative amounts, which no pool set can fix
+        usable = concentrations > 0
+        sorted_conc = np.sort(concentrations[usable])
+        inverse_sums = np.concatenate(([0.0], np.cumsum(1.0 / sorted_conc)))
+
+    with metrics.stage("score", rows=len(pool_sets)):
+        max_pools = max((p.size for p in pool_sets), default=0)
+        scores = pd.DataFrame({
+            "Candidate": np.arange(len(pool_sets)),
+            "Pools": ["/".join(f"{v:g}" for v in p) for p in pool_sets],
+            "Samples": len(sorted_conc),
+            "Excluded": int((~usable).sum()),
+            "Total_Amount": np.nan,
+            "Max_Amount": np.nan,
+            "Min_Amount": np.nan,
+        })
+        counts = np.full((len(pool_sets), max_pools), -1, dtype=np.int64)
+
+        sizes = np.array([p.size for p in pool_sets])
+        for size in np.unique(sizes):
+            rows = np.flatnonzero(sizes == size)
+            result = _score_same_size(sorted_conc, inverse_sums, np.stack([pool_sets[i] for i in rows]))
+            for column in ["Total_Amount", "Max_Amount", "Min_Amount"]:
+                scores.loc[rows, column] = result[column]
+            counts[rows, :size] = result["counts"]
+
+        for j in range(max_pools):
+            scores[f"Count_{j + 1}"] = pd.array(np.where(counts[:, j] < 0, None, counts[:, j]), dtype="Int64")
+    return scores
+
+def rank_pool_sets(scores: pd.DataFrame, sort_by: str = "Total_Amount", ascending: bool = True,
+                   max_amount: float = None, min_amount: float = None, top: int = None) -> pd.DataFrame:
+    """Best candidates first.
+
+    Candidates whose largest amount is above `max_amount`, or whose smallest
+    amount is below `min_amount` (e.g. too little to pipette), are dropped.
+    Ties keep the input order.
+    """
+    if sort_by not in scores.columns:
+        raise ValueError(f"Unknown column '{sort_by}'. Choose one of: {', '.join(scores.columns)}")
+    ranked = scores
+    if max_amount is not None:
+        ranked = ranked[ranked["Max_Amount"] <= max_amount]
+    if min_amount is not None:
+        ranked = ranked[ranked["Min_Amount"] >= min_amount]
+    ranked = ranked.sort_values(sort_by, ascending=ascending, kind="stable", na_position="last")
+    if top is not None:
+        ranked = ranked.head(top)
+    return ranked.reset_index(drop=True)
@@ -0,0 +1,173 @@
+"""Local archive of Qubit exports in a SQLite database.
+
+Each export is imported once (files are recognised by the SHA-256 of their
+content, so renamed or copied files are not imported twice). Measurements
+are indexed on Run ID, Sample Name and Test Date, and query() returns a
+DataFrame with the same columns as a Qubit export, which the calculator
+can use directly, without reading any CSV again.
+
+Test dates are stored as ISO 8601 text ("2023-12-28T16:48:46"), so they
+sort and compare correctly; dates that cannot be parsed are stored as NULL.
+Other empty cells, including a blank Sample Name, are stored as NULL too,
+so such a row is kept (and calculated) exactly as when reading the CSV.
+"""
+import json
+import os
+import sqlite3
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from batch_processing import find_input_files
+from file_hashing import file_hash
+from qubit_reader import read_qubit_csv, SAMPLE_COLUMN, CONCENTRATION_COLUMN
+
+QUBIT_DATE_FORMAT = "%d/%m/%Y %I:%M:%S %p"
+
+# Export column -> database column
+ARCHIVE_COLUMNS = {
+    "Run ID": "run_id",
+    "Test Date": "test_date",
+    "Assay Name": "assay_name",
+    SAMPLE_COLUMN: "sample_name",
+    CONCENTRATION_COLUMN: "concentration",
+    "Plate Barcode": "plate_barcode",
+    "Well": "well",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    sha256 TEXT NOT NULL UNIQUE,
+    imported_at TEXT NOT NULL,
+    rows INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS measurements (
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    row_number INTEGER NOT NULL,
+    run_id TEXT,
+    test_date TEXT,
+    assay_name TEXT,
+    sample_name TEXT,
+    concentration REAL,
+    plate_barcode TEXT,
+    well TEXT
+);
+CREATE INDEX IF NOT EXISTS measurements_run_id ON measurements(run_id);
+CREATE INDEX IF NOT EXISTS measurements_sample_name ON measurements(sample_name);
+CREATE INDEX IF NOT EXISTS measurements_test_date ON measurements(test_date);
+"""
+
+def default_archive_path() -> str:
+    """$POOL_CALC_ARCHIVE, or ~/.local/share/pool_calculator/qubit_archive.sqlite."""
+    return os.environ.get("POOL_CALC_ARCHIVE") or os.path.join(
+        os.path.expanduser("~"), ".local", "share", "pool_calculator", "qubit_archive.sqlite")
+
+def normalize_test_dates(values: pd.Series) -> pd.Series:
+    """Qubit dates ('28/12/2023 04:48:46 PM') as ISO 8601 text, None where they cannot be parsed."""
+    dates = pd.to_datetime(values, format=QUBIT_DATE_FORMAT, errors="coerce")
+    return dates.dt.strftime("%Y-%m-%dT%H:%M:%S").astype(object).where(dates.notna(), None)
+
+class QubitArchive:
+    def __init__(self, path: str = None):
+        self.path = path or default_archive_path()
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def import_file(self, file_path: str) -> dict:
+        """Import one export. Returns {'File', 'Status' ('imported' or 'skipped'), 'Rows'}."""
+        digest = file_hash(file_path)
+        existing = self.connection.execute("SELECT rows FROM files WHERE sha256 = ?", (digest,)).fetchone()
+        if existing:
+            return {"File": file_path, "Status": "skipped", "Rows": existing[0]}
+
+        df = read_qubit_csv(file_path, extra_columns=list(ARCHIVE_COLUMNS))
+        records = pd.DataFrame({
+            "row_number": np.arange(len(df)),
+            **{database_column: (df[column] if column in df.columns else None)
+               for column, database_column in ARCHIVE_COLUMNS.items()},
+        })
+        if "Test Date" in df.columns:
+            records["test_date"] = normalize_test_dates(df["Test Date"])
+        # NaN -> NULL
+        records = records.astype(object).where(records.notna(), None)
+
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO files (path, sha256, imported_at, rows) VALUES (?, ?, ?, ?)",
+                (os.path.abspath(file_path), digest, datetime.now().isoformat(timespec="seconds"), len(records)))
+            columns = ["file_id"] + list(records.columns)
+            self.connection.executemany(
+                f"INSERT INTO measurements ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                ((cursor.lastrowid, *row) for row in records.itertuples(index=False, name=None)))
+        return {"File": file_path, "Status": "imported", "Rows": len(records)}
+
+    def import_files(self, source: str) -> pd.DataFrame:
+        """Import every CSV of a folder or glob (see batch_processing.find_input_files).
+
+        A file that cannot be read is reported with Status 'failed' and does
+        not stop the import.
+        """
+        files = [source] if os.path.isfile(source) else find_input_files(source)
+        if not files:
+            raise FileNotFoundError(f"No CSV files found for '{source}'.")
+        summaries = []
+        for path in files:
+            try:
+                summaries.append({**self.import_file(path), "Error": ""})
+            except Exception as e:
+                summaries.append({"File": path, "Status": "failed", "Rows": 0, "Error": f"{type(e).__name__}: {e}"})
+        return pd.DataFrame(summaries, columns=["File", "Status", "Rows", "Error"])
+
+    def query(self, run_ids=None, samples=None, date_from: str = None, date_to: str = None,
+              plate_barcodes=None) -> pd.DataFrame:
+        """Measurements matching all given filters, in import and file order.
+
+        `run_ids`, `samples` and `plate_barcodes` are lists of exact values.
+        `date_from`/`date_to` are ISO dates or date-times ('2023-12-28'), and
+        `date_to` includes that whole day. The result has the export's column
+        names ('Run ID', 'Test Date', 'Sample Name', 'Original Sample Conc.', ...).
+        """
+        conditions, params = [], []
+        for column, values in (("run_id", run_ids), ("sample_name", samples), ("plate_barcode", plate_barcodes)):
+            if values:
+                # One JSON parameter instead of one "?" per value, so long lists work too
+                conditions.append(f"{column} IN (SELECT value FROM json_each(?))")
+                params.append(json.dumps([str(v) for v in values]))
+        if date_from:
+            conditions.append("test_date >= ?")
+            params.append(date_from)
+        if date_to:
+            conditions.append("test_date <= ?")
+            params.append(date_to if "T" in date_to else date_to + "T23:59:59")
+
+        select = ", ".join(f'{database_column} AS "{column}"' for column, database_column in ARCHIVE_COLUMNS.items())
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        df = pd.read_sql_query(f"SELECT {select} FROM measurements {where} ORDER BY file_id, row_number",
+                               self.connection, params=params)
+        df[CONCENTRATION_COLUMN] = df[CONCENTRATION_COLUMN].astype(float)
+        # NULL -> NaN in the text columns, as read_qubit_csv gives for empty cells
+        text_columns = [column for column in df.columns if column != CONCENTRATION_COLUMN]
+        df[text_columns] = df[text_columns].astype(object).where(df[text_columns].notna(), np.nan)
+        return df
+
+    def runs(self) -> pd.DataFrame:
+        """One row per run: Run ID, first test date, number of samples and source file(s)."""
+        return pd.read_sql_query(
+            """SELECT run_id AS "Run ID", MIN(test_date) AS "Test Date", COUNT(*) AS "Samples",
+                      GROUP_CONCAT(DISTINCT files.path) AS "File"
+               FROM measurements JOIN files ON files.id = measurements.file_id
+               GROUP BY run_id ORDER BY MIN(test_date), run_id""",
+            self.connection)
@@ -0,0 +1,79 @@
+import csv
+import importlib.util
+import numpy as np
+import pandas as pd
+
+SAMPLE_COLUMN = "Sample Name"
+CONCENTRATION_COLUMN = "Original Sample Conc."
+REQUIRED_COLUMNS = [SAMPLE_COLUMN, CONCENTRATION_COLUMN]
+
+def read_qubit_header(file_path) -> list:
+    """Return the column names of a CSV file (a path or an open buffer) by reading only its first line."""
+    if hasattr(file_path, "read"):
+        position = file_path.tell()
+        first_line = file_path.readline()
+        file_path.seek(position)
+        if isinstance(first_line, bytes):
+            first_line = first_line.decode("utf-8")
+        return next(csv.reader([first_line.lstrip("\ufeff")]), [])
+
+    with open(file_path, newline="", encoding="utf-8-sig") as f:
+        return next(csv.reader(f), [])
+
+def check_qubit_header(file_path) -> list:
+    """Raise ValueError if the file does not have the columns the calculation needs, otherwise return the header."""
+    header = read_qubit_header(file_path)
+    missing = [column for column in REQUIRED_COLUMNS if column not in header]
+    if missing:
+        name = getattr(file_path, "name", "The uploaded CSV") if hasattr(file_path, "read") else f"'{file_path}'"
+        raise ValueError(f"{name} is not a Qubit export: missing column(s) {', '.join(missing)}.")
+    return header
+
+def default_engine() -> str:
+    """Use the pyarrow CSV parser when it is installed, otherwise the default C parser."""
+    return "pyarrow" if importlib.util.find_spec("pyarrow") is not None else "c"
+
+def read_qubit_csv(file_path, extra_columns=(), chunksize: int = None, engine: str = None):
+    """Read a Qubit export (a path or an open buffer), loading only the columns the calculation needs.
+
+    `extra_columns` (e.g. "Run ID") are loaded too when the file has them.
+    All columns are read as text except the concentration, which always
+    comes back as float, with NaN for empty or non-numeric values. With
+    `chunksize`, an iterator of DataFrames is returned instead of one
+    DataFrame.
+    """
+    header = check_qubit_header(file_path)
+    columns = REQUIRED_COLUMNS + [column for column in extra_columns if column in header and column not in REQUIRED_COLUMNS]
+    text_dtypes = {column: str for column in columns if column != CONCENTRATION_COLUMN}
+
+    if chunksize:
+        # The pyarrow parser cannot read in chunks. Chunks are read as text
+        # and converted, so one bad value can't break the reader mid-file.
+        reader = pd.read_csv(file_path, usecols=columns, dtype={**text_dtypes, CONCENTRATION_COLUMN: str},
+                             chunksize=chunksize, engine="c")
+        return (_coerce_concentrations(chunk) for chunk in reader)
+
+    engine = engine or default_engine()
+    start = file_path.tell() if hasattr(file_path, "read") else None
+    try:
+        if engine == "pyarrow":
+            # With dtype=str the pyarrow parser turns empty cells into the text "nan",
+            # so read Arrow strings and convert them to object columns with NaN like the C parser
+            df = pd.read_csv(file_path, usecols=columns, engine=engine,
+                             dtype={**{column: "string[pyarrow]" for column in text_dtypes}, CONCENTRATION_COLUMN: "float64"})
+            for column in text_dtypes:
+                df[column] = df[column].astype(object).where(df[column].notna(), np.nan)
+        else:
+            df = pd.read_csv(file_path, usecols=columns, dtype={**text_dtypes, CONCENTRATION_COLUMN: "float64"}, engine=engine)
+    except ValueError:
+        # Non-numeric text in the concentration column (e.g. "Out of range"),
+        # or rows the stricter pyarrow parser rejects: read again with the C parser
+        if start is not None:
+            file_path.seek(start)
+        df = pd.read_csv(file_path, usecols=columns, dtype={**text_dtypes, CONCENTRATION_COLUMN: str}, engine="c")
+        df = _coerce_concentrations(df)
+    return df[columns]
+
+def _coerce_concentrations(df: pd.DataFrame) -> pd.DataFrame:
+    df[CONCENTRATION_COLUMN] = pd.to_numeric(df[CONCENTRATION_COLUMN], errors="coerce")
+    return df
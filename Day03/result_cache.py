@@ -0,0 +1,146 @@
+"""On-disk cache of calculation results, shared by the GUI, interactive and CLI modes.
+
+A result is stored under a key made from the SHA-256 of the input file's
+content and the sorted pool values, so renaming or touching a file still
+hits the cache, while any change to the data or the pools misses it.
+Results are stored as compressed .npz files (no pickle). When the cache
+grows beyond `max_bytes`, the least recently used entries are removed.
+"""
+import hashlib
+import json
+import os
+import threading
+import numpy as np
+import pandas as pd
+from file_hashing import file_hash
+
+CACHE_VERSION = 1  # bump when the calculation changes, so old results are not reused
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+STATS_FILE_NAME = "stats.json"
+ENTRY_SUFFIX = ".npz"
+
+def default_cache_dir() -> str:
+    """$POOL_CALC_CACHE_DIR, or ~/.cache/pool_calculator."""
+    return os.environ.get("POOL_CALC_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "pool_calculator")
+
+class ResultCache:
+    def __init__(self, cache_dir: str = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def key(self, file_path: str, pool_dict: dict, variant: str = "") -> str:
+        """Cache key for a file's content + the normalized pool set (names and order do not matter)."""
+        pools = ",".join(repr(float(value)) for value in sorted(pool_dict.values()))
+        text = f"{CACHE_VERSION}|{file_hash(file_path)}|{pools}|{variant}"
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + ENTRY_SUFFIX)
+
+    def get(self, key: str):
+        """Return the cached DataFrame, or None on a miss."""
+        path = self.entry_path(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                result = _frame_from_arrays(data)
+            os.utime(path)  # mark as recently used
+        except (FileNotFoundError, OSError, ValueError, KeyError):
+            self._count("misses")
+            return None
+        self._count("hits")
+        return result
+
+    def put(self, key: str, result: pd.DataFrame):
+        path = self.entry_path(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as f:
+            np.savez_compressed(f, **_frame_to_arrays(result))
+        os.replace(temp_path, path)
+        self.evict()
+
+    def cached(self, file_path: str, pool_dict: dict, calculate, variant: str = "") -> pd.DataFrame:
+        """Return the cached result for this file and pools, or call calculate() and store its result."""
+        key = self.key(file_path, pool_dict, variant)
+        result = self.get(key)
+        if result is None:
+            result = calculate()
+            self.put(key, result)
+        return result
+
+    def entries(self) -> list:
+        """(path, size, last use) of every entry, oldest first."""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(ENTRY_SUFFIX):
+                st = entry.stat()
+                entries.append((entry.path, st.st_size, st.st_mtime_ns))
+        return sorted(entries, key=lambda e: e[2])
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits in max_bytes."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        """Remove every entry and reset the statistics."""
+        for path, _, _ in self.entries():
+            os.remove(path)
+        stats_path = os.path.join(self.cache_dir, STATS_FILE_NAME)
+        if os.path.exists(stats_path):
+            os.remove(stats_path)
+
+    def stats(self) -> dict:
+        stats = self._read_stats()
+        entries = self.entries()
+        stats.update({"entries": len(entries), "size_bytes": sum(size for _, size, _ in entries),
+                      "max_bytes": self.max_bytes, "cache_dir": self.cache_dir})
+        return stats
+
+    def _read_stats(self) -> dict:
+        try:
+            with open(os.path.join(self.cache_dir, STATS_FILE_NAME)) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {"hits": 0, "misses": 0}
+
+    def _count(self, name: str):
+        with self._lock:
+            stats = self._read_stats()
+            stats[name] = stats.get(name, 0) + 1
+            temp_path = os.path.join(self.cache_dir, f"{STATS_FILE_NAME}.{os.getpid()}.tmp")
+            with open(temp_path, "w") as f:
+                json.dump(stats, f)
+            os.replace(temp_path, os.path.join(self.cache_dir, STATS_FILE_NAME))
+
+def _frame_to_arrays(result: pd.DataFrame) -> dict:
+    """Numeric columns are stored as-is; text columns as fixed-width unicode plus a missing-value mask."""
+    arrays = {"__columns__": np.array(result.columns, dtype=str)}
+    for i, column in enumerate(result.columns):
+        values = result[column]
+        if pd.api.types.is_numeric_dtype(values):
+            arrays[f"c{i}"] = values.to_numpy()
+        else:
+            missing = values.isna().to_numpy()
+            arrays[f"c{i}"] = values.where(~missing, "").astype(str).to_numpy(dtype=str)
+            arrays[f"m{i}"] = missing
+    return arrays
+
+def _frame_from_arrays(data) -> pd.DataFrame:
+    columns = {}
+    for i, column in enumerate(data["__columns__"].tolist()):
+        values = data[f"c{i}"]
+        if f"m{i}" in data.files:
+            values = values.astype(object)
+            values[data[f"m{i}"]] = np.nan
+        columns[column] = values
+    return pd.DataFrame(columns)
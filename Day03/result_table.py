@@ -0,0 +1,155 @@
+"""A paged result table for the GUI.
+
+Only the rows that fit in the window are put into the ttk.Treeview, so
+opening a result with a million rows costs about as much as opening one
+with a hundred. Sorting and filtering work on index arrays (ResultView),
+and only the visible page is formatted again.
+"""
+import tkinter as tk
+from tkinter import ttk
+import numpy as np
+import pandas as pd
+
+class ResultView:
+    """Sort/filter state of a result DataFrame, without any Tk code.
+
+    `order` holds the row numbers of the visible rows in display order.
+    "Excluded" rows are the ones with a NaN Amount_to_Take.
+    """
+
+    def __init__(self, result: pd.DataFrame, amount_column: str = "Amount_to_Take"):
+        self.columns = list(result.columns)
+        self.values = {column: result[column].to_numpy() for column in self.columns}
+        self.excluded = pd.isna(self.values[amount_column]) if amount_column in self.values else np.zeros(len(result), dtype=bool)
+        self.hide_excluded = False
+        self.sort_column = None
+        self.descending = False
+        self._sorted_index = {}  # column -> argsort of the full column, computed once
+        self.order = np.arange(len(result))
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def sort(self, column: str, descending: bool = False):
+        self.sort_column, self.descending = column, descending
+        self._update()
+
+    def set_hide_excluded(self, hide: bool):
+        self.hide_excluded = hide
+        self._update()
+
+    def _update(self):
+        if self.sort_column is None:
+            order = np.arange(len(self.excluded))
+        else:
+            if self.sort_column not in self._sorted_index:
+                self._sorted_index[self.sort_column] = self._argsort(self.values[self.sort_column])
+            order = self._sorted_index[self.sort_column]
+            if self.descending:
+                # Reverse the non-missing part only, so missing values stay at the end
+                n_valid = int((~pd.isna(self.values[self.sort_column])).sum())
+                order = np.concatenate([order[:n_valid][::-1], order[n_valid:]])
+        if self.hide_excluded:
+            order = order[~self.excluded[order]]
+        self.order = order
+
+    @staticmethod
+    def _argsort(values: np.ndarray) -> np.ndarray:
+        """Stable argsort with missing values last."""
+        if values.dtype.kind in "fiu":
+            return np.argsort(values, kind="stable")  # NaN sorts last
+        missing = pd.isna(values)
+        present = np.flatnonzero(~missing)
+        present = present[np.argsort(values[present].astype(str), kind="stable")]
+        return np.concatenate([present, np.flatnonzero(missing)])
+
+    def page(self, start: int, count: int) -> list:
+        """Formatted rows start..start+count of the current view."""
+        rows = []
+        for i in self.order[start:start + count]:
+            rows.append(tuple(_format_value(self.values[column][i]) for column in self.columns))
+        return rows
+
+def _format_value(value) -> str:
+    if isinstance(value, (float, np.floating)):
+        return "NaN" if np.isnan(value) else f"{value:.6f}"
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ""
+    return str(value)
+
+class ResultTable(tk.Frame):
+    """Treeview that shows one page of a ResultView and scrolls through it without loading everything."""
+
+    def __init__(self, master, result: pd.DataFrame, page_size: int = 30):
+        super().__init__(master)
+        self.view = ResultView(result)
+        self.page_size = page_size
+        self.offset = 0
+
+        self.tree = ttk.Treeview(self, columns=self.view.columns, show="headings", height=page_size, selectmode="browse")
+        for column in self.view.columns:
+            self.tree.heading(column, text=column, command=lambda c=column: self.toggle_sort(c))
+            self.tree.column(column, width=130, anchor="e" if column != "Sample" else "w")
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.on_scrollbar)
+
+        self.hide_var = tk.BooleanVar(value=False)
+        controls = tk.Frame(self)
+        tk.Checkbutton(controls, text="Hide excluded samples (NaN)", variable=self.hide_var,
+                       command=self.on_filter).pack(side="left")
+        self.count_label = tk.Label(controls, text="")
+        self.count_label.pack(side="right")
+
+        controls.grid(row=0, column=0, columnspan=2, sticky="ew", padx=5, pady=5)
+        self.tree.grid(row=1, column=0, sticky="nsew")
+        self.scrollbar.grid(row=1, column=1, sticky="ns")
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(1, weight=1)
+
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree.bind(sequence, self.on_mousewheel)
+        self.render()
+
+    def max_offset(self) -> int:
+        return max(len(self.view) - self.page_size, 0)
+
+    def scroll_to(self, offset: int):
+        self.offset = min(max(int(offset), 0), self.max_offset())
+        self.render()
+
+    def render(self):
+        self.tree.delete(*self.tree.get_children())
+        for row in self.view.page(self.offset, self.page_size):
+            self.tree.insert("", "end", values=row)
+
+        total = len(self.view)
+        if total:
+            self.scrollbar.set(self.offset / total, min((self.offset + self.page_size) / total, 1.0))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        self.count_label.config(text=f"{total} of {len(self.view.excluded)} samples")
+
+    def on_scrollbar(self, action, *args):
+        if action == "moveto":
+            self.scroll_to(float(args[0]) * len(self.view))
+        elif action == "scroll":
+            step = self.page_size if args[1] == "pages" else 1
+            self.scroll_to(self.offset + int(args[0]) * step)
+
+    def on_mousewheel(self, event):
+        if getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0:
+            self.scroll_to(self.offset - 3)
+        else:
+            self.scroll_to(self.offset + 3)
+        return "break"
+
+    def toggle_sort(self, column: str):
+        descending = self.view.sort_column == column and not self.view.descending
+        self.view.sort(column, descending)
+        for name in self.view.columns:
+            arrow = (" ▼" if descending else " ▲") if name == column else ""
+            self.tree.heading(name, text=name + arrow)
+        self.scroll_to(0)
+
+    def on_filter(self):
+        self.view.set_hide_excluded(self.hide_var.get())
+        self.scroll_to(0)
@@ -0,0 +1,142 @@
+"""Writers for calculation results: TSV, CSV, JSON Lines, Parquet and Feather.
+
+Results are written in bulk, one DataFrame (or chunk) at a time, without
+building a formatted string of the whole table. "-" means standard output,
+so the calculator can be used in a pipe. Parquet and Feather need pyarrow.
+A file is only created by the first write, and is removed again if writing
+fails, so a failed run never leaves a truncated result behind.
+"""
+import os
+import sys
+
+FORMATS = ["tsv", "csv", "jsonl", "parquet", "feather"]
+BINARY_FORMATS = {"parquet", "feather"}
+EXTENSIONS = {".tsv": "tsv", ".txt": "tsv", ".csv": "csv", ".jsonl": "jsonl",
+              ".parquet": "parquet", ".pq": "parquet", ".feather": "feather", ".arrow": "feather"}
+
+# Columns that hold text even when a chunk has only missing values in them
+TEXT_COLUMNS = {"Sample", "Run ID", "Plate Barcode", "Well"}
+
+def guess_format(path: str, default: str = "tsv") -> str:
+    """Pick the format from the file extension ("-" or an unknown extension gives `default`)."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".json":
+        # One JSON document per row is not a valid .json file: make the caller say so
+        raise ValueError("'.json' is ambiguous: use a '.jsonl' file name or --format jsonl for JSON Lines.")
+    return EXTENSIONS.get(extension, default)
+
+def arrow_schema(result):
+    """Arrow schema of a result chunk, with text for TEXT_COLUMNS and for columns that are all missing.
+
+    Inferring the schema from the first chunk alone would give a null column
+    wherever that chunk happens to have no value, and later chunks would fail.
+    """
+    import pyarrow as pa
+
+    schema = pa.Table.from_pandas(result, preserve_index=False).schema
+    for i, field in enumerate(schema):
+        if field.name in TEXT_COLUMNS or pa.types.is_null(field.type):
+            schema = schema.set(i, field.with_type(pa.string()))
+    return schema
+
+class ResultWriter:
+    """Writes result DataFrames to one destination. Call write() once per chunk, then close().
+
+    Can be used as a context manager.
+    """
+
+    def __init__(self, destination: str = "-", fmt: str = None):
+        self.format = fmt or guess_format(destination)
+        if self.format not in FORMATS:
+            raise ValueError(f"Unknown output format '{self.format}'. Choose one of: {', '.join(FORMATS)}.")
+        if self.format in BINARY_FORMATS:
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise ValueError(f"Writing {self.format} files requires the 'pyarrow' package (pip install pyarrow).")
+
+        self.destination = destination
+        self.to_stdout = destination == "-"
+        self.stream = None
+        if self.to_stdout:
+            self.stream = sys.stdout.buffer if self.format in BINARY_FORMATS else sys.stdout
+        self.rows_written = 0
+        self._first = True
+        self._arrow_writer = None
+        self._schema = None
+
+    def _open(self):
+        if self.format in BINARY_FORMATS:
+            self.stream = open(self.destination, "wb")
+        else:
+            self.stream = open(self.destination, "w", newline="", encoding="utf-8")
+
+    def write(self, result):
+        if self.stream is None:
+            self._open()
+        if self.format in ("tsv", "csv"):
+            # tsv keeps the "NaN" spelling of the original CLI output
+            result.to_csv(self.stream, sep="\t" if self.format == "tsv" else ",", index=False,
+                          header=self._first, na_rep="NaN" if self.format == "tsv" else "")
+        elif self.format == "jsonl":
+            if len(result):
+                self.stream.write(result.to_json(orient="records", lines=True, double_precision=15).rstrip("\n") + "\n")
+        else:
+            self._write_arrow(result)
+        self.stream.flush()
+        self.rows_written += len(result)
+        self._first = False
+
+    def _write_arrow(self, result):
+        import pyarrow as pa
+
+        if self._arrow_writer is None:
+            self._schema = arrow_schema(result)
+            if self.format == "parquet":
+                import pyarrow.parquet as pq
+                self._arrow_writer = pq.ParquetWriter(self.stream, self._schema)
+            else:
+                # Feather version 2 is the Arrow IPC file format
+                self._arrow_writer = pa.ipc.new_file(self.stream, self._schema)
+        # Text columns that pandas read as all-NaN floats are passed on as missing strings
+        text = [field.name for field in self._schema
+                if pa.types.is_string(field.type) and field.name in result and result[field.name].dtype != object]
+        if text:
+            result = result.assign(**{name: result[name].astype("string") for name in text})
+        table = pa.Table.from_pandas(result, schema=self._schema, preserve_index=False)
+        self._arrow_writer.write_table(table)
+
+    def close(self):
+        if self.stream is None:
+            # Nothing was written: still create the (empty) file
+            self._open()
+        if self._arrow_writer is not None:
+            self._arrow_writer.close()
+        if self.to_stdout:
+            self.stream.flush()
+        else:
+            self.stream.close()
+
+    def discard(self):
+        """Close without finishing the output and remove the file, if one was created."""
+        if self.to_stdout or self.stream is None:
+            return
+        self.stream.close()
+        try:
+            os.remove(self.destination)
+        except OSError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+def write_result(result, destination: str = "-", fmt: str = None):
+    """Write one complete result."""
+    with ResultWriter(destination, fmt) as writer:
+        writer.write(result)
@@ -0,0 +1,103 @@
+"""Per-stage timing for the calculator (--metrics-json / --profile).
+
+    metrics = StageMetrics()
+    with metrics.stage("read") as stage:
+        df = read_qubit_csv(path)
+        stage.rows = len(df)
+
+Each stage records wall time, CPU time, row count and peak traced memory
+(tracemalloc). A stage that runs several times (e.g. once per chunk) is
+added up. When metrics are off, NULL_METRICS is used instead: its stage()
+returns one shared do-nothing object, so the cost is a method call.
+"""
+import json
+import time
+import tracemalloc
+
+class _Stage:
+    def __init__(self, metrics, name: str, rows: int):
+        self.metrics = metrics
+        self.name = name
+        self.rows = rows
+
+    def __enter__(self):
+        if self.metrics.track_memory:
+            tracemalloc.reset_peak()
+            self._memory_start = tracemalloc.get_traced_memory()[0]
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        return self
+
+    def __exit__(self, *exc_info):
+        wall = time.perf_counter() - self._wall
+        cpu = time.process_time() - self._cpu
+        peak = tracemalloc.get_traced_memory()[1] - self._memory_start if self.metrics.track_memory else None
+        self.metrics.record(self.name, wall, cpu, self.rows, peak)
+        return False
+
+class StageMetrics:
+    def __init__(self, track_memory: bool = True):
+        self.track_memory = track_memory
+        self.stages = {}
+        self.enabled = True
+        # Only stop tracemalloc in stop() if it was started here
+        self._started_tracing = track_memory and not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+
+    def stage(self, name: str, rows: int = None) -> _Stage:
+        return _Stage(self, name, rows)
+
+    def record(self, name: str, wall: float, cpu: float, rows: int, peak_bytes: int):
+        entry = self.stages.setdefault(name, {"calls": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0,
+                                              "rows": 0, "peak_memory_bytes": None})
+        entry["calls"] += 1
+        entry["wall_seconds"] += wall
+        entry["cpu_seconds"] += cpu
+        entry["rows"] += rows or 0
+        if peak_bytes is not None:
+            entry["peak_memory_bytes"] = max(entry["peak_memory_bytes"] or 0, peak_bytes)
+
+    def report(self) -> dict:
+        total_wall = sum(entry["wall_seconds"] for entry in self.stages.values())
+        return {"stages": self.stages, "total_wall_seconds": total_wall}
+
+    def write_json(self, path: str):
+        with open(path, "w") as f:
+            json.dump(self.report(), f, indent=2)
+
+    def format_table(self) -> str:
+        lines = [f"{'Stage':<10} {'Calls':>6} {'Wall (s)':>10} {'CPU (s)':>10} {'Rows':>12} {'Peak MB':>9}"]
+        for name, entry in self.stages.items():
+            peak = entry["peak_memory_bytes"]
+            peak_text = f"{peak / 1e6:.1f}" if peak is not None else "-"
+            lines.append(f"{name:<10} {entry['calls']:>6} {entry['wall_seconds']:>10.4f} {entry['cpu_seconds']:>10.4f} "
+                         f"{entry['rows']:>12,} {peak_text:>9}")
+        return "\n".join(lines)
+
+    def stop(self):
+        """Stop memory tracing (if this object started it). Call once the run is over."""
+        if self._started_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._started_tracing = False
+
+class _NullStage:
+    rows = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def __setattr__(self, name, value):
+        pass  # stage.rows = ... is ignored
+
+class _NullMetrics:
+    enabled = False
+    _stage = _NullStage()
+
+    def stage(self, name: str, rows: int = None) -> _NullStage:
+        return self._stage
+
+NULL_METRICS = _NullMetrics()
@@ -0,0 +1,72 @@
+import os
+import shutil
+import pandas as pd
+import pytest
+from batch_processing import find_input_files, result_file_names, run_batch, SUMMARY_FILE_NAME
+
+EXAMPLE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Qubit_data_example.csv")
+POOL_DICT = {"pool_1": 5.0, "pool_2": 30.0, "pool_3": 100.0}
+
+def make_run_folder(tmp_path):
+    """Helper to create a folder with two good exports and one broken file."""
+    shutil.copy(EXAMPLE_FILE, tmp_path / "run_a.csv")
+    shutil.copy(EXAMPLE_FILE, tmp_path / "run_b.csv")
+    (tmp_path / "broken.csv").write_text("not,a,qubit,file\n1,2,3,4\n")
+    return tmp_path
+
+def test_batch_writes_one_result_per_file_and_isolates_failures(tmp_path):
+    """Good files get a result file, the broken one is reported as failed without stopping the batch."""
+
+    input_dir = make_run_folder(tmp_path)
+    output_dir = tmp_path / "out"
+
+    summary = run_batch(str(input_dir), POOL_DICT, str(output_dir), workers=2)
+
+    statuses = dict(zip(summary["File"].map(os.path.basename), summary["Status"]))
+    assert statuses == {"broken.csv": "failed", "run_a.csv": "ok", "run_b.csv": "ok"}
+    assert (output_dir / SUMMARY_FILE_NAME).exists()
+
+    result = pd.read_csv(output_dir / "run_a_pools.csv")
+    assert len(result) == len(pd.read_csv(EXAMPLE_FILE))
+
+def test_batch_sequential_matches_parallel(tmp_path):
+    """Running with one worker gives the same summary as running with a process pool."""
+
+    input_dir = make_run_folder(tmp_path)
+    sequential = run_batch(str(input_dir), POOL_DICT, str(tmp_path / "seq"), workers=1)
+    parallel = run_batch(str(input_dir), POOL_DICT, str(tmp_path / "par"), workers=2)
+
+    columns = ["File", "Samples", "Excluded", "Total_Amount", "Status"]
+    pd.testing.assert_frame_equal(sequential[columns], parallel[columns])
+
+def test_find_input_files_skips_results(tmp_path):
+    """Result files written next to the inputs are not picked up as inputs on the next run."""
+
+    shutil.copy(EXAMPLE_FILE, tmp_path / "run_a.csv")
+    (tmp_path / "run_a_pools.csv").write_text("Sample,Amount_to_Take,Pool\n")
+    (tmp_path / SUMMARY_FILE_NAME).write_text("File\n")
+
+    assert [os.path.basename(path) for path in find_input_files(str(tmp_path))] == ["run_a.csv"]
+    assert len(find_input_files(str(tmp_path / "*.csv"))) == 1
+
+def test_same_file_names_in_different_folders_do_not_overwrite(tmp_path):
+    """Inputs with the same name (runs/*/export.csv) get one result file each, named after their folder."""
+
+    for run in ["run_a", "run_b"]:
+        (tmp_path / "runs" / run).mkdir(parents=True)
+        shutil.copy(EXAMPLE_FILE, tmp_path / "runs" / run / "export.csv")
+    output_dir = tmp_path / "out"
+
+    summary = run_batch(str(tmp_path / "runs" / "*" / "export.csv"), POOL_DICT, str(output_dir), workers=1)
+
+    assert summary["Status"].tolist() == ["ok", "ok"]
+    assert sorted(summary["Output"].map(os.path.basename)) == ["run_a_export_pools.csv", "run_b_export_pools.csv"]
+    assert all(os.path.exists(path) for path in summary["Output"])
+
+def test_result_name_collisions_and_bad_workers_are_rejected(tmp_path):
+    """Names that would still clash and a worker count below 1 fail before anything is written."""
+
+    with pytest.raises(ValueError, match="a_export_pools.csv"):
+        result_file_names(["x/a/export.csv", "x/b/export.csv", "x/a_export.csv"])
+    with pytest.raises(ValueError, match="at least 1"):
+        run_batch(str(make_run_folder(tmp_path)), POOL_DICT, str(tmp_path / "out"), workers=0)
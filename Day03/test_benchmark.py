@@ -0,0 +1,34 @@
+import json
+from benchmark import compare_to_baseline, main
+
+def make_result(name, seconds, size=1000, params=None):
+    """Helper to build one benchmark result entry."""
+    return {"name": name, "size": size, "params": params or {}, "seconds": seconds}
+
+def test_compare_to_baseline_flags_only_real_slowdowns():
+    """Only cases slower than baseline * (1 + tolerance) are reported; new cases are ignored."""
+
+    baseline = [make_result("a", 1.0), make_result("b", 1.0), make_result("c", 1.0, params={"pools": 3})]
+    results = [make_result("a", 1.1), make_result("b", 1.5), make_result("c", 5.0, params={"pools": 10}), make_result("new", 9.0)]
+
+    regressions = compare_to_baseline(results, baseline, tolerance=0.2)
+
+    assert [r["name"] for r in regressions] == ["b"]
+    assert regressions[0]["slowdown"] == 1.5
+
+def test_main_saves_json_and_fails_on_regression(tmp_path):
+    """A quick run writes JSON, and comparing against an impossibly fast baseline returns exit code 1."""
+
+    output = tmp_path / "results.json"
+    assert main(["--rows", "100", "--pools", "3", "--skip", "dna", "--repeat", "1", "--output", str(output)]) == 0
+
+    report = json.loads(output.read_text())
+    assert {r["name"] for r in report["results"]} == {"calculate_pool_concentrations_vectorized",
+                                                        "calculate_pool_concentrations_from_qubit_data"}
+
+    for r in report["results"]:
+        r["seconds"] = 1e-12
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps(report))
+
+    assert main(["--rows", "100", "--pools", "3", "--skip", "dna", "--repeat", "1", "--baseline", str(baseline)]) == 1
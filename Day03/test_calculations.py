@@ -1,6 +1,8 @@
 import pandas as pd
 import numpy as np
-from Basic_code_Assignment2 import calculate_pool_concentrations_from_qubit_data
+import pytest
+from Basic_code_Assignment2 import (calculate_pool_concentrations_from_qubit_data, calculate_pool_concentrations_vectorized,
+                                    calculate_grouped_pool_concentrations)
 
 # Define common constants for the tests
 POOL_DICT = {'A': 5.0, 'B': 30.0, 'C': 100.0}
@@ -127,4 +129,138 @@ def test_invalid_or_zero_concentrations():
                 f"Note: For real-world robustness, this case should ideally be excluded (result in NaN)."
             )
             # Assert the calculated ratio to ensure code didn't crash
-            assert round(actual, PLACES) == round(expected, PLACES), failure_msg
\ No newline at end of file
+            assert round(actual, PLACES) == round(expected, PLACES), failure_msg
+
+
+# ---------------- Vectorized engine (compared against the loop version) ----------------
+
+def test_vectorized_matches_reference_on_edge_cases():
+    """The vectorized engine must give the same amounts as the loop version for boundaries, NaN, zero, strings and negatives."""
+
+    input_samples = ["S_low", "S_eq5", "S_mid", "S_eq30", "S_high", "S_eq100", "S_NaN", "S_Zero", "S_String", "S_Negative"]
+    input_concentrations = [1.0, 5.0, 15.0, 30.0, 200.0, 100.0, np.nan, 0.0, "N/A", -10.0]
+
+    df = create_mock_dataframe(input_samples, input_concentrations)
+    expected = calculate_pool_concentrations_from_qubit_data(df, POOL_DICT)
+    actual = calculate_pool_concentrations_vectorized(df, POOL_DICT)
+
+    assert actual["Sample"].tolist() == expected["Sample"].tolist()
+    np.testing.assert_allclose(actual["Amount_to_Take"], expected["Amount_to_Take"], equal_nan=True)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_vectorized_matches_reference_on_random_data(seed):
+    """Differential test on random plates with unique sample names and a random number of pools."""
+
+    rng = np.random.default_rng(seed)
+    n_rows = 500
+    concentrations = rng.choice([0.0, np.nan, 5.0, 30.0], size=n_rows).astype(object)
+    random_mask = rng.random(n_rows) < 0.8
+    concentrations[random_mask] = rng.uniform(-5, 150, size=random_mask.sum())
+
+    pool_values = rng.choice(np.arange(1, 120), size=rng.integers(1, 6), replace=False)
+    pool_dict = {f"pool_{i+1}": float(v) for i, v in enumerate(pool_values)}
+
+    df = create_mock_dataframe([f"S{i}" for i in range(n_rows)], concentrations)
+    expected = calculate_pool_concentrations_from_qubit_data(df, pool_dict)
+    actual = calculate_pool_concentrations_vectorized(df, pool_dict)
+
+    np.testing.assert_allclose(actual["Amount_to_Take"], expected["Amount_to_Take"], equal_nan=True)
+
+
+def test_vectorized_returns_chosen_pool():
+    """The 'Pool' column holds the pool that was used, and NaN for excluded samples."""
+
+    df = create_mock_dataframe(["S1", "S2", "S3", "S4"], [1.0, 30.0, 500.0, 0.0])
+    result_df = calculate_pool_concentrations_vectorized(df, POOL_DICT)
+
+    np.testing.assert_array_equal(result_df["Pool"].to_numpy(), [5.0, 100.0, 100.0, np.nan])
+
+
+def test_vectorized_keeps_duplicate_sample_names():
+    """Duplicate sample names are kept as separate rows instead of overwriting each other."""
+
+    df = create_mock_dataframe(["S1", "S1"], [1.0, 15.0])
+    result_df = calculate_pool_concentrations_vectorized(df, POOL_DICT)
+
+    assert len(result_df) == 2
+    assert result_df["Amount_to_Take"].tolist() == [5.0, 2.0]
+
+
+def test_vectorized_requires_pools():
+    """An empty pool set is rejected with a clear error."""
+
+    df = create_mock_dataframe(["S1"], [1.0])
+    with pytest.raises(ValueError):
+        calculate_pool_concentrations_vectorized(df, {})
+
+
+# ---------------- Grouped (per run / plate) calculation ----------------
+
+def create_mock_plates():
+    """Helper to create two runs with two plates each, reusing the same sample names."""
+    return pd.DataFrame({
+        "Run ID": ["R1", "R1", "R1", "R2", "R2"],
+        "Plate Barcode": ["P1", "P1", "P2", "P1", np.nan],
+        "Well": ["A1", "A2", "A1", "A1", "B1"],
+        "Sample Name": ["S1", "S2", "S1", "S1", "S2"],
+        "Original Sample Conc.": [1.0, 15.0, 50.0, 0.0, 200.0],
+    })
+
+def test_grouped_shared_pools_match_vectorized():
+    """With one shared pool set, every row gets the same amount as the plain vectorized engine, and no row is lost."""
+
+    df = create_mock_plates()
+    result_df = calculate_grouped_pool_concentrations(df, POOL_DICT)
+    expected = calculate_pool_concentrations_vectorized(df, POOL_DICT)
+
+    assert list(result_df.columns) == ["Run ID", "Plate Barcode", "Well", "Sample", "Amount_to_Take", "Pool"]
+    assert len(result_df) == len(df)
+    np.testing.assert_allclose(result_df["Amount_to_Take"], expected["Amount_to_Take"], equal_nan=True)
+
+def test_grouped_pools_per_group():
+    """Each (run, plate) group uses its own pool set; empty plate barcodes are matched as ''."""
+
+    df = create_mock_plates()
+    pool_sets = {
+        ("R1", "P1"): {"a": 10.0},
+        ("R1", "P2"): {"a": 100.0, "b": 200.0},
+        ("R2", "P1"): {"a": 1.0},
+        ("R2", ""): {"a": 1000.0},
+    }
+    result_df = calculate_grouped_pool_concentrations(df, pool_sets)
+
+    np.testing.assert_allclose(result_df["Pool"], [10.0, 10.0, 100.0, np.nan, 1000.0], equal_nan=True)
+    np.testing.assert_allclose(result_df["Amount_to_Take"], [10.0, 10.0 / 15.0, 2.0, np.nan, 5.0], equal_nan=True)
+
+def test_grouped_single_group_column_and_missing_group():
+    """Groups can be keyed by run only, and a group without pool values is reported."""
+
+    df = create_mock_plates()
+    result_df = calculate_grouped_pool_concentrations(df, {"R1": {"a": 5.0}, "R2": {"a": 30.0}}, group_columns=["Run ID"])
+    assert result_df["Pool"].tolist()[:3] == [5.0, 5.0, 5.0]
+
+    with pytest.raises(ValueError, match="R2"):
+        calculate_grouped_pool_concentrations(df, {"R1": {"a": 5.0}}, group_columns=["Run ID"])
+
+def test_grouped_empty_input():
+    """A frame without rows gives an empty result with the usual columns instead of an error."""
+
+    df = create_mock_plates().iloc[:0]
+    for pool_sets in [POOL_DICT, {("R1", "P1"): {"a": 10.0}}]:
+        result_df = calculate_grouped_pool_concentrations(df, pool_sets)
+        assert list(result_df.columns) == ["Run ID", "Plate Barcode", "Well", "Sample", "Amount_to_Take", "Pool"]
+        assert result_df.empty
+
+def test_grouped_keys_are_compared_as_text():
+    """Per-group keys are matched as text like the group values, and shared and per-group entries cannot be mixed."""
+
+    df = create_mock_plates().assign(**{"Run ID": [1, 1, 1, 2, 2]})
+    pool_sets = {(1, "P1"): {"a": 10.0}, (1, "P2"): {"a": 100.0}, ("2", "P1"): {"a": 1.0}, (2, None): {"a": 1000.0}}
+    result_df = calculate_grouped_pool_concentrations(df, pool_sets)
+    np.testing.assert_allclose(result_df["Pool"], [10.0, 10.0, 100.0, np.nan, 1000.0], equal_nan=True)
+
+    with pytest.raises(ValueError, match="twice"):
+        calculate_grouped_pool_concentrations(df, {**pool_sets, ("1", "P1"): {"a": 5.0}})
+    with pytest.raises(ValueError, match="not a mix"):
+        calculate_grouped_pool_concentrations(df, {"pool_1": 5.0, (1, "P1"): {"a": 10.0}})
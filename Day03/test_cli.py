@@ -0,0 +1,81 @@
+import argparse
+import os
+import pytest
+import PoolCalculatorApp
+from result_writers import ResultWriter
+
+EXAMPLE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Qubit_data_example.csv")
+POOLS = [5.0, 30.0, 100.0]
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    """Keep the result cache of these tests out of the user's home folder."""
+    monkeypatch.setenv("POOL_CALC_CACHE_DIR", str(tmp_path / "cache"))
+
+def run_cli(capsys, **kwargs):
+    """Helper to run cli_mode with the given arguments and return what it printed."""
+    args = argparse.Namespace(file=EXAMPLE_FILE, pools=POOLS, chunksize=None, grouped=False, output=None, format=None)
+    for key, value in kwargs.items():
+        setattr(args, key, value)
+    PoolCalculatorApp.cli_mode(args)
+    return capsys.readouterr().out
+
+def test_streaming_output_is_identical(capsys):
+    """Streaming the file in chunks must print exactly the same bytes as reading it in one go."""
+
+    expected = run_cli(capsys)
+    assert expected.startswith("Sample\tAmount_to_Take\tPool")
+
+    for chunksize in [1, 7, 48, 1000]:
+        actual = run_cli(capsys, chunksize=chunksize)
+        assert actual == expected, f"Output differs for chunksize={chunksize}"
+
+def test_streaming_empty_file_writes_header(tmp_path):
+    """A file with only a header row still gives the header line."""
+
+    empty_file = tmp_path / "empty.csv"
+    empty_file.write_text("Sample Name,Original Sample Conc.\n")
+    output_file = tmp_path / "out.tsv"
+
+    with ResultWriter(str(output_file)) as writer:
+        PoolCalculatorApp.stream_cli_result(str(empty_file), {"pool_1": 5.0}, 10, writer)
+
+    assert output_file.read_text().splitlines() == ["Sample\tAmount_to_Take\tPool"]
+
+@pytest.mark.parametrize("chunksize", [None, 10])
+def test_grouped_header_only_file_writes_header(tmp_path, capsys, chunksize):
+    """--grouped on an export with a header but no rows gives just the header, with or without --chunksize."""
+
+    empty_file = tmp_path / "header_only.csv"
+    empty_file.write_text("Run ID,Plate Barcode,Well,Sample Name,Original Sample Conc.\n")
+
+    output = run_cli(capsys, file=str(empty_file), grouped=True, chunksize=chunksize)
+    assert output.splitlines() == ["Run ID\tPlate Barcode\tWell\tSample\tAmount_to_Take\tPool"]
+
+def test_cached_output_is_identical(capsys):
+    """A second run served from the result cache prints exactly the same bytes, with or without --grouped."""
+
+    for grouped in [False, True]:
+        first = run_cli(capsys, grouped=grouped)
+        second = run_cli(capsys, grouped=grouped)
+        assert first == second
+
+def test_output_file_formats(capsys, tmp_path):
+    """--output writes the same rows to a file; csv and jsonl can be read back."""
+
+    import pandas as pd
+
+    printed = run_cli(capsys)
+    tsv_file = tmp_path / "result.tsv"
+    assert run_cli(capsys, output=str(tsv_file), chunksize=5) == ""
+    assert tsv_file.read_text() == printed
+
+    csv_file = tmp_path / "result.csv"
+    run_cli(capsys, output=str(csv_file))
+    jsonl_file = tmp_path / "result.out"
+    run_cli(capsys, output=str(jsonl_file), format="jsonl")
+
+    from_csv = pd.read_csv(csv_file)
+    from_jsonl = pd.read_json(jsonl_file, lines=True)
+    assert list(from_csv.columns) == ["Sample", "Amount_to_Take", "Pool"]
+    pd.testing.assert_frame_equal(from_csv, from_jsonl, check_dtype=False)
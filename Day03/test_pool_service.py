@@ -0,0 +1,104 @@
+import asyncio
+import http.client
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from pool_service import PoolService, calculate_request, is_local_address
+
+EXAMPLE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Qubit_data_example.csv")
+SMALL_CSV = "Sample Name,Original Sample Conc.\nS1,1.0\nS2,15.0\nS3,0\n"
+
+@pytest.fixture
+def service_port():
+    """Start the service on a free localhost port in a background thread and stop it after the test."""
+    service = PoolService(workers=2)
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+    holder = {}
+
+    def run():
+        asyncio.set_event_loop(loop)
+        holder["server"] = loop.run_until_complete(service.start("127.0.0.1", 0))
+        started.set()
+        loop.run_forever()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    started.wait(timeout=10)
+    yield holder["server"].sockets[0].getsockname()[1]
+
+    loop.call_soon_threadsafe(holder["server"].close)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=10)
+    service.close()
+
+def request(port, method, path, payload=None):
+    """Helper to send one request and return (status, decoded JSON body)."""
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    body = json.dumps(payload) if payload is not None else None
+    connection.request(method, path, body=body, headers={"Content-Type": "application/json"})
+    response = connection.getresponse()
+    result = response.status, json.loads(response.read())
+    connection.close()
+    return result
+
+def test_calculate_from_csv_text(service_port):
+    """A CSV payload is calculated, and NaN comes back as null."""
+
+    status, body = request(service_port, "POST", "/calculate", {"pools": [5, 30, 100], "csv": SMALL_CSV})
+
+    assert status == 200
+    assert body["rows"] == 3
+    assert body["columns"]["Sample"] == ["S1", "S2", "S3"]
+    assert body["columns"]["Amount_to_Take"] == [5.0, 2.0, None]
+
+def test_calculate_from_path_grouped(service_port):
+    """A path payload is read from disk; grouped requests keep the run columns."""
+
+    status, body = request(service_port, "POST", "/calculate", {"pools": [5, 30, 100], "path": EXAMPLE_FILE, "grouped": True})
+
+    assert status == 200
+    assert body["rows"] == 48
+    assert "Run ID" in body["columns"]
+
+def test_bad_requests_are_reported(service_port):
+    """Missing pools, a wrong file and an unknown path give error responses without stopping the service."""
+
+    assert request(service_port, "POST", "/calculate", {"csv": SMALL_CSV})[0] == 400
+    assert request(service_port, "POST", "/calculate", {"pools": [5], "path": "does_not_exist.csv"})[0] == 400
+    assert request(service_port, "POST", "/calculate", {"pools": [5], "csv": "a,b\n1,2\n"})[0] == 400
+    assert request(service_port, "GET", "/nowhere")[0] == 404
+    assert request(service_port, "GET", "/health") == (200, {"status": "ok"})
+
+def test_path_requests_are_limited(tmp_path):
+    """'path' stays inside the data directory when one is set, and is refused when files may not be read."""
+
+    (tmp_path / "export.csv").write_text(SMALL_CSV)
+    payload = {"pools": [5, 30, 100], "path": "export.csv"}
+    assert calculate_request(payload, data_dir=str(tmp_path))["rows"] == 3
+
+    with pytest.raises(ValueError, match="outside"):
+        calculate_request({"pools": [5], "path": EXAMPLE_FILE}, data_dir=str(tmp_path))
+    with pytest.raises(ValueError, match="outside"):
+        calculate_request({"pools": [5], "path": "../export.csv"}, data_dir=str(tmp_path / "sub"))
+    with pytest.raises(ValueError, match="'csv'"):
+        calculate_request({"pools": [5], "path": EXAMPLE_FILE}, allow_paths=False)
+
+    assert is_local_address("127.0.0.1") and is_local_address("::1") and is_local_address("localhost")
+    assert not is_local_address("0.0.0.0") and not is_local_address("192.168.1.10")
+
+def test_concurrent_requests_and_stats(service_port):
+    """Concurrent requests all succeed and are counted in /stats with latency percentiles."""
+
+    payload = {"pools": [5, 30, 100], "csv": SMALL_CSV}
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        statuses = list(executor.map(lambda _: request(service_port, "POST", "/calculate", payload)[0], range(20)))
+    assert statuses == [200] * 20
+
+    status, stats = request(service_port, "GET", "/stats")
+    assert status == 200
+    assert stats["requests"] == 20
+    assert stats["errors"] == 0
+    assert 0 < stats["p50_ms"] <= stats["p95_ms"] <= stats["max_ms"]
@@ -0,0 +1,112 @@
+import argparse
+import io
+import os
+import numpy as np
+import pandas as pd
+import pytest
+import PoolCalculatorApp
+from Basic_code_Assignment2 import calculate_pool_concentrations_vectorized
+from pool_sweep import pool_grid, read_pool_sets, score_pool_sets, rank_pool_sets
+
+EXAMPLE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Qubit_data_example.csv")
+
+def make_plate(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    concentrations = rng.lognormal(mean=2.5, sigma=1.0, size=n_rows).astype(object)
+    concentrations[::17] = 0.0
+    concentrations[::23] = np.nan
+    concentrations[::29] = "Out of range"
+    return pd.DataFrame({"Sample Name": [f"S{i}" for i in range(n_rows)], "Original Sample Conc.": concentrations})
+
+def test_scores_match_full_calculation():
+    """Every score equals what a full calculation of that pool set gives."""
+
+    plate = make_plate(500)
+    rng = np.random.default_rng(1)
+    pool_sets = [sorted(rng.choice([1, 2, 5, 10, 20, 30, 50, 100, 200], size=rng.integers(1, 5), replace=False)) for _ in range(40)]
+    pool_sets.append([5, 5, 30])    # duplicate pool values
+
+    scores = score_pool_sets(plate, pool_sets)
+
+    assert list(scores["Candidate"]) == list(range(len(pool_sets)))
+    for pools, (_, row) in zip(pool_sets, scores.iterrows()):
+        result = calculate_pool_concentrations_vectorized(plate, {f"pool_{i}": v for i, v in enumerate(pools)})
+        amounts = result["Amount_to_Take"].dropna()
+        assert row["Samples"] == len(amounts)
+        assert row["Excluded"] == result["Amount_to_Take"].isna().sum()
+        assert row["Total_Amount"] == pytest.approx(amounts.sum(), rel=1e-9)
+        assert row["Max_Amount"] == pytest.approx(amounts.max())
+        assert row["Min_Amount"] == pytest.approx(amounts.min())
+        # Count_j counts the samples of the j-th smallest pool (by position, so duplicates stay separate)
+        position = np.searchsorted(np.sort(pools), result["Pool"].dropna(), side="left")
+        expected_counts = np.bincount(position, minlength=len(pools))
+        actual_counts = [row[f"Count_{j + 1}"] for j in range(len(pools))]
+        assert actual_counts == list(expected_counts)
+        assert all(pd.isna(row[f"Count_{j + 1}"]) for j in range(len(pools), 4))
+
+def test_zero_and_negative_concentrations_are_excluded():
+    """Zero and negative concentrations are Excluded, and the scores equal a full calculation of the positive rows."""
+
+    plate = pd.DataFrame({"Sample Name": ["S1", "S2", "S3", "S4", "S5", "S6"],
+                          "Original Sample Conc.": [2.0, -4.0, 0.0, 40.0, -0.5, 150.0]})
+    scores = score_pool_sets(plate, [[5, 30, 100]])
+    row = scores.iloc[0]
+
+    assert (row["Samples"], row["Excluded"]) == (3, 3)
+    positive = plate[pd.to_numeric(plate["Original Sample Conc."]) > 0]
+    amounts = calculate_pool_concentrations_vectorized(positive, {"a": 5, "b": 30, "c": 100})["Amount_to_Take"]
+    assert row["Total_Amount"] == pytest.approx(amounts.sum())
+    assert (row["Max_Amount"], row["Min_Amount"]) == (pytest.approx(amounts.max()), pytest.approx(amounts.min()))
+    assert [row["Count_1"], row["Count_2"], row["Count_3"]] == [1, 0, 2]
+
+def test_pool_grid_and_ranking():
+    """A grid of 3 pools out of 6 values gives 20 sets; ranking filters and sorts them."""
+
+    grid = pool_grid([100, 5, 30, 10, 50, 5, 200], 3)
+    assert grid.shape == (20, 3)
+    assert (np.diff(grid, axis=1) > 0).all()
+
+    scores = score_pool_sets(make_plate(300), grid)
+    ranked = rank_pool_sets(scores, max_amount=50, top=5)
+    assert len(ranked) <= 5
+    assert (ranked["Max_Amount"] <= 50).all()
+    assert ranked["Total_Amount"].is_monotonic_increasing
+    best = scores[scores["Max_Amount"] <= 50]["Total_Amount"].min()
+    assert ranked["Total_Amount"].iloc[0] == best
+
+    with pytest.raises(ValueError, match="Cannot choose"):
+        pool_grid([1, 2], 3)
+    with pytest.raises(ValueError, match="Unknown column"):
+        rank_pool_sets(scores, sort_by="Nope")
+
+def test_all_samples_excluded():
+    """A plate without usable concentrations gives zero totals and no min/max."""
+
+    plate = pd.DataFrame({"Sample Name": ["a", "b"], "Original Sample Conc.": [0, "x"]})
+    scores = score_pool_sets(plate, [[5, 30]])
+    assert scores.loc[0, ["Samples", "Excluded", "Total_Amount"]].tolist() == [0, 2, 0.0]
+    assert np.isnan(scores.loc[0, "Max_Amount"]) and np.isnan(scores.loc[0, "Min_Amount"])
+
+def test_read_pool_sets(tmp_path):
+    """One set per line with any separator; a header and comments are skipped."""
+
+    path = tmp_path / "sets.csv"
+    path.write_text("pool_1,pool_2,pool_3\n5,30,100\n# comment\n\n2; 20 200\n10\n")
+    assert read_pool_sets(str(path)) == [[5, 30, 100], [2, 20, 200], [10]]
+
+    path.write_text("5,30\nfive,30\n")
+    with pytest.raises(ValueError, match="line 2"):
+        read_pool_sets(str(path))
+
+def test_sweep_mode_prints_ranked_sets(capsys):
+    """--mode sweep prints the best pool sets of the grid as TSV."""
+
+    args = argparse.Namespace(file=EXAMPLE_FILE, pool_sets=None, grid=[2, 5, 10, 30, 100], grid_size=3, top=3,
+                              sort_by="Total_Amount", max_amount=None, min_amount=None, output=None, format=None)
+    PoolCalculatorApp.sweep_mode(args)
+    output = pd.read_csv(io.StringIO(capsys.readouterr().out), sep="\t")
+
+    assert len(output) == 3
+    assert output["Total_Amount"].is_monotonic_increasing
+    expected = rank_pool_sets(score_pool_sets(pd.read_csv(EXAMPLE_FILE), pool_grid(args.grid, 3)), top=3)
+    assert output["Pools"].tolist() == expected["Pools"].tolist()
@@ -0,0 +1,38 @@
+import os
+import threading
+import pandas as pd
+import pytest
+import PoolCalculatorApp
+from PoolCalculatorApp import load_and_calculate, CalculationCancelled
+
+EXAMPLE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Qubit_data_example.csv")
+POOL_DICT = {"pool_1": 5.0, "pool_2": 30.0, "pool_3": 100.0}
+
+@pytest.fixture(autouse=True)
+def small_chunks_no_cache(monkeypatch):
+    """Use tiny chunks so the example file is read in several steps, and keep the cache out of the way."""
+    monkeypatch.setattr(PoolCalculatorApp, "PROGRESS_CHUNKSIZE", 10)
+    monkeypatch.setattr(PoolCalculatorApp, "USE_CACHE", False)
+
+def test_chunked_calculation_reports_progress_and_matches():
+    """Reading with progress gives the same result as reading in one go, with progress rising to 1.0."""
+
+    fractions = []
+    result = load_and_calculate(EXAMPLE_FILE, POOL_DICT, progress=fractions.append)
+    expected = load_and_calculate(EXAMPLE_FILE, POOL_DICT)
+
+    pd.testing.assert_frame_equal(result, expected)
+    assert len(fractions) == 5
+    assert fractions == sorted(fractions)
+    assert fractions[-1] == 1.0
+
+def test_cancel_stops_the_calculation():
+    """Setting the cancel event stops the calculation at the next chunk."""
+
+    cancel_event = threading.Event()
+
+    def cancel_after_first_chunk(fraction):
+        cancel_event.set()
+
+    with pytest.raises(CalculationCancelled):
+        load_and_calculate(EXAMPLE_FILE, POOL_DICT, progress=cancel_after_first_chunk, cancel_event=cancel_event)
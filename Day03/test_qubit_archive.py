@@ -0,0 +1,97 @@
+import argparse
+import os
+import shutil
+import numpy as np
+import pandas as pd
+import pytest
+import PoolCalculatorApp
+from Basic_code_Assignment2 import calculate_pool_concentrations_vectorized
+from qubit_archive import QubitArchive, normalize_test_dates
+
+EXAMPLE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Qubit_data_example.csv")
+POOLS = {"pool_1": 5, "pool_2": 30, "pool_3": 100}
+
+def write_run(path, run_id, test_date, samples):
+    """A small export with the columns of a real one that the archive uses."""
+    pd.DataFrame({
+        "Run ID": run_id, "Test Date": test_date, "Assay Name": "dsDNA HS",
+        "Sample Name": [name for name, _ in samples], "Original Sample Conc.": [conc for _, conc in samples],
+        "Plate Barcode": "", "Well": "",
+    }).to_csv(path, index=False)
+
+@pytest.fixture
+def archive(tmp_path):
+    with QubitArchive(str(tmp_path / "archive.sqlite")) as archive:
+        yield archive
+
+def test_query_gives_the_same_result_as_the_csv(archive):
+    """Calculating an archived run gives exactly the result of calculating its CSV."""
+
+    assert archive.import_file(EXAMPLE_FILE)["Status"] == "imported"
+    df = archive.query(run_ids=["281223-164844"])
+
+    expected = calculate_pool_concentrations_vectorized(pd.read_csv(EXAMPLE_FILE), POOLS)
+    pd.testing.assert_frame_equal(calculate_pool_concentrations_vectorized(df, POOLS), expected)
+    assert df["Test Date"].iloc[0] == "2023-12-28T16:48:46"
+    assert df["Plate Barcode"].isna().all()
+
+def test_blank_sample_name_is_kept(archive, tmp_path):
+    """A row without a sample name is stored with NULL instead of rejecting the whole file."""
+
+    path = tmp_path / "blank_name.csv"
+    write_run(path, "R1", "28/12/2023 04:48:46 PM", [("S1", 2.0), ("", 15.0), ("S3", 40.0)])
+
+    assert archive.import_file(str(path)) == {"File": str(path), "Status": "imported", "Rows": 3}
+    df = archive.query(run_ids=["R1"])
+    assert df["Sample Name"].isna().tolist() == [False, True, False]
+    expected = calculate_pool_concentrations_vectorized(pd.read_csv(path), POOLS)
+    pd.testing.assert_frame_equal(calculate_pool_concentrations_vectorized(df, POOLS), expected)
+
+def test_same_content_is_imported_once(archive, tmp_path):
+    """A copy of an already imported file is skipped."""
+
+    copy = tmp_path / "copy.csv"
+    shutil.copy(EXAMPLE_FILE, copy)
+    assert archive.import_file(EXAMPLE_FILE)["Status"] == "imported"
+    assert archive.import_file(str(copy)) == {"File": str(copy), "Status": "skipped", "Rows": 48}
+    assert len(archive.query()) == 48
+
+def test_query_filters(archive, tmp_path):
+    """Runs, samples and date ranges can be combined; the end date includes the whole day."""
+
+    write_run(tmp_path / "a.csv", "run_a", "01/02/2024 09:00:00 AM", [("S1", 1.0), ("S2", 2.0)])
+    write_run(tmp_path / "b.csv", "run_b", "01/02/2024 04:30:00 PM", [("S1", 3.0), ("S3", 4.0)])
+    write_run(tmp_path / "c.csv", "run_c", "15/03/2024 10:00:00 AM", [("S1", "Out of range")])
+    (tmp_path / "broken.csv").write_text("Name,Conc\nx,1\n")
+
+    summary = archive.import_files(str(tmp_path))
+    assert summary["Status"].tolist() == ["imported", "imported", "failed", "imported"]
+
+    assert archive.query(run_ids=["run_b"])["Sample Name"].tolist() == ["S1", "S3"]
+    assert archive.query(samples=["S1"])["Run ID"].tolist() == ["run_a", "run_b", "run_c"]
+    assert archive.query(samples=["S1"], date_to="2024-02-01")["Run ID"].tolist() == ["run_a", "run_b"]
+    assert archive.query(date_from="2024-02-01T12:00:00")["Run ID"].unique().tolist() == ["run_b", "run_c"]
+    assert np.isnan(archive.query(run_ids=["run_c"])["Original Sample Conc."].iloc[0])
+    assert archive.query(run_ids=["nope"]).empty
+    assert archive.runs()["Run ID"].tolist() == ["run_a", "run_b", "run_c"]
+
+def test_normalize_test_dates():
+    """Qubit's day-first 12-hour dates become ISO text; anything else becomes None."""
+
+    dates = normalize_test_dates(pd.Series(["28/12/2023 04:48:46 PM", "01/02/2024 12:05:00 AM", "", None, "soon"]))
+    assert dates.tolist() == ["2023-12-28T16:48:46", "2024-02-01T00:05:00", None, None, None]
+
+def test_cli_calculates_archived_runs(capsys, tmp_path, monkeypatch):
+    """--runs with --pools calculates from the archive instead of a file."""
+
+    monkeypatch.setenv("POOL_CALC_CACHE_DIR", str(tmp_path / "cache"))
+    archive_path = str(tmp_path / "archive.sqlite")
+    with QubitArchive(archive_path) as archive:
+        archive.import_file(EXAMPLE_FILE)
+
+    common = dict(pools=list(POOLS.values()), chunksize=None, grouped=False, output=None, format=None,
+                  archive=archive_path, samples=None, since=None, until=None)
+    PoolCalculatorApp.cli_mode(argparse.Namespace(file=None, runs=["281223-164844"], **common))
+    from_archive = capsys.readouterr().out
+    PoolCalculatorApp.cli_mode(argparse.Namespace(file=EXAMPLE_FILE, runs=None, **common))
+    assert from_archive == capsys.readouterr().out
@@ -0,0 +1,71 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from qubit_reader import read_qubit_csv, REQUIRED_COLUMNS
+
+EXAMPLE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Qubit_data_example.csv")
+
+def test_reads_only_required_columns():
+    """Only the sample name and concentration are loaded, with the expected dtypes."""
+
+    df = read_qubit_csv(EXAMPLE_FILE)
+    full = pd.read_csv(EXAMPLE_FILE)
+
+    assert list(df.columns) == REQUIRED_COLUMNS
+    assert df["Original Sample Conc."].dtype == np.float64
+    assert df["Sample Name"].tolist() == full["Sample Name"].astype(str).tolist()
+    np.testing.assert_allclose(df["Original Sample Conc."], full["Original Sample Conc."])
+
+def test_extra_columns_are_loaded_when_present():
+    """Optional columns are added if the file has them and silently skipped if not."""
+
+    df = read_qubit_csv(EXAMPLE_FILE, extra_columns=["Run ID", "Not A Column"])
+    assert list(df.columns) == REQUIRED_COLUMNS + ["Run ID"]
+
+def test_non_numeric_concentrations_become_nan(tmp_path):
+    """Text in the concentration column gives NaN instead of an error, both in one go and in chunks."""
+
+    path = tmp_path / "mixed.csv"
+    path.write_text("Sample Name,Original Sample Conc.,Other\nS1,1.5,x\nS2,Out of range,y\nS3,,z\n")
+
+    df = read_qubit_csv(str(path))
+    np.testing.assert_array_equal(df["Original Sample Conc."], [1.5, np.nan, np.nan])
+
+    chunks = list(read_qubit_csv(str(path), chunksize=2))
+    assert len(chunks) == 2
+    np.testing.assert_array_equal(pd.concat(chunks)["Original Sample Conc."], [1.5, np.nan, np.nan])
+
+def test_malformed_header_fails_fast(tmp_path):
+    """A file without the required columns is rejected before parsing the body."""
+
+    path = tmp_path / "wrong.csv"
+    path.write_text("Name,Conc\nS1,1.0\n")
+
+    with pytest.raises(ValueError, match="Original Sample Conc."):
+        read_qubit_csv(str(path))
+
+@pytest.mark.parametrize("engine", ["c", "pyarrow"])
+def test_ragged_rows_are_read(tmp_path, engine):
+    """Rows with missing trailing fields are read (with NaN) even though the pyarrow parser rejects them."""
+
+    if engine == "pyarrow":
+        pytest.importorskip("pyarrow")
+    path = tmp_path / "ragged.csv"
+    path.write_text("Sample Name,Original Sample Conc.,Run ID\nS1,1.5,R1\nS2,2.5\nS3\n")
+
+    df = read_qubit_csv(str(path), extra_columns=["Run ID"], engine=engine)
+    assert df["Sample Name"].tolist() == ["S1", "S2", "S3"]
+    np.testing.assert_array_equal(df["Original Sample Conc."], [1.5, 2.5, np.nan])
+    assert df["Run ID"].iloc[0] == "R1" and df["Run ID"].iloc[1:].isna().all()
+
+@pytest.mark.parametrize("engine", ["c", "pyarrow"])
+def test_empty_text_cells_are_nan(engine):
+    """Empty text cells (e.g. Plate Barcode) are NaN with either parser, not the text 'nan'."""
+
+    if engine == "pyarrow":
+        pytest.importorskip("pyarrow")
+    df = read_qubit_csv(EXAMPLE_FILE, extra_columns=["Run ID", "Plate Barcode"], engine=engine)
+    assert df["Plate Barcode"].isna().all()
+    assert df["Run ID"].notna().all()
+    assert df["Sample Name"].tolist() == pd.read_csv(EXAMPLE_FILE)["Sample Name"].astype(str).tolist()
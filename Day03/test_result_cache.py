@@ -0,0 +1,79 @@
+import os
+import shutil
+import numpy as np
+import pandas as pd
+from result_cache import ResultCache
+
+EXAMPLE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Qubit_data_example.csv")
+POOL_DICT = {"pool_1": 5.0, "pool_2": 30.0, "pool_3": 100.0}
+
+def make_result(n_rows=3):
+    """Helper to create a result with text, missing and float values."""
+    return pd.DataFrame({
+        "Run ID": ["R1", np.nan, "R2"][:n_rows],
+        "Sample": ["S1", "S2", "S3"][:n_rows],
+        "Amount_to_Take": [5.0, np.nan, 0.5][:n_rows],
+    })
+
+def test_roundtrip_and_hit_miss_counts(tmp_path):
+    """A stored result comes back equal (including NaN), and hits/misses are counted."""
+
+    cache = ResultCache(str(tmp_path))
+    calls = []
+
+    def calculate():
+        calls.append(1)
+        return make_result()
+
+    first = cache.cached(EXAMPLE_FILE, POOL_DICT, calculate)
+    second = cache.cached(EXAMPLE_FILE, POOL_DICT, calculate)
+
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(first, second)
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+def test_key_depends_on_content_and_pools_only(tmp_path):
+    """Pool names/order and the file name do not matter; the data and the pool values do."""
+
+    cache = ResultCache(str(tmp_path / "cache"))
+    copy = tmp_path / "renamed.csv"
+    shutil.copy(EXAMPLE_FILE, copy)
+
+    key = cache.key(EXAMPLE_FILE, POOL_DICT)
+    assert cache.key(str(copy), {"c": 100, "a": 5, "b": 30}) == key
+    assert cache.key(EXAMPLE_FILE, {"a": 5, "b": 30}) != key
+    assert cache.key(EXAMPLE_FILE, POOL_DICT, variant="grouped") != key
+
+    with open(copy, "a") as f:
+        f.write("x,y\n")
+    assert cache.key(str(copy), POOL_DICT) != key
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    """When the cache is full, the entry that was used longest ago is removed first."""
+
+    cache = ResultCache(str(tmp_path))
+    for key in ["a", "b"]:
+        cache.put(key, make_result())
+    entry_size = os.path.getsize(cache.entry_path("a"))
+    os.utime(cache.entry_path("a"), ns=(1, 1))
+    os.utime(cache.entry_path("b"), ns=(2, 2))
+
+    cache.get("a")  # "a" becomes the most recently used
+    cache.max_bytes = int(entry_size * 2.5)
+    cache.put("c", make_result())
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+
+def test_clear(tmp_path):
+    """clear() removes all entries and resets the statistics."""
+
+    cache = ResultCache(str(tmp_path))
+    cache.put("a", make_result())
+    cache.get("a")
+    cache.clear()
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (0, 0, 0)
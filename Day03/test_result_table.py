@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+from result_table import ResultView
+
+def create_mock_result():
+    """Helper to create a small result with excluded (NaN) samples."""
+    return pd.DataFrame({
+        "Sample": ["S1", "S2", "S3", "S4", "S5"],
+        "Amount_to_Take": [2.0, np.nan, 0.5, 5.0, np.nan],
+        "Pool": [30.0, np.nan, 100.0, 5.0, np.nan],
+    })
+
+def test_pages_are_formatted_on_demand():
+    """page() only formats the requested rows; NaN shows as 'NaN'."""
+
+    view = ResultView(create_mock_result())
+
+    assert len(view) == 5
+    assert view.page(1, 2) == [("S2", "NaN", "NaN"), ("S3", "0.500000", "100.000000")]
+    assert view.page(4, 10) == [("S5", "NaN", "NaN")]
+
+def test_sort_keeps_missing_values_last():
+    """Sorting by amount works both ways, with excluded samples at the end either way."""
+
+    view = ResultView(create_mock_result())
+
+    view.sort("Amount_to_Take")
+    assert [row[0] for row in view.page(0, 5)] == ["S3", "S1", "S4", "S2", "S5"]
+
+    view.sort("Amount_to_Take", descending=True)
+    assert [row[0] for row in view.page(0, 5)] == ["S4", "S1", "S3", "S2", "S5"]
+
+    view.sort("Sample", descending=True)
+    assert [row[0] for row in view.page(0, 5)] == ["S5", "S4", "S3", "S2", "S1"]
+
+def test_hide_excluded_combines_with_sort():
+    """Hiding excluded samples filters the current order without sorting again."""
+
+    view = ResultView(create_mock_result())
+    view.sort("Pool")
+    view.set_hide_excluded(True)
+
+    assert [row[0] for row in view.page(0, 5)] == ["S4", "S1", "S3"]
+
+    view.set_hide_excluded(False)
+    assert len(view) == 5
+
+def test_large_result_is_not_formatted_up_front():
+    """Creating a view of a million rows and reading one page does not format every row."""
+
+    n_rows = 1_000_000
+    result = pd.DataFrame({"Sample": np.arange(n_rows).astype(str), "Amount_to_Take": np.random.default_rng(0).random(n_rows)})
+    view = ResultView(result)
+    view.sort("Amount_to_Take", descending=True)
+
+    page = view.page(0, 30)
+    assert len(page) == 30
+    assert float(page[0][1]) >= float(page[-1][1])
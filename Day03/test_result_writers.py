@@ -0,0 +1,103 @@
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from result_writers import ResultWriter, guess_format, write_result
+
+def create_mock_result():
+    """Helper to create a result with a missing value."""
+    return pd.DataFrame({"Sample": ["S1", "S2"], "Amount_to_Take": [2.5, np.nan], "Pool": [5.0, np.nan]})
+
+def test_guess_format_from_extension():
+    """The format follows the file extension, with tsv as the default."""
+
+    assert guess_format("out.csv") == "csv"
+    assert guess_format("out.PARQUET") == "parquet"
+    assert guess_format("out.jsonl") == "jsonl"
+    assert guess_format("-") == "tsv"
+
+def test_json_extension_is_rejected(tmp_path):
+    """A .json name is refused instead of silently getting JSON Lines, unless the format is given."""
+
+    with pytest.raises(ValueError, match="jsonl"):
+        ResultWriter(str(tmp_path / "out.json"))
+    assert not (tmp_path / "out.json").exists()
+
+    write_result(create_mock_result(), str(tmp_path / "out.json"), "jsonl")
+    assert len((tmp_path / "out.json").read_text().splitlines()) == 2
+
+def test_chunks_give_the_same_file(tmp_path):
+    """Writing in chunks gives the same bytes as writing everything at once, for every text format."""
+
+    result = create_mock_result()
+    for fmt in ["tsv", "csv", "jsonl"]:
+        whole, chunked = tmp_path / f"whole.{fmt}", tmp_path / f"chunked.{fmt}"
+        write_result(result, str(whole), fmt)
+        with ResultWriter(str(chunked), fmt) as writer:
+            writer.write(result.iloc[:1])
+            writer.write(result.iloc[1:])
+        assert whole.read_bytes() == chunked.read_bytes(), fmt
+
+def test_jsonl_uses_null_for_missing(tmp_path):
+    """JSON Lines has one object per row, with null for NaN."""
+
+    path = tmp_path / "out.jsonl"
+    write_result(create_mock_result(), str(path))
+
+    rows = [json.loads(line) for line in path.read_text().splitlines()]
+    assert rows == [{"Sample": "S1", "Amount_to_Take": 2.5, "Pool": 5.0},
+                    {"Sample": "S2", "Amount_to_Take": None, "Pool": None}]
+
+def test_stdout(capsys):
+    """'-' writes to standard output."""
+
+    write_result(create_mock_result(), "-", "csv")
+    assert capsys.readouterr().out.splitlines()[0] == "Sample,Amount_to_Take,Pool"
+
+def test_binary_formats(tmp_path):
+    """Parquet and Feather round-trip when pyarrow is installed."""
+
+    pytest.importorskip("pyarrow")
+    result = create_mock_result()
+    for fmt, read in [("parquet", pd.read_parquet), ("feather", pd.read_feather)]:
+        path = tmp_path / f"out.{fmt}"
+        with ResultWriter(str(path)) as writer:
+            writer.write(result.iloc[:1])
+            writer.write(result.iloc[1:])
+        pd.testing.assert_frame_equal(read(path), result)
+
+def test_binary_formats_with_empty_keys_in_the_first_chunk(tmp_path):
+    """Grouped chunks keep text key columns even when the first chunk has no values in them."""
+
+    pytest.importorskip("pyarrow")
+    first = pd.DataFrame({"Run ID": [np.nan], "Plate Barcode": [np.nan], "Well": [np.nan],
+                          "Sample": ["S1"], "Amount_to_Take": [2.5], "Pool": [5.0]})
+    second = pd.DataFrame({"Run ID": ["R1"], "Plate Barcode": ["P1"], "Well": ["A1"],
+                           "Sample": ["S2"], "Amount_to_Take": [1.0], "Pool": [30.0]})
+    for fmt, read in [("parquet", pd.read_parquet), ("feather", pd.read_feather)]:
+        path = tmp_path / f"grouped.{fmt}"
+        with ResultWriter(str(path)) as writer:
+            writer.write(first)
+            writer.write(second)
+        written = read(path)
+        assert written["Run ID"].tolist()[1:] == ["R1"] and pd.isna(written["Run ID"][0])
+        assert written["Well"].tolist()[1:] == ["A1"]
+        assert written["Pool"].tolist() == [5.0, 30.0]
+
+def test_failed_write_removes_the_file(tmp_path):
+    """A file is not created before the first write, and is removed when writing fails."""
+
+    path = tmp_path / "out.csv"
+    writer = ResultWriter(str(path))
+    assert not path.exists()
+    with pytest.raises(RuntimeError):
+        with writer:
+            writer.write(create_mock_result())
+            raise RuntimeError("calculation failed")
+    assert not path.exists()
+
+def test_unknown_format():
+    """An unknown format is rejected before anything is written."""
+
+    with pytest.raises(ValueError):
+        ResultWriter("-", "xlsx")
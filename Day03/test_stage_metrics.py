@@ -0,0 +1,66 @@
+import tracemalloc
+import numpy as np
+import pandas as pd
+from stage_metrics import StageMetrics, NULL_METRICS
+from Basic_code_Assignment2 import calculate_pool_concentrations_vectorized
+
+POOL_DICT = {'A': 5.0, 'B': 30.0, 'C': 100.0}
+
+def test_stages_are_recorded_and_added_up():
+    """Repeated stages add up their time and rows; peak memory covers the allocation in the stage."""
+
+    metrics = StageMetrics()
+    try:
+        for _ in range(3):
+            with metrics.stage("read") as stage:
+                data = np.ones(1_000_000)
+                stage.rows = 10
+        with metrics.stage("write", rows=5):
+            pass
+    finally:
+        metrics.stop()
+
+    report = metrics.report()
+    read = report["stages"]["read"]
+    assert read["calls"] == 3
+    assert read["rows"] == 30
+    assert read["wall_seconds"] > 0
+    assert read["peak_memory_bytes"] >= data.nbytes
+    assert report["stages"]["write"]["rows"] == 5
+    assert "read" in metrics.format_table()
+
+def test_calculation_reports_its_stages():
+    """The vectorized calculation times its coerce, assign and build steps."""
+
+    metrics = StageMetrics(track_memory=False)
+    df = pd.DataFrame({"Sample Name": ["S1", "S2"], "Original Sample Conc.": [1.0, "N/A"]})
+    calculate_pool_concentrations_vectorized(df, POOL_DICT, metrics=metrics)
+
+    stages = metrics.report()["stages"]
+    assert list(stages) == ["coerce", "assign", "build"]
+    assert all(stage["rows"] == 2 for stage in stages.values())
+    assert stages["build"]["peak_memory_bytes"] is None
+
+def test_null_metrics_do_nothing():
+    """With metrics off, stages can still be used (and rows set) without recording anything."""
+
+    with NULL_METRICS.stage("read") as stage:
+        stage.rows = 10
+    assert stage.rows is None
+    assert not NULL_METRICS.enabled
+
+def test_stop_ends_only_its_own_tracing():
+    """stop() ends the memory tracing the metrics started, but leaves tracing started by someone else running."""
+
+    assert not tracemalloc.is_tracing()
+    metrics = StageMetrics()
+    assert tracemalloc.is_tracing()
+    metrics.stop()
+    assert not tracemalloc.is_tracing()
+
+    tracemalloc.start()
+    try:
+        StageMetrics().stop()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
@@ -0,0 +1,60 @@
+import os
+import subprocess
+import sys
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+HEAVY_MODULES = ["pandas", "numpy", "tkinter", "pytest"]
+
+def imported_modules(*python_args):
+    """Run python with -X importtime and return {module name: cumulative import time in microseconds}.
+
+    The run must succeed: a crash at import would otherwise look like a fast startup.
+    """
+    completed = subprocess.run([sys.executable, "-X", "importtime", *python_args],
+                               cwd=APP_DIR, capture_output=True, text=True)
+    errors = "\n".join(line for line in completed.stderr.splitlines() if not line.startswith("import time:"))
+    assert completed.returncode == 0, f"python {' '.join(python_args)} failed:\n{errors}"
+    assert "Traceback" not in errors, errors
+
+    modules = {}
+    for line in completed.stderr.splitlines():
+        # Format: "import time:   self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+def test_importing_app_does_not_load_heavy_modules():
+    """Importing PoolCalculatorApp must not import pandas, numpy, tkinter or pytest."""
+
+    modules = imported_modules("-c", "import PoolCalculatorApp")
+
+    assert "PoolCalculatorApp" in modules
+    loaded = [name for name in HEAVY_MODULES if name in modules]
+    assert not loaded, f"Heavy modules imported at startup: {loaded}"
+
+def test_help_starts_fast():
+    """--help only needs argparse, so it must not import any heavy module either."""
+
+    modules = imported_modules("PoolCalculatorApp.py", "--help")
+
+    loaded = [name for name in HEAVY_MODULES if name in modules]
+    assert not loaded, f"Heavy modules imported for --help: {loaded}"
+
+def test_cli_mode_does_not_load_gui_or_pytest():
+    """A CLI calculation pays for pandas, but not for tkinter or pytest."""
+
+    modules = imported_modules("PoolCalculatorApp.py", "--file", "Qubit_data_example.csv", "--pools", "5", "30", "100", "--no-cache")
+
+    assert "pandas" in modules
+    assert "tkinter" not in modules
+    assert "pytest" not in modules
+
+def test_cache_and_archive_do_not_load_the_watcher():
+    """The result cache and the archive only need file_hashing, not the watch folder or batch engine."""
+
+    modules = imported_modules("-c", "import result_cache, qubit_archive")
+
+    assert "file_hashing" in modules
+    assert "watch_folder" not in modules
@@ -0,0 +1,57 @@
+import os
+import shutil
+from watch_folder import FolderWatcher
+
+EXAMPLE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Qubit_data_example.csv")
+POOL_DICT = {"pool_1": 5.0, "pool_2": 30.0, "pool_3": 100.0}
+
+def test_file_is_processed_once_after_it_settles(tmp_path):
+    """A new file is only processed after it stopped changing, and only once."""
+
+    shutil.copy(EXAMPLE_FILE, tmp_path / "run1.csv")
+    watcher = FolderWatcher(str(tmp_path), POOL_DICT, settle_seconds=2)
+
+    assert watcher.scan(now=0) == []      # first seen
+    assert watcher.scan(now=1) == []      # not settled yet
+    processed = watcher.scan(now=3)
+    assert [os.path.basename(s["File"]) for s in processed] == ["run1.csv"]
+    assert (tmp_path / "run1_pools.csv").exists()
+
+    assert watcher.scan(now=10) == []     # nothing new
+    assert watcher.scan(now=20) == []
+
+def test_growing_file_waits_until_complete(tmp_path):
+    """A file that is still being written keeps resetting the settle timer."""
+
+    path = tmp_path / "run1.csv"
+    lines = open(EXAMPLE_FILE).read().splitlines(keepends=True)
+    path.write_text("".join(lines[:10]))
+    watcher = FolderWatcher(str(tmp_path), POOL_DICT, settle_seconds=2)
+
+    watcher.scan(now=0)
+    path.write_text("".join(lines))       # the instrument writes more
+    assert watcher.scan(now=3) == []      # changed, so the timer starts again
+    processed = watcher.scan(now=6)
+    assert processed[0]["Samples"] == len(lines) - 1
+
+def test_restart_does_not_reprocess_and_detects_changes(tmp_path):
+    """The state file survives a restart; only files with new content are processed again."""
+
+    shutil.copy(EXAMPLE_FILE, tmp_path / "run1.csv")
+    watcher = FolderWatcher(str(tmp_path), POOL_DICT, settle_seconds=0)
+    watcher.scan(now=0)
+    assert len(watcher.scan(now=1)) == 1
+
+    # Same content copied again (new mtime) after a restart: hashed, but not recalculated
+    shutil.copy(EXAMPLE_FILE, tmp_path / "run1.csv")
+    os.utime(tmp_path / "run1.csv", ns=(1, 1))
+    restarted = FolderWatcher(str(tmp_path), POOL_DICT, settle_seconds=0)
+    restarted.scan(now=0)
+    assert restarted.scan(now=1) == []
+
+    # Changed content is processed again
+    with open(tmp_path / "run1.csv", "a") as f:
+        f.write("281223-164844,28/12/2023 04:48:46 PM,dsDNA HS,S_new,12.0\n")
+    restarted.scan(now=2)
+    processed = restarted.scan(now=3)
+    assert len(processed) == 1 and processed[0]["Samples"] == 49
@@ -0,0 +1,98 @@
+"""Watch a folder for new Qubit exports and calculate each one once.
+
+A file is processed when its size and modification time have not changed
+for `settle_seconds` (i.e. the instrument finished writing it). Files are
+identified by a SHA-256 hash of their content, so a file that is touched or
+copied again without changes is not recalculated. What was processed is
+stored in a small JSON state file, so a restart does not redo old files.
+"""
+import json
+import os
+import threading
+import time
+from batch_processing import find_input_files, process_file
+from file_hashing import file_hash
+
+STATE_FILE_NAME = ".pool_watch_state.json"
+
+class FolderWatcher:
+    """Polls a folder and writes <name>_pools.csv next to every new or changed CSV file."""
+
+    def __init__(self, directory: str, pool_dict: dict, state_path: str = None, settle_seconds: float = 2.0):
+        self.directory = directory
+        self.pool_dict = pool_dict
+        self.state_path = state_path or os.path.join(directory, STATE_FILE_NAME)
+        self.settle_seconds = settle_seconds
+        self.state = self.load_state()
+        # path -> ((size, mtime), time the file was first seen with that size/mtime)
+        self.pending = {}
+
+    def load_state(self) -> dict:
+        if os.path.exists(self.state_path):
+            with open(self.state_path) as f:
+                return json.load(f)
+        return {"processed": {}}
+
+    def save_state(self):
+        # Write to a temporary file first so a crash never leaves a half-written state file
+        temp_path = self.state_path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump(self.state, f, indent=1)
+        os.replace(temp_path, self.state_path)
+
+    def scan(self, now: float = None) -> list:
+        """Check the folder once. Returns the summaries (see batch_processing.process_file) of the files processed."""
+        now = time.monotonic() if now is None else now
+        processed = []
+        seen = set()
+
+        for path in find_input_files(self.directory):
+            name = os.path.basename(path)
+            seen.add(path)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            signature = [st.st_size, st.st_mtime_ns]
+
+            known = self.state["processed"].get(name)
+            if known and known["signature"] == signature:
+                continue  # unchanged since it was processed: no need to even hash it
+
+            first_seen = self.pending.get(path)
+            if first_seen is None or first_seen[0] != signature:
+                self.pending[path] = (signature, now)  # new or still being written
+                continue
+            if now - first_seen[1] < self.settle_seconds:
+                continue
+            del self.pending[path]
+
+            content_hash = file_hash(path)
+            if known and known["hash"] == content_hash:
+                known["signature"] = signature  # touched or copied again, same content
+                self.save_state()
+                continue
+
+            summary = process_file(path, self.pool_dict, os.path.dirname(path))
+            self.state["processed"][name] = {"hash": content_hash, "signature": signature,
+                                             "status": summary["Status"], "output": summary["Output"],
+                                             "error": summary["Error"]}
+            self.save_state()
+            processed.append(summary)
+
+        # Forget pending files that were deleted before they settled
+        for path in list(self.pending):
+            if path not in seen:
+                del self.pending[path]
+        return processed
+
+    def run(self, interval: float = 1.0, stop_event: threading.Event = None):
+        """Scan every `interval` seconds until stop_event is set (or Ctrl+C)."""
+        stop_event = stop_event or threading.Event()
+        while not stop_event.is_set():
+            for summary in self.scan():
+                if summary["Status"] == "ok":
+                    print(f"Processed '{summary['File']}' -> '{summary['Output']}' ({summary['Samples']} samples)", flush=True)
+                else:
+                    print(f"Failed '{summary['File']}': {summary['Error']}", flush=True)
+            stop_event.wait(interval)